@@ -4,15 +4,69 @@ from flask_cors import CORS
 from config import Config  # Assuming config.py is in the same directory or accessible
 from models import db      # Assuming models.py is in the same directory or accessible
 from flask_jwt_extended import JWTManager
-from routes.auth import auth_bp
-from routes.tracks import tracks_bp
-from routes.submissions import submissions_bp
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
+from utils.ratelimit import limiter, trusted_proxy_networks  # also registers the shared storage schemes
+from utils.metrics import init_metrics
+from utils.profiling import init_profiling
+from utils.compression import init_compression
+from utils.serialization import JSONProvider
+from utils.db_routing import init_read_replica
 import os # Ensure os is imported if you use os.environ directly here
+import threading
 
-def create_app():
+def prewarm_pool(app, connections):
+    """Open `connections` pooled DB connections concurrently, so early requests don't each pay for a connect."""
+    def connect():
+        try:
+            with app.app_context(), db.engine.connect() as conn:
+                conn.exec_driver_sql("SELECT 1")
+                barrier.wait(timeout=10)  # hold every connection until all are open, or the pool would reuse one
+        except Exception as e:
+            app.logger.warning(f"Connection pool prewarm failed: {e}")
+
+    barrier = threading.Barrier(connections)
+    for _ in range(connections):
+        threading.Thread(target=connect, name='pool-prewarm', daemon=True).start()
+
+def register_blueprints(app):
+    """
+    Import and register the blueprints. The route modules and what they pull in
+    (marshmallow schemas, the notification hub, prometheus_client, ...) are
+    imported here rather than at the top of app.py, so importing app.py, as
+    every script and the worker do, stays cheap until an app is actually built.
+    """
+    from routes.auth import auth_bp
+    from routes.tracks import tracks_bp
+    from routes.submissions import submissions_bp
+    from routes.me import me_bp
+    from routes.admin import admin_bp
+    from routes.health import health_bp
+    from routes.metrics import metrics_bp
+
+    limiter.exempt(health_bp)  # probes and scrapes must never be throttled
+    limiter.exempt(metrics_bp)
+
+    # Apply rate limits to specific blueprints BEFORE registering them
+    # This modifies the auth_bp object to include the rate limits.
+    limiter.limit("15 per minute;60 per hour")(auth_bp) 
+
+    # Register blueprints ONCE
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(tracks_bp, url_prefix='/api/tracks')
+    app.register_blueprint(submissions_bp, url_prefix='/api/submissions')
+    app.register_blueprint(me_bp, url_prefix='/api/me')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
+
+def create_app(serve=False):
+    """
+    Build the app. Scripts, workers and the `flask` CLI use the default mode.
+    serve=True is the web server's startup mode (see server.py): the migration
+    tooling is not loaded and the connection pool is warmed in the background,
+    so the process starts answering requests sooner.
+    """
     app = Flask(__name__) # Create the app instance inside the factory
+    app.json = JSONProvider(app)  # orjson-backed; jsonify goes through it too
     
     # Configure CORS
     # IMPORTANT: Replace 'https://YOUR_ACTUAL_FRONTEND_CLOUD_RUN_URL' 
@@ -28,37 +82,30 @@ def create_app():
         allow_headers=["Content-Type", "Authorization"],
         supports_credentials=True
     )
-    print(f"DEBUG: CORS configured for origins: {[frontend_custom_domain, local_dev_url1, local_dev_url2]}")
+    app.logger.debug(f"CORS configured for origins: {[frontend_custom_domain, local_dev_url1, local_dev_url2]}")
     
     app.config.from_object(Config)
-    print(f"DEBUG: App config loaded. SQLALCHEMY_DATABASE_URI from app.config: {app.config.get('SQLALCHEMY_DATABASE_URI')}")
-
-    # Initialize Flask-Limiter
-    limiter = Limiter(
-        key_func=get_remote_address,
-        app=app,
-        default_limits=["200 per day", "50 per hour"], # General limits for all routes
-        storage_uri="memory://", # Good starting point for Cloud Run
-    )
-    print("DEBUG: Flask-Limiter initialized")
+
+    # Initialize Flask-Limiter with counters shared by all workers, keyed by user or client IP
+    app.config['RATELIMIT_TRUSTED_PROXIES'] = trusted_proxy_networks(app.config['RATELIMIT_TRUSTED_PROXIES_RAW'])
+    limiter.init_app(app)
 
     # Initialize other extensions
+    init_metrics(app)  # before db.init_app: it picks the pool class
+    init_profiling(app)
+    init_compression(app)
     db.init_app(app)
-    print("DEBUG: db.init_app(app) called")
+    init_read_replica(app, db)
 
-    JWTManager(app)
-    print("DEBUG: JWTManager configured")
+    if not serve:
+        # Schema changes are versioned migrations in migrations/versions; apply them with `flask db upgrade`.
+        # Imported here because Alembic is the slowest import and the web server never needs it.
+        from flask_migrate import Migrate
+        Migrate(app, db)
 
-    # Apply rate limits to specific blueprints BEFORE registering them
-    # This modifies the auth_bp object to include the rate limits.
-    limiter.limit("15 per minute;60 per hour")(auth_bp) 
-    print(f"DEBUG: Rate limit applied to auth_bp: 15 per minute;60 per hour")
+    JWTManager(app)
 
-    # Register blueprints ONCE
-    app.register_blueprint(auth_bp, url_prefix='/api/auth')
-    app.register_blueprint(tracks_bp, url_prefix='/api/tracks')
-    app.register_blueprint(submissions_bp, url_prefix='/api/submissions')
-    print("DEBUG: Blueprints registered")
+    register_blueprints(app)
 
     @app.route("/")
     def index():
@@ -73,24 +120,14 @@ def create_app():
         # For production, you'd want more robust logging here
         # import logging
         # app.logger.exception('An error occurred during a request.') # Use app.logger
-        print(f"DEBUG: Server error encountered: {error}") 
+        app.logger.error(f"Server error encountered: {error}")
         return jsonify({'error': 'Internal server error'}), 500
 
-    with app.app_context():
-        print("DEBUG: Entered app_context for db.create_all()")
-        try:
-            db.create_all() 
-            print("DEBUG: db.create_all() completed successfully (or tables already exist).")
-        except Exception as e:
-            print(f"DEBUG: ERROR during db.create_all(): {e}")
-            # Optionally re-raise the exception if you want the app to fail hard here
-            # raise e
+    if serve and app.config['DB_POOL_PREWARM'] > 0:
+        prewarm_pool(app, app.config['DB_POOL_PREWARM'])
 
-    print("DEBUG: Exiting create_app()")
     return app
 
-app = create_app()
-
 if __name__ == '__main__':
-    # This part is for local development, not used by Gunicorn in Cloud Run
-    app.run(debug=True, port=5001)
+    # This part is for local development, not used by Gunicorn in Cloud Run (see server.py)
+    create_app().run(debug=True, port=5001)
@@ -0,0 +1,294 @@
+"""
+Benchmark for serving concurrency: read latency while large uploads are in flight.
+- Starts gunicorn (gunicorn.conf.py, server:app) once per worker class:
+  'sync' (one sync worker, how the Dockerfile used to run), 'gthread' and
+  'gevent' (skipped when gevent or psycogreen is not installed).
+- Readers GET cheap endpoints at a fixed rate, first alone, then while
+  uploaders send multi-MB resumable uploads at a throttled speed, like
+  participants on slow connections. Reports read latency percentiles for both
+  phases; in a mode that copes, p99 stays flat. The read rate is fixed so the
+  numbers measure waiting, not a CPU saturated by the benchmark itself.
+- Every read sends its own X-Forwarded-For (the benchmark connects from a
+  trusted proxy address), so each one goes through the rate limiter's storage
+  without being throttled; each uploader is a different user.
+- Needs the database configured as for the app and seeded with at least
+  --uploaders users and one track (python seed.py --users 100). Submissions
+  it creates are deleted afterwards; storage_gc_script.py reclaims their file.
+
+Usage: python benchmarks/concurrency_benchmark.py [--modes sync,gthread,gevent] [--duration 15]
+       [--readers 8] [--read-interval 0.05] [--uploaders 8] [--upload-mb 20] [--upload-rate-mb 2] [--workers 2]
+"""
+import argparse
+import http.client
+import importlib.util
+import itertools
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+READ_TIMEOUT = 120
+UPLOAD_PIECE_SIZE = 64 * 1024
+BOUNDARY = 'concurrency-benchmark-boundary'
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(mode, port, workers):
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=mode, GUNICORN_WORKERS=str(1 if mode == 'sync' else workers))
+    if mode == 'sync':
+        env['GUNICORN_THREADS'] = '1'  # gunicorn turns sync into gthread when threads > 1
+    process = subprocess.Popen(
+        # gunicorn's own entry point, run by this interpreter (gunicorn 20 has no __main__)
+        [sys.executable, '-W', 'ignore', '-c', 'from gunicorn.app.wsgiapp import run; run()', '--bind', f'127.0.0.1:{port}', '--timeout', '300',
+         '--log-level', 'warning', 'server:app'],
+        cwd=BACKEND_DIR, env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/readyz')
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            pass
+        if process.poll() is not None:
+            raise RuntimeError(f'gunicorn ({mode}) exited with code {process.returncode}')
+        time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError(f'gunicorn ({mode}) did not become ready')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# --- Load ---
+
+def reader(port, paths, interval, stop, latencies, errors):
+    """
+    GETs `paths` in turn every `interval` seconds. Latency is counted from when
+    a request was due rather than sent, so a stalled server is not hidden by
+    the reader waiting along with it.
+    """
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=READ_TIMEOUT)
+    rng = random.Random()
+    due = time.perf_counter() + rng.uniform(0, interval)
+    for path in itertools.cycle(paths):
+        if stop.is_set():
+            break
+        wait = due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        forwarded = f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}'
+        try:
+            conn.request('GET', path, headers={'X-Forwarded-For': forwarded})
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append('connection')
+            conn.close()
+            continue
+        finally:
+            due += interval
+        latencies.append(time.perf_counter() - (due - interval))
+        if response.status != 200:
+            errors.append(response.status)
+    conn.close()
+
+
+def api_call(port, method, path, token, body):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=READ_TIMEOUT)
+    try:
+        conn.request(method, path, json.dumps(body),
+                     headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, json.loads(response.read() or b'{}')
+    finally:
+        conn.close()
+
+
+def uploader(port, token, track_id, payload, rate, stop, uploads, errors):
+    """Resumable uploads (routes/submissions.py) of `payload` in one throttled chunk each, until stopped."""
+    while not stop.is_set():
+        conn = None
+        try:
+            status, body = api_call(port, 'POST', '/api/submissions/uploads', token,
+                                    {'track_id': track_id, 'filename': 'predictions.bin', 'size': len(payload)})
+            if status != 201:
+                errors.append(status)
+                time.sleep(1)
+                continue
+            upload_id = body['upload_id']
+            uploads.append(upload_id)
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=READ_TIMEOUT)
+            conn.putrequest('PUT', f'/api/submissions/uploads/{upload_id}')
+            conn.putheader('Authorization', f'Bearer {token}')
+            conn.putheader('Content-Range', f'bytes 0-{len(payload) - 1}/{len(payload)}')
+            conn.putheader('Content-Length', str(len(payload)))
+            conn.endheaders()
+            start = time.perf_counter()
+            for offset in range(0, len(payload), UPLOAD_PIECE_SIZE):
+                if stop.is_set():
+                    return  # abandon it mid-body, as a dropped connection would
+                conn.send(payload[offset:offset + UPLOAD_PIECE_SIZE])
+                ahead = (offset + UPLOAD_PIECE_SIZE) / rate - (time.perf_counter() - start)
+                if ahead > 0:
+                    time.sleep(ahead)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+            status, body = api_call(port, 'POST', f'/api/submissions/uploads/{upload_id}/finalize', token, {})
+            if status != 201:
+                errors.append(status)
+        except (OSError, http.client.HTTPException):
+            errors.append('connection')
+        finally:
+            if conn is not None:
+                conn.close()
+
+
+def run_phase(port, paths, readers, interval, duration, uploads=None):
+    """Read latencies (seconds) and read errors over `duration`, with uploaders running if given."""
+    latencies, errors, stop = [], [], threading.Event()
+    upload_stop = threading.Event()
+    upload_threads = []
+    if uploads:
+        tokens, track_id, payload, rate, upload_ids, upload_errors = uploads
+        for token in tokens:
+            upload_threads.append(threading.Thread(
+                target=uploader, args=(port, token, track_id, payload, rate, upload_stop, upload_ids, upload_errors)))
+        for thread in upload_threads:
+            thread.start()
+        time.sleep(1)  # let every upload get under way before measuring
+    threads = [threading.Thread(target=reader, args=(port, paths, interval, stop, latencies, errors)) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    upload_stop.set()
+    for thread in upload_threads:
+        thread.join()
+    return latencies, errors
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else float('nan')
+
+
+# --- Fixtures ---
+
+def prepare(users):
+    """(tokens of `users` random distinct users, a track id), straight from the database."""
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import func, select
+    from app import create_app
+    from models import db, Track, User
+
+    app = create_app()
+    with app.app_context():
+        track_id = db.session.scalar(select(Track.id).order_by(Track.id).limit(1))
+        # Random users, so reruns within the hour do not run into their rate limits
+        user_ids = db.session.scalars(select(User.id).order_by(func.random()).limit(users)).all()
+        if track_id is None or len(user_ids) < users:
+            raise SystemExit(f'Seed the database with at least {users} users and a track first (seed.py)')
+        return [create_access_token(identity=user_id) for user_id in user_ids], track_id
+
+
+def cleanup(upload_ids):
+    """Delete the benchmark's upload sessions, partial files and submissions. Returns the number of submissions."""
+    from sqlalchemy import delete, select
+    from app import create_app
+    from models import db, Job, Submission, UploadSession
+    from utils.uploads import partial_path
+
+    if not upload_ids:
+        return 0
+    app = create_app()
+    with app.app_context():
+        submission_ids = db.session.scalars(
+            select(UploadSession.submission_id)
+            .where(UploadSession.id.in_(upload_ids), UploadSession.submission_id.is_not(None))
+        ).all()
+        db.session.execute(delete(UploadSession).where(UploadSession.id.in_(upload_ids)))
+        db.session.execute(delete(Job).where(Job.submission_id.in_(submission_ids)))
+        db.session.execute(delete(Submission).where(Submission.id.in_(submission_ids)))
+        db.session.commit()
+        for upload_id in upload_ids:
+            try:
+                os.remove(partial_path(app.config['UPLOAD_FOLDER'], upload_id))
+            except FileNotFoundError:
+                pass
+    return len(submission_ids)
+
+
+def main(modes, duration, readers, interval, uploaders, upload_mb, rate_mb, workers):
+    tokens, track_id = prepare(uploaders * len(modes))
+    paths = ['/api/tracks/', f'/api/tracks/{track_id}']
+    payload = os.urandom(int(upload_mb * 1024 ** 2))
+    print(f"{readers} readers, each on {', '.join(paths)} every {interval * 1000:.0f} ms; "
+          f"{uploaders} uploaders of {upload_mb} MB at {rate_mb} MB/s each")
+    print(f"{'mode':>8} {'phase':>8} {'reads':>7} {'req/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'errors':>7} {'uploads':>8}")
+    for i, mode in enumerate(modes):
+        if mode == 'gevent' and not (importlib.util.find_spec('gevent') and importlib.util.find_spec('psycogreen')):
+            print(f"{mode:>8}  skipped: pip install gevent psycogreen")
+            continue
+        upload_ids, upload_errors = [], []
+        port = free_port()
+        process = start_server(mode, port, workers)
+        try:
+            run_phase(port, paths, readers, interval, 1)  # warm up caches and connection pools
+            idle = run_phase(port, paths, readers, interval, duration)
+            uploads = (tokens[i * uploaders:(i + 1) * uploaders], track_id, payload, rate_mb * 1024 ** 2,
+                       upload_ids, upload_errors)
+            loaded = run_phase(port, paths, readers, interval, duration, uploads)
+        finally:
+            stop_server(process)
+            completed = cleanup(upload_ids)
+        for phase, (latencies, errors), done in (('idle', idle, ''), ('uploads', loaded, completed)):
+            print(f"{mode:>8} {phase:>8} {len(latencies):>7} {len(latencies) / duration:>7.0f} "
+                  f"{percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+                  f"{max(latencies, default=float('nan')) * 1000:>8.1f} {len(errors):>7} {done:>8}")
+        if upload_errors:
+            print(f"{'':>8} upload errors: {dict(Counter(upload_errors))}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--modes', default='sync,gthread,gevent', help='Comma-separated gunicorn worker classes')
+    parser.add_argument('--duration', type=float, default=15, help='Seconds measured per phase')
+    parser.add_argument('--readers', type=int, default=8, help='Concurrent readers')
+    parser.add_argument('--read-interval', type=float, default=0.05,
+                        help='Seconds between the requests of one reader; keep the total well below saturation')
+    parser.add_argument('--uploaders', type=int, default=8, help='Concurrent uploads in the second phase')
+    parser.add_argument('--upload-mb', type=float, default=20, help='Size of each upload')
+    parser.add_argument('--upload-rate-mb', type=float, default=2, help='Upload speed of each uploader, MB/s')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes for gthread and gevent')
+    args = parser.parse_args()
+    main(args.modes.split(','), args.duration, args.readers, args.read_interval, args.uploaders, args.upload_mb,
+         args.upload_rate_mb, args.workers)
@@ -0,0 +1,169 @@
+"""
+Benchmark for API response encoding (utils/serialization.py) and compression
+(utils/compression.py), on synthetic submission lists.
+- Encodes the same rows with the previous hand-built dicts (an .isoformat()
+  per datetime, stock jsonify / json.dumps per NDJSON line) and with the
+  output schemas and the app's JSON provider, for the JSON list of
+  GET /api/submissions/<user_id>, the listing page and the NDJSON export,
+  and the row-to-dict step alone, without encoding.
+- Compresses the 100k-row listing body with gzip and brotli at a few levels
+  and reports sizes, compression time and the transfer time at --mbps.
+- Needs no database.
+
+Usage: python benchmarks/serialization_benchmark.py [--rows 100000] [--repeat 3] [--mbps 50]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import zlib
+from collections import namedtuple
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, jsonify  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from routes.submissions import LISTING_OUTPUT, SUBMISSION_OUTPUT  # noqa: E402
+from utils.serialization import JSONProvider, ndjson_stream, orjson  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ListingRow = namedtuple('ListingRow', 'id user_id track_id status submission_date')
+STATUSES = ['Pending', 'Validating', 'Accepted', 'Rejected']
+
+
+def synthetic_rows(n, rng):
+    start = datetime(2025, 3, 1, 9, 0, 0)
+    listing, submissions = [], []
+    for i in range(1, n + 1):
+        date = start + timedelta(seconds=rng.randrange(3 * 86400), microseconds=rng.randrange(10 ** 6))
+        status = rng.choice(STATUSES)
+        listing.append(ListingRow(i, rng.randrange(1, 2001), rng.randrange(1, 6), status, date))
+        submissions.append(SimpleNamespace(
+            id=i, track_id=rng.randrange(1, 6), submission_date=date, status=status,
+            model_file_url=f'blobs/{rng.getrandbits(128):032x}', supporting_docs_url=None,
+            updated_at=date + timedelta(minutes=rng.randrange(60)),
+        ))
+    return listing, submissions
+
+
+# --- The previous code (routes/submissions.py) ---
+
+def legacy_submission_json(submission):
+    return {
+        'id': submission.id,
+        'track_id': submission.track_id,
+        'submission_date': submission.submission_date.isoformat() if submission.submission_date else None,
+        'model_file_url': submission.model_file_url,
+        'supporting_docs_url': submission.supporting_docs_url,
+        'status': submission.status,
+        'updated_at': submission.updated_at.isoformat() if submission.updated_at else None
+    }
+
+
+def legacy_listing_row(row):
+    return {
+        'id': row.id,
+        'user_id': row.user_id,
+        'track_id': row.track_id,
+        'status': row.status,
+        'submission_date': row.submission_date.isoformat() if row.submission_date else None
+    }
+
+
+def legacy_ndjson(rows):
+    for row in rows:
+        yield json.dumps(legacy_listing_row(row)) + '\n'
+
+
+def body_of(chunks):
+    return b''.join(chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in chunks)
+
+
+def best_time(fn, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(rows, repeat, mbps, seed):
+    listing, submissions = synthetic_rows(rows, random.Random(seed))
+    legacy_app, app = Flask('legacy'), Flask('current')
+    legacy_app.json = DefaultJSONProvider(legacy_app)
+    app.json = JSONProvider(app)
+    page = listing[:500]
+
+    cases = [
+        ('user submissions (JSON list)',
+         lambda: jsonify([legacy_submission_json(s) for s in submissions]).get_data(),
+         lambda: jsonify(SUBMISSION_OUTPUT.dump_many(submissions)).get_data()),
+        ('listing (JSON list)',
+         lambda: jsonify({'submissions': [legacy_listing_row(r) for r in listing], 'next_cursor': None}).get_data(),
+         lambda: jsonify({'submissions': LISTING_OUTPUT.dump_many(listing), 'next_cursor': None}).get_data()),
+        ('listing page of 500 (x200)',
+         lambda: [jsonify({'submissions': [legacy_listing_row(r) for r in page]}).get_data() for _ in range(200)][-1],
+         lambda: [jsonify({'submissions': LISTING_OUTPUT.dump_many(page)}).get_data() for _ in range(200)][-1]),
+        ('listing export (NDJSON)',
+         lambda: body_of(legacy_ndjson(listing)),
+         lambda: body_of(ndjson_stream(listing, LISTING_OUTPUT, app.json))),
+    ]
+    print(f"{rows} rows, best of {repeat}; JSON encoder: {'orjson' if orjson else 'stdlib (orjson not installed)'}")
+    print(f"{'case':<30} {'before s':>9} {'after s':>9} {'speedup':>8} {'bytes':>11}")
+    listing_body = None
+    for name, before, after in cases:
+        with legacy_app.app_context():
+            before_seconds, before_body = best_time(before, repeat)
+        with app.app_context():
+            after_seconds, after_body = best_time(after, repeat)
+        if 'NDJSON' in name:
+            same = [json.loads(line) for line in before_body.splitlines()] == \
+                   [json.loads(line) for line in after_body.splitlines()]
+        else:
+            same = json.loads(before_body) == json.loads(after_body)
+        if name.startswith('listing (JSON'):
+            listing_body = after_body
+        print(f"{name:<30} {before_seconds:>9.3f} {after_seconds:>9.3f} {before_seconds / after_seconds:>7.1f}x "
+              f"{len(after_body):>11}{'' if same else '  OUTPUT DIFFERS'}")
+    # The schema's share of the above: rows to dicts, before any encoding
+    before_seconds, _ = best_time(lambda: [legacy_listing_row(r) for r in listing], repeat)
+    after_seconds, _ = best_time(lambda: LISTING_OUTPUT.dump_many(listing), repeat)
+    print(f"{'listing rows to dicts only':<30} {before_seconds:>9.3f} {after_seconds:>9.3f} "
+          f"{before_seconds / after_seconds:>7.1f}x {'-':>11}")
+
+    print(f"\nCompression of the {rows}-row listing ({len(listing_body)} bytes); transfer at {mbps} Mbit/s")
+    print(f"{'encoding':<12} {'bytes':>11} {'ratio':>6} {'compress s':>11} {'transfer s':>11}")
+    codecs = [('identity', lambda data: data)]
+    for level in (1, 6, 9):
+        codecs.append((f'gzip-{level}', lambda data, level=level: (
+            lambda c: c.compress(data) + c.flush())(zlib.compressobj(level, zlib.DEFLATED, 31))))
+    if brotli is not None:
+        for quality in (1, 4, 6, 11):
+            codecs.append((f'br-{quality}', lambda data, quality=quality: brotli.compress(data, quality=quality)))
+    else:
+        print("(brotli not installed: pip install Brotli)")
+    for name, codec in codecs:
+        seconds, compressed = best_time(lambda: codec(listing_body), 1 if name == 'br-11' else repeat)
+        print(f"{name:<12} {len(compressed):>11} {len(compressed) / len(listing_body):>6.1%} {seconds:>11.3f} "
+              f"{len(compressed) * 8 / (mbps * 1e6):>11.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--mbps', type=float, default=50, help='Link speed for the transfer time column')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    main(args.rows, args.repeat, args.mbps, args.seed)
@@ -0,0 +1,75 @@
+"""
+Benchmark for cold start: how long a fresh process takes to import and build
+the app, and to answer its first requests.
+- 'script' mode is create_app() as scripts and the flask CLI use it;
+  'server' mode is server.py, what gunicorn loads.
+- import_ms is `import app` alone; routes_ms is then importing the route
+  modules, which create_app does (register_blueprints) rather than app.py's
+  import, and create_app_ms is building the app with those already loaded.
+- Every run is a new interpreter, so nothing is cached between runs; the
+  median of --runs is reported.
+- Needs the database configured as for the app itself.
+
+Usage: python benchmarks/startup_benchmark.py [--runs 5] [--idle 0.3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter; prints one JSON line of timings in milliseconds
+PROBE = r"""
+import importlib, json, sys, time
+start = time.perf_counter()
+mode, idle = sys.argv[1], float(sys.argv[2])
+import app as app_module
+imported = time.perf_counter()
+for name in ('auth', 'tracks', 'submissions', 'me', 'admin', 'health', 'metrics'):
+    importlib.import_module(f'routes.{name}')
+routes_loaded = time.perf_counter()
+if mode == 'server':
+    import server
+    app = server.app
+else:
+    app = app_module.create_app()
+built = time.perf_counter()
+time.sleep(idle)  # gunicorn boots before the first request arrives
+client = app.test_client()
+timings = {'import_ms': imported - start, 'routes_ms': routes_loaded - imported, 'create_app_ms': built - routes_loaded}
+for name, path in (('first_request_ms', '/api/tracks/'), ('second_request_ms', '/api/tracks/'),
+                   ('readyz_ms', '/readyz')):
+    t = time.perf_counter()
+    response = client.get(path)
+    timings[name] = time.perf_counter() - t
+    assert response.status_code < 500, (path, response.status_code)
+print(json.dumps({k: round(v * 1000, 1) for k, v in timings.items()}))
+"""
+
+
+def run_once(mode, idle):
+    output = subprocess.run(
+        [sys.executable, '-W', 'ignore', '-c', PROBE, mode, str(idle)],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs, idle):
+    columns = ['import_ms', 'routes_ms', 'create_app_ms', 'first_request_ms', 'second_request_ms', 'readyz_ms']
+    print(f"{'mode':>7} " + ' '.join(f"{c:>17}" for c in columns))
+    for mode in ('script', 'server'):
+        results = [run_once(mode, idle) for _ in range(runs)]
+        medians = [statistics.median(r[c] for r in results) for c in columns]
+        print(f"{mode:>7} " + ' '.join(f"{m:>17.1f}" for m in medians))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--idle', type=float, default=0.3, help='Seconds between startup and the first request')
+    args = parser.parse_args()
+    main(args.runs, args.idle)
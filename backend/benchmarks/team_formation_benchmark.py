@@ -0,0 +1,91 @@
+"""
+Benchmark for the team formation engine (utils/team_formation.py).
+- Forms teams from synthetic users in both modes, up to 100k users, and
+  reports time and formation quality.
+- Runs the previous list-based loop on smaller inputs for comparison; it
+  re-filtered every bucket after each team, so its time grows quadratically.
+- Needs no database.
+
+Usage: python benchmarks/team_formation_benchmark.py [--users 100000] [--seed 0]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.team_formation import EXPERTISE_CATEGORIES, MODES, form_teams, summarize  # noqa: E402
+
+EXPERTISE_WEIGHTS = {'Coder': 40, 'Designer': 15, 'Social Scientist': 15, 'Business': 15, 'Statistics': 10, None: 5}
+
+
+def synthetic_users(n, rng):
+    expertise = rng.choices(list(EXPERTISE_WEIGHTS), weights=list(EXPERTISE_WEIGHTS.values()), k=n)
+    return list(zip(range(1, n + 1), expertise))
+
+
+def legacy_form_teams(members, max_size, min_coders, rng):
+    """The loop form_teams_script.py used before the engine, on (id, expertise) pairs."""
+    buckets = {cat: [] for cat in EXPERTISE_CATEGORIES}
+    buckets['Other'] = []
+    for member in members:
+        buckets[member[1] if member[1] in EXPERTISE_CATEGORIES else 'Other'].append(member)
+    teams = []
+    while any(buckets.values()):
+        team_members = []
+        for _ in range(min_coders):
+            if buckets['Coder']:
+                team_members.append(buckets['Coder'].pop())
+        for cat in EXPERTISE_CATEGORIES:
+            if len(team_members) >= max_size:
+                break
+            if cat != 'Coder' and buckets.get(cat):
+                team_members.append(buckets[cat].pop())
+        while len(team_members) < max_size and buckets['Coder']:
+            team_members.append(buckets['Coder'].pop())
+        all_remaining = []
+        for cat, users in buckets.items():
+            all_remaining.extend(users)
+        rng.shuffle(all_remaining)
+        while len(team_members) < max_size and all_remaining:
+            member = all_remaining.pop()
+            team_members.append(member)
+            category = member[1] if member[1] in EXPERTISE_CATEGORIES else 'Other'
+            buckets[category].remove(member)
+        teams.append(team_members)
+        for cat in list(buckets.keys()):
+            buckets[cat] = [u for u in buckets[cat] if u not in team_members]
+    return teams
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(users, seed, max_size=5, min_coders=2):
+    sizes = sorted({n for n in (1000, 10000, users) if n <= users})
+    print(f"{'users':>8} {'mode':>9} {'seconds':>9} {'teams':>7} {'sizes':>7} {'short':>6} {'mix':>5}")
+    for n in sizes:
+        members = synthetic_users(n, random.Random(seed))
+        for mode in MODES:
+            teams, seconds = timed(form_teams, members, max_size, min_coders, random.Random(seed), mode)
+            s = summarize(teams, min_coders)
+            assert s['users'] == n and len({m for team in teams for m in team}) == n
+            print(f"{n:>8} {mode:>9} {seconds:>9.3f} {s['teams']:>7} "
+                  f"{s['min_size']:>3}-{s['max_size']:<3} {s['teams_short_of_coders']:>6} {s['mean_distinct_expertise']:>5}")
+    for n in (1000, 2000, 4000):
+        members = synthetic_users(n, random.Random(seed))
+        _, seconds = timed(legacy_form_teams, members, max_size, min_coders, random.Random(seed))
+        print(f"{n:>8} {'legacy':>9} {seconds:>9.3f}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    main(args.users, args.seed)
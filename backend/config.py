@@ -1,6 +1,8 @@
 # backend/config.py
 import os
+import tempfile
 from dotenv import load_dotenv
+from sqlalchemy.pool import NullPool
 
 load_dotenv()
 BASE_DIR = os.path.abspath(os.path.dirname(__file__))
@@ -25,4 +27,150 @@ class Config:
         raise ValueError("No SQLALCHEMY_DATABASE_URI could be constructed for production")
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool, per process. Size it so that instances x workers x (size + overflow)
+    # stays under the database's max_connections.
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", 30)) # seconds to wait for a free connection
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800)) # seconds; reconnect before proxies drop idle connections
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    # Behind PgBouncer in transaction mode, PgBouncer does the pooling: each checkout opens a
+    # fresh client connection to it, and no session state is relied on between transactions.
+    DB_PGBOUNCER = os.environ.get("DB_PGBOUNCER", "false").lower() in ("1", "true", "yes")
+    if DB_PGBOUNCER:
+        SQLALCHEMY_ENGINE_OPTIONS = {"poolclass": NullPool}
+    else:
+        SQLALCHEMY_ENGINE_OPTIONS = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": DB_POOL_PRE_PING,
+        }
+    # Connections each web worker opens in the background at startup (server.py); 0 disables
+    DB_POOL_PREWARM = int(os.environ.get("DB_POOL_PREWARM", 0 if DB_PGBOUNCER else 2))
+
+    # Optional read replica (utils/db_routing.py), same credentials and database name as the primary
+    DB_REPLICA_SOCKET_PATH = os.environ.get("DB_REPLICA_SOCKET_PATH")
+    DB_REPLICA_HOST = os.environ.get("DB_REPLICA_HOST")
+    DB_REPLICA_PORT = os.environ.get("DB_REPLICA_PORT", "5432")
+    DB_REPLICA_MAX_LAG = float(os.environ.get("DB_REPLICA_MAX_LAG", 30)) # seconds; more lag sends reads to the primary
+    DB_REPLICA_CHECK_INTERVAL = float(os.environ.get("DB_REPLICA_CHECK_INTERVAL", 5)) # seconds between health checks
+    DB_REPLICA_CONNECT_TIMEOUT = int(os.environ.get("DB_REPLICA_CONNECT_TIMEOUT", 2)) # seconds, so a dead replica fails fast
+    if DB_REPLICA_SOCKET_PATH:
+        DB_REPLICA_URI = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@/{DB_NAME}?host={DB_REPLICA_SOCKET_PATH}"
+    elif DB_REPLICA_HOST:
+        DB_REPLICA_URI = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
+    else:
+        DB_REPLICA_URI = None
+    SQLALCHEMY_BINDS = {}
+    if DB_REPLICA_URI:
+        SQLALCHEMY_BINDS["replica"] = {
+            "url": DB_REPLICA_URI,
+            "connect_args": {"connect_timeout": DB_REPLICA_CONNECT_TIMEOUT},
+            **SQLALCHEMY_ENGINE_OPTIONS, # binds don't inherit SQLALCHEMY_ENGINE_OPTIONS
+        }
     UPLOAD_FOLDER = os.environ.get("UPLOAD_FOLDER", os.path.join(BASE_DIR, "uploads"))
+
+    # Chunked uploads
+    MAX_UPLOAD_SIZE = int(os.environ.get("MAX_UPLOAD_SIZE", 5 * 1024 ** 3)) # Default per-file cap; tracks may override
+    UPLOAD_CHUNK_MAX_SIZE = int(os.environ.get("UPLOAD_CHUNK_MAX_SIZE", 64 * 1024 ** 2))
+    UPLOAD_SESSION_TTL_HOURS = int(os.environ.get("UPLOAD_SESSION_TTL_HOURS", 48))
+
+    # Content-addressed blob storage for submission files ('local' or 's3')
+    STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "local")
+    STORAGE_ROOT = os.environ.get("STORAGE_ROOT", os.path.join(UPLOAD_FOLDER, "blobs"))
+    S3_BUCKET = os.environ.get("S3_BUCKET")
+    S3_PREFIX = os.environ.get("S3_PREFIX", "submissions")
+    S3_ENDPOINT_URL = os.environ.get("S3_ENDPOINT_URL") # e.g. http://localhost:9000 for MinIO
+    S3_REGION = os.environ.get("S3_REGION")
+    STORAGE_GC_GRACE_HOURS = int(os.environ.get("STORAGE_GC_GRACE_HOURS", 24))
+
+    # Background jobs (worker.py)
+    WORKER_CONCURRENCY = int(os.environ.get("WORKER_CONCURRENCY", os.cpu_count() or 2))
+    WORKER_POLL_INTERVAL = float(os.environ.get("WORKER_POLL_INTERVAL", 1.0)) # seconds between empty polls
+    JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 3))
+    JOB_RETRY_BASE_DELAY = int(os.environ.get("JOB_RETRY_BASE_DELAY", 30)) # seconds, doubled per attempt
+    JOB_HEARTBEAT_INTERVAL = int(os.environ.get("JOB_HEARTBEAT_INTERVAL", 15))
+    JOB_STALE_AFTER = int(os.environ.get("JOB_STALE_AFTER", 120)) # Running jobs without a heartbeat for this long are requeued
+    # Cluster-wide cap on running jobs per kind, e.g. "score_submission=4,profile_dataset=2"
+    JOB_CONCURRENCY_LIMITS = {
+        kind.strip(): int(limit)
+        for kind, _, limit in (item.partition("=") for item in os.environ.get("JOB_CONCURRENCY_LIMITS", "").split(",") if item.strip())
+    }
+
+    # Dataset hosting (utils/datasets.py): a Dataset.file_url that is a relative path names a file in DATASET_FOLDER
+    DATASET_FOLDER = os.environ.get("DATASET_FOLDER", os.path.join(BASE_DIR, "datasets"))
+    DATASET_DIGEST_FOLDER = os.environ.get("DATASET_DIGEST_FOLDER", os.path.join(BASE_DIR, "datasets", ".digests"))
+    DATASET_CHUNK_SIZE = int(os.environ.get("DATASET_CHUNK_SIZE", 8 * 1024 ** 2)) # granularity of the checksum manifest
+    # Who sends the bytes: 'app' (send_file), 'x-accel-redirect' (nginx, see front/nginx.conf) or 'x-sendfile'
+    DATASET_SEND_MODE = os.environ.get("DATASET_SEND_MODE", "app")
+    DATASET_ACCEL_PREFIX = os.environ.get("DATASET_ACCEL_PREFIX", "/protected-datasets/") # nginx internal location for DATASET_FOLDER
+    DATASET_CACHE_MAX_AGE = int(os.environ.get("DATASET_CACHE_MAX_AGE", 3600)) # Cache-Control max-age; revalidated by ETag after
+    DATASET_PROFILE_CHECK_INTERVAL = int(os.environ.get("DATASET_PROFILE_CHECK_INTERVAL", 300)) # seconds between worker.py checks for changed files to profile; 0 disables
+
+    # Scoring
+    GROUND_TRUTH_FOLDER = os.environ.get("GROUND_TRUTH_FOLDER", os.path.join(BASE_DIR, "ground_truth"))
+    SCORING_CACHE_FOLDER = os.environ.get("SCORING_CACHE_FOLDER", os.path.join(BASE_DIR, "ground_truth", ".cache"))
+
+    # Rate limiting (utils/ratelimit.py). Counters must be shared by all worker processes:
+    # mmap:///path for one host, "database" for the rate_limit_counter table across hosts.
+    RATELIMIT_STORAGE_URI = os.environ.get("RATELIMIT_STORAGE_URI", "mmap://" + os.path.join(tempfile.gettempdir(), "datathon-ratelimit"))
+    if RATELIMIT_STORAGE_URI == "database":
+        RATELIMIT_STORAGE_URI = "postgresql+ratelimit" + SQLALCHEMY_DATABASE_URI[len("postgresql+psycopg2"):]
+    # Proxies whose X-Forwarded-For is believed (CIDRs); others are treated as the client
+    RATELIMIT_TRUSTED_PROXIES_RAW = os.environ.get("RATELIMIT_TRUSTED_PROXIES", "127.0.0.1/32,::1/128")
+    # Per-route limit of the submission endpoints clients poll (lists, details, change feed), in place
+    # of the defaults: polling every 30 s is 120 per hour per route, so this leaves room for a few tabs
+    RATELIMIT_POLLING = os.environ.get("RATELIMIT_POLLING", "600 per hour")
+
+    # Password hashing (utils/passwords.py); each web worker process runs its own hashing pool
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256:260000") # werkzeug method string
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 8)) # beyond this, auth routes answer 503
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get("PASSWORD_HASH_TIMEOUT", 10)) # seconds
+
+    # Request profiling (utils/profiling.py): send "X-Profile: <PROFILE_TOKEN>" to profile one request,
+    # or profile this fraction of all requests. Both are off by default.
+    PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN")
+    PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+    PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 5)) # stack sampling period
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "datathon-profiles"))
+    PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", 200)) # newest profiles kept; older ones are deleted
+
+    # Submission event streams (GET /api/submissions/events). Each open stream holds a worker
+    # thread (see gunicorn.conf.py), so keep the cap below the threads per worker; with gevent
+    # workers a stream is a greenlet and the cap can go up to GUNICORN_WORKER_CONNECTIONS.
+    SSE_MAX_CONNECTIONS = int(os.environ.get("SSE_MAX_CONNECTIONS", 24)) # per worker process
+    SSE_HEARTBEAT_SECONDS = float(os.environ.get("SSE_HEARTBEAT_SECONDS", 15))
+    # LISTEN needs a session-level connection: behind PgBouncer in transaction mode, point
+    # this at Postgres directly. Defaults to SQLALCHEMY_DATABASE_URI.
+    DB_LISTEN_URI = os.environ.get("DB_LISTEN_URI")
+
+    # Organizer endpoints under /api/admin, called with an "X-Admin-Token: <ADMIN_TOKEN>" header;
+    # disabled while unset
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
+    # Prometheus scrapes of /metrics send "Authorization: Bearer <METRICS_TOKEN>" (ADMIN_TOKEN works too);
+    # while both are unset /metrics answers 403
+    METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+    # Bulk participant import (POST /api/admin/participants/import); bigger sheets use the script
+    IMPORT_MAX_ROWS = int(os.environ.get("IMPORT_MAX_ROWS", 5000))
+    IMPORT_HASH_WORKERS = int(os.environ.get("IMPORT_HASH_WORKERS", 2)) # hashing processes per import request
+
+    # Tracks/datasets response cache (routes/tracks.py)
+    TRACKS_CACHE_TTL = int(os.environ.get("TRACKS_CACHE_TTL", 60)) # seconds a worker process may serve a cached copy
+    TRACKS_CACHE_MAX_ENTRIES = int(os.environ.get("TRACKS_CACHE_MAX_ENTRIES", 512))
+    TRACKS_CACHE_MAX_AGE = int(os.environ.get("TRACKS_CACHE_MAX_AGE", 60)) # Cache-Control max-age for browsers and proxies
+
+    # Response compression (utils/compression.py): encodings offered, preferred first ("br" needs the
+    # Brotli package); empty turns it off, e.g. when the front proxy compresses instead
+    COMPRESS_ENCODINGS = [e.strip() for e in os.environ.get("COMPRESS_ENCODINGS", "br,gzip").split(",") if e.strip()]
+    COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024)) # bytes; smaller bodies are sent as they are
+    COMPRESS_GZIP_LEVEL = int(os.environ.get("COMPRESS_GZIP_LEVEL", 6))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get("COMPRESS_BROTLI_QUALITY", 4))
+
+    # Submission validation
+    MAX_ARCHIVE_UNPACKED_SIZE = int(os.environ.get("MAX_ARCHIVE_UNPACKED_SIZE", 20 * 1024 ** 3))
+    MAX_ARCHIVE_MEMBERS = int(os.environ.get("MAX_ARCHIVE_MEMBERS", 10000))
+    MAX_ARCHIVE_COMPRESSION_RATIO = int(os.environ.get("MAX_ARCHIVE_COMPRESSION_RATIO", 200))
@@ -0,0 +1,108 @@
+"""
+Script to check that the hot endpoint queries are served by their indexes.
+- EXPLAINs each query with sequential scans disabled, so the planner picks an
+  index whenever one applies, even on a near-empty development database.
+- A query whose plan does not use the expected index means the index is
+  missing (run `flask db upgrade`) or the query stopped matching it.
+- Exits with status 1 if any check fails, so it can run in CI after migrations.
+
+Usage: python explain_check_script.py [--verbose]
+"""
+import argparse
+import json
+import sys
+from datetime import datetime
+from sqlalchemy import select
+from app import create_app
+from models import db, Dataset, LeaderboardEntry, Submission, TeamMember, User
+from routes.submissions import listing_query
+
+
+def hot_queries():
+    """
+    (description, statement, expected index) for the queries behind the busiest
+    endpoints. Where several indexes serve a query equally, a tuple of them.
+    """
+    after = (datetime(2030, 1, 1), 1)
+    return [
+        ('login / registration email lookup',
+         select(User).where(db.func.lower(User.email) == 'someone@example.com'),
+         'ix_user_email_lower'),
+        ('GET /api/submissions/ (first page)',
+         listing_query().limit(50),
+         'ix_submission_date_id'),
+        ('GET /api/submissions/?track_id= (next page)',
+         listing_query(track_id=1, after=after).limit(50),
+         'ix_submission_track_date'),
+        ('GET /api/submissions/?user_id= (next page)',
+         listing_query(user_id=1, after=after).limit(50),
+         'ix_submission_user_date'),
+        ('GET /api/submissions/<user_id>',
+         select(Submission).where(Submission.user_id == 1),
+         ('ix_submission_user_date', 'ix_submission_user_updated')),
+        ('GET /api/submissions/<user_id> ETag fingerprint',
+         select(db.func.count(), db.func.max(Submission.id), db.func.sum(db.func.extract('epoch', Submission.updated_at)))
+         .where(Submission.user_id == 1),
+         'ix_submission_user_updated'),
+        ('GET /api/submissions/<user_id>/changes',
+         select(Submission).where(Submission.user_id == 1, db.tuple_(Submission.updated_at, Submission.id) > after)
+         .order_by(Submission.updated_at, Submission.id).limit(100),
+         'ix_submission_user_updated'),
+        ('GET /api/tracks/<id>/datasets',
+         select(Dataset).where(Dataset.track_id == 1),
+         'ix_dataset_track_id'),
+        ('team lookup for a user (leaderboard entrant)',
+         select(TeamMember.team_id).where(TeamMember.user_id == 1).order_by(TeamMember.id).limit(1),
+         'ix_team_member_user_id'),
+        ('team formation: users without a team',
+         select(User).where(~db.exists().where(TeamMember.user_id == User.id)),
+         'ix_team_member_user_id'),
+        ('GET /api/tracks/<id>/leaderboard',
+         select(LeaderboardEntry).where(LeaderboardEntry.track_id == 1)
+         .order_by(LeaderboardEntry.sort_key, LeaderboardEntry.achieved_at, LeaderboardEntry.id).limit(10),
+         'ix_leaderboard_rank'),
+    ]
+
+
+def plan_indexes(plan):
+    """All index names used anywhere in an EXPLAIN (FORMAT JSON) plan tree."""
+    found = set()
+    if 'Index Name' in plan:
+        found.add(plan['Index Name'])
+    for child in plan.get('Plans', []):
+        found |= plan_indexes(child)
+    return found
+
+
+def explain(connection, statement):
+    compiled = statement.compile(dialect=connection.dialect)
+    result = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+    plan = result if isinstance(result, list) else json.loads(result)
+    return plan[0]['Plan']
+
+
+def run_checks(verbose=False):
+    app = create_app()
+    failures = 0
+    with app.app_context():
+        with db.engine.connect() as connection:
+            with connection.begin():
+                connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                for description, statement, expected in hot_queries():
+                    plan = explain(connection, statement)
+                    used = plan_indexes(plan)
+                    expected = expected if isinstance(expected, tuple) else (expected,)
+                    ok = bool(used.intersection(expected))
+                    failures += not ok
+                    print(f"{'ok  ' if ok else 'FAIL'} {description}: expected {' or '.join(expected)}, "
+                          f"plan uses {', '.join(sorted(used)) or 'no index'}")
+                    if verbose or not ok:
+                        print(json.dumps(plan, indent=2))
+    return failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--verbose', action='store_true', help='Print every plan, not just failing ones')
+    args = parser.parse_args()
+    sys.exit(1 if run_checks(args.verbose) else 0)
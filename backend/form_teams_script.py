@@ -3,87 +3,87 @@ Script to auto-form teams from unassigned users based on expertise.
 - Each team up to `MAX_TEAM_SIZE` members.
 - Each team should have at least `MIN_CODERS` Coders.
 - Expertise categories: 'Coder', 'Designer', 'Social Scientist', 'Business'.
+- `--mode balanced` evens out team sizes and expertise mix across all teams
+  instead of filling teams one at a time (see utils/team_formation.py).
+- `--dry-run` prints the proposed teams without writing anything; `--seed`
+  makes the result reproducible.
+
+Usage: python form_teams_script.py [--mode greedy|balanced] [--seed N] [--dry-run] [--preview N]
 """
+import argparse
 import random
+from sqlalchemy import insert, select
 from app import create_app
 from models import db, User, Team, TeamMember
+from utils.team_formation import MODES, form_teams as plan_teams, summarize, team_mix
 
 # Configuration
 MAX_TEAM_SIZE = 5
 MIN_CODERS = 2
-EXPERTISE_CATEGORIES = ['Coder', 'Designer', 'Social Scientist', 'Business']
+# Serializes concurrent runs, so no user can end up in two auto-formed teams
+FORM_TEAMS_LOCK_ID = 0x7465616d  # 'team'
+INSERT_BATCH_SIZE = 5000
+
+
+def print_preview(teams, count):
+    for idx, members in enumerate(teams[:count], start=1):
+        mix = ', '.join(f"{expertise} x{n}" for expertise, n in sorted(team_mix(members).items()))
+        print(f"  AutoTeam {idx}: {len(members)} members ({mix}) users {[user_id for user_id, _ in members]}")
+    if 0 < count < len(teams):
+        print(f"  ... and {len(teams) - count} more")
+
+
+def insert_teams(teams):
+    """Bulk insert the teams and their memberships: one multi-row INSERT per batch, not one flush per team."""
+    for start in range(0, len(teams), INSERT_BATCH_SIZE):
+        batch = teams[start:start + INSERT_BATCH_SIZE]
+        team_ids = db.session.scalars(
+            insert(Team).returning(Team.id, sort_by_parameter_order=True),
+            [{'name': f"AutoTeam {start + i}", 'description': "Automatically formed team"}
+             for i, _ in enumerate(batch, start=1)]
+        ).all()
+        db.session.execute(insert(TeamMember), [
+            {'team_id': team_id, 'user_id': user_id}
+            for team_id, members in zip(team_ids, batch)
+            for user_id, _expertise in members
+        ])
 
 
-def form_teams(max_size=MAX_TEAM_SIZE, min_coders=MIN_CODERS):
+def form_teams(max_size=MAX_TEAM_SIZE, min_coders=MIN_CODERS, mode='greedy', seed=None, dry_run=False, preview=10):
     app = create_app()
     with app.app_context():
-        # Fetch users not yet in any team
-        subquery = db.session.query(TeamMember.user_id)
-        unassigned = User.query.filter(~User.id.in_(subquery)).all()
+        db.session.execute(select(db.func.pg_advisory_xact_lock(FORM_TEAMS_LOCK_ID)))
+        # Fetch users not yet in any team (NOT EXISTS plans as an anti-join on ix_team_member_user_id)
+        in_a_team = db.exists().where(TeamMember.user_id == User.id)
+        unassigned = db.session.execute(select(User.id, User.expertise).where(~in_a_team)).all()
         if not unassigned:
             print("No unassigned users found.")
             return
 
-        # Group users by expertise
-        buckets = {cat: [] for cat in EXPERTISE_CATEGORIES}
-        buckets['Other'] = []
-        for user in unassigned:
-            if user.expertise in EXPERTISE_CATEGORIES:
-                buckets[user.expertise].append(user)
-            else:
-                buckets['Other'].append(user)
+        teams = plan_teams([tuple(row) for row in unassigned], max_size, min_coders, random.Random(seed), mode)
+        summary = summarize(teams, min_coders)
+        print(f"{'Proposed' if dry_run else 'Forming'} {summary['teams']} teams ({mode}) from {summary['users']} users: "
+              f"sizes {summary['min_size']}-{summary['max_size']}, "
+              f"{summary['teams_short_of_coders']} with fewer than {min_coders} coders, "
+              f"{summary['mean_distinct_expertise']} distinct expertise per team on average.")
+        print_preview(teams, preview)
 
-        teams = []
-
-        # While there are unassigned users, form a new team
-        while any(buckets.values()):
-            team_members = []
-            # 1. Ensure minimum coders
-            for _ in range(min_coders):
-                if buckets['Coder']:
-                    team_members.append(buckets['Coder'].pop())
-            # 2. Fill from other expertise categories one each
-            for cat in EXPERTISE_CATEGORIES:
-                if len(team_members) >= max_size:
-                    break
-                if cat != 'Coder' and buckets.get(cat):
-                    team_members.append(buckets[cat].pop())
-            # 3. Fill remaining slots with coders if available
-            while len(team_members) < max_size and buckets['Coder']:
-                team_members.append(buckets['Coder'].pop())
-            # 4. Fill any remaining slots with "Other"
-            all_remaining = []
-            for cat, users in buckets.items():
-                all_remaining.extend(users)
-            random.shuffle(all_remaining)
-            while len(team_members) < max_size and all_remaining:
-                member = all_remaining.pop()
-                team_members.append(member)
-                # Remove from its bucket
-                buckets.get(member.expertise, buckets['Other']).remove(member)
-
-            # Register the new team
-            teams.append(team_members)
-
-            # Clear out emptied buckets
-            for cat in list(buckets.keys()):
-                buckets[cat] = [u for u in buckets[cat] if u not in team_members]
-
-        # Persist teams to the database
-        for idx, members in enumerate(teams, start=1):
-            team = Team(
-                name=f"AutoTeam {idx}",
-                description="Automatically formed team"
-            )
-            db.session.add(team)
-            db.session.flush()  # get team.id
-            for member in members:
-                tm = TeamMember(team_id=team.id, user_id=member.id)
-                db.session.add(tm)
+        if dry_run:
+            db.session.rollback()
+            return
+        insert_teams(teams)
         db.session.commit()
 
         print(f"Formed {len(teams)} teams with up to {max_size} members each.")
 
 
 if __name__ == '__main__':
-    form_teams()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-size', type=int, default=MAX_TEAM_SIZE)
+    parser.add_argument('--min-coders', type=int, default=MIN_CODERS)
+    parser.add_argument('--mode', choices=MODES, default='greedy')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed, for reproducible teams')
+    parser.add_argument('--dry-run', action='store_true', help='Print the proposed teams without saving them')
+    parser.add_argument('--preview', type=int, default=10, help='Number of teams to print')
+    args = parser.parse_args()
+    form_teams(args.max_size, args.min_coders, args.mode, args.seed, args.dry_run, args.preview)
@@ -0,0 +1,41 @@
+# backend/gunicorn.conf.py
+# gunicorn reads this file from the working directory on startup.
+import os
+import shutil
+
+# GUNICORN_WORKER_CLASS:
+# - "gthread" (default): each worker runs up to `threads` requests at once in OS threads. An open
+#   event stream (GET /api/submissions/events) holds a thread; keep SSE_MAX_CONNECTIONS below `threads`.
+# - "gevent": each worker runs up to `worker_connections` requests as greenlets, so slow uploads
+#   and event streams cost next to nothing while they wait on the network. Needs gevent and
+#   psycogreen (requirements.txt); post_fork below makes psycopg2 cooperative.
+# - "sync" serves one request per worker and is only a baseline for benchmarks/concurrency_benchmark.py.
+# In every mode a worker holds at most DB_POOL_SIZE + DB_MAX_OVERFLOW connections; requests beyond
+# that wait for one (DB_POOL_TIMEOUT) instead of opening more.
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.environ.get("GUNICORN_WORKERS", 2))
+threads = int(os.environ.get("GUNICORN_THREADS", 32))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+
+def on_starting(server):
+    # Start every server run with empty per-worker metric files (see utils/metrics.py)
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def post_fork(server, worker):
+    # gevent patches the standard library but not libpq: without a wait callback, every
+    # query would block all of the worker's greenlets until Postgres answers
+    if worker_class == "gevent":
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of a dead worker; its counters keep counting toward the totals
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
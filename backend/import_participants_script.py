@@ -0,0 +1,65 @@
+"""
+Script to register participants in bulk from a sign-up sheet (CSV or JSON).
+- CSV columns: name, email, expertise, password, team_name, team_password,
+  description. Rows sharing a team_name form a team that signs in with its
+  team_password; other rows are individuals with their own password.
+- JSON: a list of such rows, or {"individuals": [...], "teams": [...]} in the
+  shape of the registration endpoints.
+- Invalid rows are listed and skipped; `--strict` imports nothing unless every
+  row is valid, `--dry-run` only validates. Valid rows go in one transaction.
+- Passwords are hashed on `--workers` processes (see utils/participant_import.py).
+
+Usage: python import_participants_script.py signups.csv [--dry-run] [--strict] [--workers N] [--report errors.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from app import create_app
+from utils.participant_import import ImportFormatError, import_participants, parse_input
+
+
+def run_import(path, dry_run, strict, workers, report_path):
+    fmt = 'json' if path.lower().endswith('.json') else 'csv'
+    with open(path, encoding='utf-8-sig') as f:  # spreadsheet exports often start with a BOM
+        content = f.read()
+    try:
+        rows = parse_input(content, fmt)
+    except ImportFormatError as e:
+        print(f"Could not read {path}: {e}")
+        return 1
+
+    app = create_app()
+    with app.app_context():
+        start = time.perf_counter()
+        report = import_participants(rows, app.config['PASSWORD_HASH_METHOD'], workers, dry_run, strict)
+        elapsed = time.perf_counter() - start
+
+    for error in report['errors'][:20]:
+        print(f"row {error['row']} ({error['email']}): {json.dumps(error['errors'])}")
+    if len(report['errors']) > 20:
+        print(f"... and {len(report['errors']) - 20} more")
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(f"{report['rows']} rows: {report['valid_users']} valid users ({report['valid_teams']} teams), "
+          f"{len(report['errors'])} invalid rows")
+    if dry_run:
+        print("Dry run: nothing was saved.")
+    elif strict and report['errors']:
+        print("Strict mode: nothing was saved because of the invalid rows.")
+    else:
+        print(f"Created {report['created_users']} users and {report['created_teams']} teams in {elapsed:.1f}s.")
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('path', help='CSV or .json file')
+    parser.add_argument('--dry-run', action='store_true', help='Validate and report without saving')
+    parser.add_argument('--strict', action='store_true', help='Save nothing if any row is invalid')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2, help='Password hashing processes')
+    parser.add_argument('--report', default=None, help='Write the full JSON report to this file')
+    args = parser.parse_args()
+    sys.exit(run_import(args.path, args.dry_run, args.strict, args.workers, args.report))
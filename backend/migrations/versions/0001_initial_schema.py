@@ -0,0 +1,82 @@
+"""Initial schema: users, teams, tracks, datasets and submissions
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=128), nullable=False),
+        sa.Column('email', sa.String(length=128), nullable=False),
+        sa.Column('password_hash', sa.String(length=128), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('expertise', sa.String(length=128), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    op.create_table('track',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=128), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('rules', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('team',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=128), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('dataset',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.Column('dataset_name', sa.String(length=128), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('file_url', sa.String(length=256), nullable=True),
+        sa.ForeignKeyConstraint(['track_id'], ['track.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('submission',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.Column('submission_date', sa.DateTime(), nullable=True),
+        sa.Column('model_file_url', sa.String(length=256), nullable=True),
+        sa.Column('supporting_docs_url', sa.String(length=256), nullable=True),
+        sa.Column('status', sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(['track_id'], ['track.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('team_member',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(['team_id'], ['team.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('team_member')
+    op.drop_table('submission')
+    op.drop_table('dataset')
+    op.drop_table('team')
+    op.drop_table('track')
+    op.drop_table('user')
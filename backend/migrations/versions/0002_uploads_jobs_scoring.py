@@ -0,0 +1,115 @@
+"""Chunked uploads, blob storage, background jobs, scoring and leaderboard
+
+Revision ID: 0002_uploads_jobs_scoring
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 09:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_uploads_jobs_scoring'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('track') as batch_op:
+        batch_op.add_column(sa.Column('max_upload_size', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('metric', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('ground_truth_path', sa.String(length=512), nullable=True))
+
+    with op.batch_alter_table('submission') as batch_op:
+        batch_op.add_column(sa.Column('model_file_name', sa.String(length=256), nullable=True))
+        batch_op.add_column(sa.Column('supporting_docs_name', sa.String(length=256), nullable=True))
+        batch_op.add_column(sa.Column('model_file_sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('supporting_docs_sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('model_file_format', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('status_message', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('score', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('scored_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_submission_date_id', ['submission_date', 'id'])
+
+    op.create_table('upload_session',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('filename', sa.String(length=256), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('received_size', sa.BigInteger(), nullable=False),
+        sa.Column('expected_sha256', sa.String(length=64), nullable=True),
+        sa.Column('sha256', sa.String(length=64), nullable=True),
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['submission_id'], ['submission.id']),
+        sa.ForeignKeyConstraint(['track_id'], ['track.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=True),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=32), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(length=128), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['submission_id'], ['submission.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_job_queued', 'job', ['run_after', 'id'], postgresql_where=sa.text("status = 'Queued'"))
+    op.create_table('leaderboard_entry',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('track_id', sa.Integer(), nullable=False),
+        sa.Column('entrant_key', sa.String(length=64), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('sort_key', sa.Float(), nullable=False),
+        sa.Column('achieved_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['submission_id'], ['submission.id']),
+        sa.ForeignKeyConstraint(['team_id'], ['team.id']),
+        sa.ForeignKeyConstraint(['track_id'], ['track.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('track_id', 'entrant_key', name='uq_leaderboard_entrant')
+    )
+    op.create_index('ix_leaderboard_rank', 'leaderboard_entry', ['track_id', 'sort_key', 'achieved_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_leaderboard_rank', table_name='leaderboard_entry')
+    op.drop_table('leaderboard_entry')
+    op.drop_index('ix_job_queued', table_name='job', postgresql_where=sa.text("status = 'Queued'"))
+    op.drop_table('job')
+    op.drop_table('upload_session')
+
+    with op.batch_alter_table('submission') as batch_op:
+        batch_op.drop_index('ix_submission_date_id')
+        batch_op.drop_column('scored_at')
+        batch_op.drop_column('score')
+        batch_op.drop_column('status_message')
+        batch_op.drop_column('model_file_format')
+        batch_op.drop_column('supporting_docs_sha256')
+        batch_op.drop_column('model_file_sha256')
+        batch_op.drop_column('supporting_docs_name')
+        batch_op.drop_column('model_file_name')
+
+    with op.batch_alter_table('track') as batch_op:
+        batch_op.drop_column('ground_truth_path')
+        batch_op.drop_column('metric')
+        batch_op.drop_column('max_upload_size')
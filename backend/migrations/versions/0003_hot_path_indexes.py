@@ -0,0 +1,43 @@
+"""Indexes for the hot query paths, unique team membership, case-insensitive email
+
+Revision ID: 0003_hot_path_indexes
+Revises: 0002_uploads_jobs_scoring
+Create Date: 2026-10-18 09:20:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_hot_path_indexes'
+down_revision = '0002_uploads_jobs_scoring'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Emails differing only in case must be merged by hand before this index can be built
+    op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=True)
+    op.create_index('ix_dataset_track_id', 'dataset', ['track_id'])
+    op.create_index('ix_submission_user_date', 'submission', ['user_id', 'submission_date', 'id'])
+    op.create_index('ix_submission_track_date', 'submission', ['track_id', 'submission_date', 'id'])
+
+    # Duplicate memberships are meaningless; keep the oldest row of each pair
+    op.execute("""
+        DELETE FROM team_member duplicate USING team_member original
+        WHERE duplicate.team_id = original.team_id
+          AND duplicate.user_id = original.user_id
+          AND duplicate.id > original.id
+    """)
+    op.create_unique_constraint('uq_team_member', 'team_member', ['team_id', 'user_id'])
+    op.create_index('ix_team_member_user_id', 'team_member', ['user_id', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_team_member_user_id', table_name='team_member')
+    op.drop_constraint('uq_team_member', 'team_member', type_='unique')
+    op.drop_index('ix_submission_track_date', table_name='submission')
+    op.drop_index('ix_submission_user_date', table_name='submission')
+    op.drop_index('ix_dataset_track_id', table_name='dataset')
+    op.drop_index('ix_user_email_lower', table_name='user')
@@ -0,0 +1,28 @@
+"""Widen user.password_hash for configurable hash methods
+
+Revision ID: 0004_password_hash_length
+Revises: 0003_hot_path_indexes
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_password_hash_length'
+down_revision = '0003_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column('password_hash', existing_type=sa.String(length=128),
+                              type_=sa.String(length=256), existing_nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.alter_column('password_hash', existing_type=sa.String(length=256),
+                              type_=sa.String(length=128), existing_nullable=False)
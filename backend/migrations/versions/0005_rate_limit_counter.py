@@ -0,0 +1,30 @@
+"""Shared rate-limit counters
+
+Revision ID: 0005_rate_limit_counter
+Revises: 0004_password_hash_length
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_rate_limit_counter'
+down_revision = '0004_password_hash_length'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rate_limit_counter',
+        sa.Column('key', sa.String(length=256), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+        prefixes=['UNLOGGED']
+    )
+
+
+def downgrade():
+    op.drop_table('rate_limit_counter')
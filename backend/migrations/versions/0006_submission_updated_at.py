@@ -0,0 +1,29 @@
+"""Submission.updated_at for conditional GETs and the change feed
+
+Revision ID: 0006_submission_updated_at
+Revises: 0005_rate_limit_counter
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_submission_updated_at'
+down_revision = '0005_rate_limit_counter'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('submission', sa.Column('updated_at', sa.DateTime(), nullable=False,
+                                          server_default=sa.text('CURRENT_TIMESTAMP')))
+    # Best guess for existing rows: when they were last scored, else created
+    op.execute("UPDATE submission SET updated_at = COALESCE(scored_at, submission_date, updated_at)")
+    op.create_index('ix_submission_user_updated', 'submission', ['user_id', 'updated_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_submission_user_updated', table_name='submission')
+    op.drop_column('submission', 'updated_at')
@@ -0,0 +1,49 @@
+"""NOTIFY submission_changes when a submission is created or its status or score changes
+
+Revision ID: 0007_submission_notify
+Revises: 0006_submission_updated_at
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_submission_notify'
+down_revision = '0006_submission_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Listened to by utils/notifications.py; delivered when the writing transaction commits.
+    # Payloads stay far below NOTIFY's 8000-byte limit: status_message is left out.
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_submission_change() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT'
+               OR NEW.status IS DISTINCT FROM OLD.status
+               OR NEW.score IS DISTINCT FROM OLD.score THEN
+                PERFORM pg_notify('submission_changes', json_build_object(
+                    'id', NEW.id,
+                    'user_id', NEW.user_id,
+                    'track_id', NEW.track_id,
+                    'status', NEW.status,
+                    'score', NEW.score,
+                    'updated_at', NEW.updated_at
+                )::text);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER submission_notify
+        AFTER INSERT OR UPDATE ON submission
+        FOR EACH ROW EXECUTE FUNCTION notify_submission_change()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER submission_notify ON submission")
+    op.execute("DROP FUNCTION notify_submission_change()")
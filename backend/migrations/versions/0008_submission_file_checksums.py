@@ -0,0 +1,31 @@
+"""Size and CRC-32 of submission files, for the streaming track export
+
+Revision ID: 0008_submission_file_checksums
+Revises: 0007_submission_notify
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_submission_file_checksums'
+down_revision = '0007_submission_notify'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Filled by validation; older rows are filled the first time a track export needs them
+    op.add_column('submission', sa.Column('model_file_size', sa.BigInteger(), nullable=True))
+    op.add_column('submission', sa.Column('model_file_crc32', sa.BigInteger(), nullable=True))
+    op.add_column('submission', sa.Column('supporting_docs_size', sa.BigInteger(), nullable=True))
+    op.add_column('submission', sa.Column('supporting_docs_crc32', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('submission', 'supporting_docs_crc32')
+    op.drop_column('submission', 'supporting_docs_size')
+    op.drop_column('submission', 'model_file_crc32')
+    op.drop_column('submission', 'model_file_size')
@@ -0,0 +1,29 @@
+"""Precomputed dataset profiles shown on the track page
+
+Revision ID: 0009_dataset_profile
+Revises: 0008_submission_file_checksums
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_dataset_profile'
+down_revision = '0008_submission_file_checksums'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Written by profile_dataset jobs (utils/dataset_profile.py); null until the file is first profiled
+    op.add_column('dataset', sa.Column('profile', sa.JSON(), nullable=True))
+    op.add_column('dataset', sa.Column('profile_sha256', sa.String(length=64), nullable=True))
+    op.add_column('dataset', sa.Column('profiled_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('dataset', 'profiled_at')
+    op.drop_column('dataset', 'profile_sha256')
+    op.drop_column('dataset', 'profile')
@@ -1,14 +1,15 @@
 from flask_sqlalchemy import SQLAlchemy
+from utils.db_routing import RoutingSession
 
-# Initialize SQLAlchemy
-db = SQLAlchemy()
+# Initialize SQLAlchemy; the session class routes @read_replica views' reads (utils/db_routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class User(db.Model):
     __tablename__ = 'user'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(128), nullable=False)
     email = db.Column(db.String(128), unique=True, nullable=False)
-    password_hash = db.Column(db.String(128), nullable=False)
+    password_hash = db.Column(db.String(256), nullable=False)  # werkzeug hash; sha512 variants exceed 128 chars
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     # New field for individual expertise
     expertise = db.Column(db.String(128), nullable=True)
@@ -16,12 +17,25 @@ class User(db.Model):
     # Relationship to team memberships
     teams = db.relationship('TeamMember', back_populates='user')
 
+    __table_args__ = (
+        # Emails are matched case-insensitively: query with db.func.lower(User.email) == email.lower()
+        db.Index('ix_user_email_lower', db.func.lower(email), unique=True),
+    )
+
 class Track(db.Model):
     __tablename__ = 'track'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(128), nullable=False)
     description = db.Column(db.Text)
     rules = db.Column(db.Text)
+    # Per-track cap on a single uploaded file, in bytes (falls back to MAX_UPLOAD_SIZE)
+    max_upload_size = db.Column(db.BigInteger, nullable=True)
+    # Scoring: metric name from utils/scoring.py METRICS and the hidden ground truth
+    # file (relative to GROUND_TRUTH_FOLDER). Never serialize ground_truth_path.
+    metric = db.Column(db.String(32), nullable=True)
+    ground_truth_path = db.Column(db.String(512), nullable=True)
+
+    datasets = db.relationship('Dataset', back_populates='track', order_by='Dataset.id')
 
 class Dataset(db.Model):
     __tablename__ = 'dataset'
@@ -30,6 +44,16 @@ class Dataset(db.Model):
     dataset_name = db.Column(db.String(128), nullable=False)
     description = db.Column(db.Text)
     file_url = db.Column(db.String(256))
+    # Columns, types, statistics and sample rows of a hosted file (utils/dataset_profile.py)
+    profile = db.Column(db.JSON, nullable=True)
+    profile_sha256 = db.Column(db.String(64), nullable=True)  # of the file the profile describes
+    profiled_at = db.Column(db.DateTime, nullable=True)
+
+    track = db.relationship('Track', back_populates='datasets')
+
+    __table_args__ = (
+        db.Index('ix_dataset_track_id', 'track_id'),
+    )
 
 class Submission(db.Model):
     __tablename__ = 'submission'
@@ -37,9 +61,107 @@ class Submission(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     track_id = db.Column(db.Integer, db.ForeignKey('track.id'), nullable=False)
     submission_date = db.Column(db.DateTime, default=db.func.current_timestamp())
-    model_file_url = db.Column(db.String(256))
+    model_file_url = db.Column(db.String(256))  # blob store key, see utils/storage.py
     supporting_docs_url = db.Column(db.String(256))
+    model_file_name = db.Column(db.String(256), nullable=True)  # original filename as uploaded
+    supporting_docs_name = db.Column(db.String(256), nullable=True)
     status = db.Column(db.String(64), default="Pending")
+    model_file_sha256 = db.Column(db.String(64), nullable=True)
+    supporting_docs_sha256 = db.Column(db.String(64), nullable=True)
+    model_file_format = db.Column(db.String(32), nullable=True)  # detected by validation, e.g. 'zip', 'pickle'
+    # Byte size and CRC-32 of the stored files, recorded by validation; the track export's ZIP layout needs them
+    model_file_size = db.Column(db.BigInteger, nullable=True)
+    model_file_crc32 = db.Column(db.BigInteger, nullable=True)
+    supporting_docs_size = db.Column(db.BigInteger, nullable=True)
+    supporting_docs_crc32 = db.Column(db.BigInteger, nullable=True)
+    status_message = db.Column(db.Text, nullable=True)  # why a submission was rejected
+    score = db.Column(db.Float, nullable=True)
+    scored_at = db.Column(db.DateTime, nullable=True)
+    # Bumped by every UPDATE (including bulk ones); drives the ETags and the change feed in routes/submissions.py
+    updated_at = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp(),
+                           server_default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    __table_args__ = (
+        # Serve the keyset-paginated listing, newest first (GET /api/submissions/), unfiltered
+        # and filtered by user or track; the latter two also serve plain user/track lookups
+        db.Index('ix_submission_date_id', 'submission_date', 'id'),
+        db.Index('ix_submission_user_date', 'user_id', 'submission_date', 'id'),
+        db.Index('ix_submission_track_date', 'track_id', 'submission_date', 'id'),
+        # Per-user change feed, and the fingerprint behind the list ETag
+        db.Index('ix_submission_user_updated', 'user_id', 'updated_at', 'id'),
+    )
+
+class UploadSession(db.Model):
+    """A resumable, chunked upload of a single file, finalized into a Submission."""
+    __tablename__ = 'upload_session'
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    track_id = db.Column(db.Integer, db.ForeignKey('track.id'), nullable=False)
+    kind = db.Column(db.String(32), nullable=False, default='model_file')  # 'model_file' or 'supporting_docs'
+    filename = db.Column(db.String(256), nullable=False)
+    total_size = db.Column(db.BigInteger, nullable=False)
+    received_size = db.Column(db.BigInteger, nullable=False, default=0)
+    expected_sha256 = db.Column(db.String(64), nullable=True)  # optional, declared by the client
+    sha256 = db.Column(db.String(64), nullable=True)
+    status = db.Column(db.String(32), nullable=False, default='Open')  # Open -> Complete -> Finalized
+    submission_id = db.Column(db.Integer, db.ForeignKey('submission.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+class LeaderboardEntry(db.Model):
+    """
+    Best scored submission of one team (or of a user without a team) on a track.
+    Maintained incrementally by utils/leaderboard.py as scores land.
+    """
+    __tablename__ = 'leaderboard_entry'
+    id = db.Column(db.Integer, primary_key=True)
+    track_id = db.Column(db.Integer, db.ForeignKey('track.id'), nullable=False)
+    entrant_key = db.Column(db.String(64), nullable=False)  # 'team:<id>' or 'user:<id>'
+    team_id = db.Column(db.Integer, db.ForeignKey('team.id'), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # who made the best submission
+    submission_id = db.Column(db.Integer, db.ForeignKey('submission.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    sort_key = db.Column(db.Float, nullable=False)  # score oriented so that lower always ranks first
+    achieved_at = db.Column(db.DateTime, nullable=False)  # earlier submission wins a tie
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
+
+    __table_args__ = (
+        db.UniqueConstraint('track_id', 'entrant_key', name='uq_leaderboard_entrant'),
+        # Serves both top-k (index order) and rank lookups (row comparison range count)
+        db.Index('ix_leaderboard_rank', 'track_id', 'sort_key', 'achieved_at', 'id'),
+    )
+
+class Job(db.Model):
+    """A unit of background work, claimed by worker.py with SELECT ... FOR UPDATE SKIP LOCKED."""
+    __tablename__ = 'job'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(64), nullable=False)  # name of a handler registered in utils/jobs.py
+    submission_id = db.Column(db.Integer, db.ForeignKey('submission.id'), nullable=True)
+    payload = db.Column(db.JSON, nullable=True)
+    status = db.Column(db.String(32), nullable=False, default='Queued')  # Queued -> Running -> Done / Failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_after = db.Column(db.DateTime, nullable=False, default=db.func.current_timestamp())
+    locked_by = db.Column(db.String(128), nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Only queued jobs are ever scanned by the claim query
+        db.Index('ix_job_queued', 'run_after', 'id', postgresql_where=db.text("status = 'Queued'")),
+    )
+
+class RateLimitCounter(db.Model):
+    """Fixed-window request counter, written by the Postgres rate-limit storage in utils/ratelimit.py."""
+    __tablename__ = 'rate_limit_counter'
+    key = db.Column(db.String(256), primary_key=True)
+    count = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    # Counters are disposable: skip the WAL
+    __table_args__ = {'prefixes': ['UNLOGGED']}
 
 # New Team and TeamMember models
 class Team(db.Model):
@@ -60,4 +182,10 @@ class TeamMember(db.Model):
     role = db.Column(db.String(64), default='member')
 
     team = db.relationship('Team', back_populates='members')
-    user = db.relationship('User', back_populates='teams')
\ No newline at end of file
+    user = db.relationship('User', back_populates='teams')
+
+    __table_args__ = (
+        # Also serves lookups by team_id (leading column)
+        db.UniqueConstraint('team_id', 'user_id', name='uq_team_member'),
+        db.Index('ix_team_member_user_id', 'user_id', 'id'),  # (user_id, id): first team of a user
+    )
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Script to prepare hosted dataset files (utils/datasets.py) for download.
+- Writes precompressed variants next to each file: <file>.gz always, and
+  <file>.zst with the zstandard package or the zstd command line tool.
+  A variant that would not save at least 5% is not kept (e.g. for files
+  that are compressed already).
+- Computes the checksum manifests of every representation, so no download
+  request has to read a whole file first.
+- Run it again after replacing a file: variants older than their file are
+  ignored by the server and rebuilt here.
+
+Usage: python prepare_datasets_script.py [--track ID] [--gzip-level 9] [--zstd-level 19] [--force]
+"""
+import argparse
+import gzip
+import os
+import shutil
+import subprocess
+import sys
+import time
+from sqlalchemy import select
+from app import create_app
+from models import db, Dataset
+from utils.datasets import ENCODINGS, READ_BLOCK_SIZE, dataset_path, file_digest, variants
+
+MIN_SAVING = 0.05
+
+
+def write_gzip(path, out_path, level):
+    # mtime=0 and no file name in the header, so the same input always gives the same bytes (and ETag)
+    with open(path, 'rb') as src, open(out_path, 'wb') as raw, \
+            gzip.GzipFile(filename='', mode='wb', compresslevel=level, fileobj=raw, mtime=0) as out:
+        shutil.copyfileobj(src, out, READ_BLOCK_SIZE)
+
+
+def write_zstd(path, out_path, level):
+    try:
+        import zstandard  # optional; falls back to the zstd binary
+    except ImportError:
+        if not shutil.which('zstd'):
+            return False
+        subprocess.run(['zstd', f'-{level}', '-q', '-f', '--no-progress', '-o', out_path, path], check=True)
+        return True
+    with open(path, 'rb') as src, open(out_path, 'wb') as out:
+        zstandard.ZstdCompressor(level=level).copy_stream(src, out, read_size=READ_BLOCK_SIZE)
+    return True
+
+
+def prepare_file(path, config, levels, force):
+    size = os.path.getsize(path)
+    fresh = {encoding for encoding, _ in variants(path) if encoding}
+    for encoding, suffix in ENCODINGS:
+        if encoding in fresh and not force:
+            continue
+        variant_path = path + suffix
+        tmp = f'{variant_path}.{os.getpid()}.tmp'
+        start = time.perf_counter()
+        if encoding == 'gzip':
+            write_gzip(path, tmp, levels[encoding])
+        elif not write_zstd(path, tmp, levels[encoding]):
+            print(f"  {encoding}: skipped (install zstandard or the zstd tool)")
+            continue
+        compressed = os.path.getsize(tmp)
+        if compressed > size * (1 - MIN_SAVING):
+            os.remove(tmp)
+            if os.path.exists(variant_path):
+                os.remove(variant_path)
+            print(f"  {encoding}: not kept ({compressed} of {size} bytes)")
+            continue
+        os.replace(tmp, variant_path)
+        print(f"  {encoding}: {compressed} bytes ({compressed / max(size, 1):.0%}) in {time.perf_counter() - start:.1f}s")
+    for encoding, variant_path in variants(path):
+        file_digest(variant_path, config)
+
+
+def run(track_id, levels, force):
+    app = create_app()
+    with app.app_context():
+        stmt = select(Dataset).order_by(Dataset.id)
+        if track_id is not None:
+            stmt = stmt.where(Dataset.track_id == track_id)
+        missing = 0
+        for dataset in db.session.scalars(stmt):
+            path = dataset_path(dataset, app.config)
+            if path is None:
+                continue
+            if not os.path.isfile(path):
+                print(f"Dataset {dataset.id}: {dataset.file_url} is missing from {app.config['DATASET_FOLDER']}")
+                missing += 1
+                continue
+            print(f"Dataset {dataset.id}: {dataset.file_url} ({os.path.getsize(path)} bytes)")
+            prepare_file(path, app.config, levels, force)
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--track', type=int, default=None, help='Only the datasets of this track')
+    parser.add_argument('--gzip-level', type=int, default=9)
+    parser.add_argument('--zstd-level', type=int, default=19)
+    parser.add_argument('--force', action='store_true', help='Rebuild variants even if they are up to date')
+    args = parser.parse_args()
+    sys.exit(run(args.track, {'gzip': args.gzip_level, 'zstd': args.zstd_level}, args.force))
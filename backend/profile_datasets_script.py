@@ -0,0 +1,66 @@
+"""
+Script to profile hosted dataset files (utils/dataset_profile.py) for the track page.
+- Parses each file as a stream in bounded memory; several files are profiled
+  at once in a ProcessPoolExecutor, one process per file.
+- Skips files whose content has not changed since their profile was built
+  (compared by SHA-256), unless --force.
+- worker.py does the same on its own for files that change while it runs;
+  this script is for the first profiles of a new event or after a bulk update.
+
+Usage: python profile_datasets_script.py [--track ID] [--workers N] [--force]
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import select
+from app import create_app
+from models import db, Dataset
+from utils.dataset_profile import PROFILE_VERSION, build_profile, store_profile
+from utils.datasets import dataset_path, file_digest
+
+
+def run(track_id, workers, force):
+    app = create_app()
+    with app.app_context():
+        stmt = select(Dataset).order_by(Dataset.id)
+        if track_id is not None:
+            stmt = stmt.where(Dataset.track_id == track_id)
+        tasks, missing = [], 0
+        for dataset in db.session.scalars(stmt):
+            path = dataset_path(dataset, app.config)
+            if path is None:
+                continue
+            if not os.path.isfile(path):
+                print(f"Dataset {dataset.id}: {dataset.file_url} is missing from {app.config['DATASET_FOLDER']}")
+                missing += 1
+                continue
+            stat = os.stat(path)
+            sha256 = file_digest(path, app.config)['sha256']
+            current = (dataset.profile or {}).get('version') == PROFILE_VERSION and dataset.profile_sha256 == sha256
+            if current and not force:
+                print(f"Dataset {dataset.id}: {dataset.file_url} unchanged")
+                continue
+            tasks.append((dataset.id, path, sha256, stat))
+        db.session.commit()
+
+        with ProcessPoolExecutor(max_workers=workers or min(len(tasks), os.cpu_count()) or 1) as pool:
+            for (dataset_id, path, sha256, stat), profile in zip(tasks, pool.map(build_profile, [t[1] for t in tasks])):
+                dataset = db.session.get(Dataset, dataset_id)
+                store_profile(dataset, profile, sha256, stat)
+                db.session.commit()
+                if 'error' in profile:
+                    print(f"Dataset {dataset_id}: could not be profiled: {profile['error']}")
+                else:
+                    print(f"Dataset {dataset_id}: {profile['rows']} rows, {len(profile['columns'])} columns "
+                          f"in {profile['elapsed_seconds']:.1f}s")
+    return 1 if missing else 0
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--track', type=int, default=None, help='Only the datasets of this track')
+    parser.add_argument('--workers', type=int, default=None, help='Profiling processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Profile files even if they are unchanged')
+    args = parser.parse_args()
+    sys.exit(run(args.track, args.workers, args.force))
@@ -0,0 +1,117 @@
+# backend/routes/admin.py
+import hmac
+from flask import Blueprint, Response, request, jsonify, current_app
+from models import db, Track
+from utils.participant_import import ImportFormatError, import_participants, parse_input
+from utils.ratelimit import limiter
+from utils.storage import get_blob_store
+from utils.track_export import plan_export
+
+admin_bp = Blueprint('admin', __name__)
+
+ADMIN_TOKEN_HEADER = 'X-Admin-Token'
+
+def has_admin_token():
+    """Whether the request carries ADMIN_TOKEN; always False while it is unset."""
+    token = current_app.config['ADMIN_TOKEN']
+    supplied = request.headers.get(ADMIN_TOKEN_HEADER, '')
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+@admin_bp.before_request
+def require_admin_token():
+    """Organizer endpoints: callers must send ADMIN_TOKEN. Disabled while it is unset."""
+    if not has_admin_token():
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+@admin_bp.route('/participants/import', methods=['POST'])
+def import_participants_endpoint():
+    """
+    Register participants in bulk (see utils/participant_import.py for the format).
+    Body: JSON, CSV (Content-Type: text/csv) or a multipart 'file' (.csv or .json).
+    Query parameters: 'dry_run=1' validates only; 'strict=1' imports nothing
+    unless every row is valid. Answers with the per-row error report.
+    Larger sheets than IMPORT_MAX_ROWS go through import_participants_script.py.
+    """
+    upload = request.files.get('file')
+    try:
+        if upload is not None:
+            fmt = 'json' if upload.filename.lower().endswith('.json') else 'csv'
+            rows = parse_input(upload.read().decode('utf-8-sig'), fmt)
+        elif request.mimetype == 'text/csv':
+            rows = parse_input(request.get_data(as_text=True), 'csv')
+        elif request.is_json:
+            rows = parse_input(request.get_json(silent=True), 'json')
+        else:
+            return jsonify({'success': False, 'error': 'Send JSON, text/csv or a multipart file'}), 400
+    except (ImportFormatError, UnicodeDecodeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    max_rows = current_app.config['IMPORT_MAX_ROWS']
+    if len(rows) > max_rows:
+        return jsonify({'success': False,
+                        'error': f'{len(rows)} rows is more than {max_rows}; use import_participants_script.py'}), 413
+
+    dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    strict = request.args.get('strict', '').lower() in ('1', 'true', 'yes')
+    try:
+        report = import_participants(rows, current_app.config['PASSWORD_HASH_METHOD'],
+                                     current_app.config['IMPORT_HASH_WORKERS'], dry_run, strict)
+    except Exception as e:
+        current_app.logger.error(f"Error importing participants: {e}")
+        return jsonify({'success': False, 'error': 'The import failed; nothing was saved.'}), 500
+
+    status = 201 if report['created_users'] else 200
+    return jsonify({'success': not report['errors'], **report}), status
+
+# Resumes are one request each; the export is already behind the admin token
+@admin_bp.route('/tracks/<int:track_id>/export.zip', methods=['GET'])
+@limiter.exempt
+def export_track(track_id):
+    """
+    Every submission of the track with its files, as one streamed ZIP (see
+    utils/track_export.py). Query parameter: 'status', a comma-separated list
+    to export only e.g. 'Accepted'. Answers single-range requests with 206, so
+    an interrupted download resumes with 'Range: bytes=<size so far>-' and
+    'If-Range: <ETag>' (a full 200 if the export has changed since).
+    """
+    statuses = sorted({s.strip() for s in request.args.get('status', '').split(',') if s.strip()}) or None
+    track = db.session.get(Track, track_id)
+    if track is None:
+        return jsonify({'success': False, 'message': 'Track not found'}), 404
+    store = get_blob_store()
+    try:
+        layout, etag = plan_export(track, store, statuses)
+    except Exception as e:
+        current_app.logger.error(f"Error planning the export of track {track_id}: {e}")
+        return jsonify({'success': False, 'error': 'Could not prepare the export.'}), 500
+    finally:
+        db.session.close()  # the stream itself never touches the database
+
+    start, end, status = 0, layout.size - 1, 200
+    headers = {
+        'Accept-Ranges': 'bytes',
+        'Content-Disposition': f'attachment; filename="track-{track_id}-submissions.zip"',
+        'Cache-Control': 'private, no-cache',
+    }
+    if_range = request.if_range
+    if request.range is not None and len(request.range.ranges) == 1 and (
+            (if_range.etag is None and if_range.date is None) or if_range.etag == etag):
+        span = request.range.range_for_length(layout.size)
+        if span is None:
+            return Response(status=416, headers={'Content-Range': f'bytes */{layout.size}', 'ETag': f'"{etag}"'})
+        start, end, status = span[0], span[1] - 1, 206
+        headers['Content-Range'] = f'bytes {start}-{end}/{layout.size}'
+
+    logger = current_app.logger
+
+    def stream():
+        try:
+            yield from layout.iter_bytes(store, start, end)
+        except Exception as e:
+            logger.error(f"Export of track {track_id} failed mid-stream: {e}")
+            raise
+
+    response = Response(stream(), status=status, mimetype='application/zip', headers=headers)
+    response.headers['Content-Length'] = str(end - start + 1)
+    response.set_etag(etag)
+    return response
@@ -1,9 +1,11 @@
 # backend/routes/auth.py
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import create_access_token, create_refresh_token
 from marshmallow import Schema, fields, validate, ValidationError, validates
+from sqlalchemy import select
 from models import db, User, Team, TeamMember
+from utils.passwords import PasswordHasherBusy, get_password_hasher
+from utils.serialization import OutputSchema
 
 
 import re
@@ -31,6 +33,10 @@ def get_password_strength_violations(password):
         violations.append("Password must contain a special character.")
     return violations
 
+def find_user_by_email(email):
+    """Case-insensitive email lookup, served by the ix_user_email_lower index."""
+    return User.query.filter(db.func.lower(User.email) == email.lower()).first()
+
 # --- Marshmallow Schemas ---
 
 class MemberSchema(Schema):
@@ -87,9 +93,21 @@ individual_reg_schema = IndividualRegistrationSchema()
 team_reg_schema = TeamRegistrationSchema()
 login_schema = LoginSchema()
 
+# --- Output Schemas ---
+USER_OUTPUT = OutputSchema('id', 'name', 'expertise')
+REGISTERED_USER_OUTPUT = USER_OUTPUT.extend('email')  # only echoed back to the person who registered
+
 # --- Blueprint Definition ---
 auth_bp = Blueprint('auth', __name__)
 
+@auth_bp.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(error):
+    """Shed load quickly instead of queueing behind the CPU-bound hashing pool."""
+    db.session.rollback()
+    response = jsonify({'success': False, 'error': 'Server is busy, please try again in a moment.'})
+    response.headers['Retry-After'] = '2'
+    return response, 503
+
 # --- Routes ---
 
 @auth_bp.route('/register/individual', methods=['POST'])
@@ -108,23 +126,18 @@ def register_individual():
     name = data.get('name')
     expertise = data.get('expertise')
 
-    if User.query.filter_by(email=email).first():
+    if find_user_by_email(email):
         return jsonify({'success': False, 'error': 'User already exists'}), 400
 
     user = User(
         name=name,
         email=email,
-        password_hash=generate_password_hash(password),
+        password_hash=get_password_hasher().hash(password),
         expertise=expertise
     )
     db.session.add(user)
     db.session.commit()
-    return jsonify({'success': True, 'message': 'Individual registered successfully', 'user': {
-        'id': user.id,
-        'name': user.name,
-        'email': user.email,
-        'expertise': user.expertise
-    }}), 201
+    return jsonify({'success': True, 'message': 'Individual registered successfully', 'user': REGISTERED_USER_OUTPUT.dump(user)}), 201
 
 
 @auth_bp.route('/register/team', methods=['POST'])
@@ -143,7 +156,21 @@ def register_team():
     description = data.get('description') 
     members_data = data.get('members')
 
-    hashed_team_password = generate_password_hash(team_password)
+    # Repeats within the request, then one query for all member emails, before paying for the hash
+    member_emails = [member_info.get('email') for member_info in members_data]
+    seen = set()
+    for mem_email in member_emails:
+        if mem_email.lower() in seen:
+            return jsonify({'success': False, 'error': f'Email {mem_email} is given for more than one member'}), 400
+        seen.add(mem_email.lower())
+    taken = set(db.session.scalars(
+        select(db.func.lower(User.email)).where(db.func.lower(User.email).in_([e.lower() for e in member_emails]))
+    ))
+    for mem_email in member_emails:
+        if mem_email.lower() in taken:
+            return jsonify({'success': False, 'error': f'User with email {mem_email} already exists'}), 400
+
+    hashed_team_password = get_password_hasher().hash(team_password)
     team = Team(name=team_name, description=description)
     db.session.add(team)
 
@@ -153,10 +180,6 @@ def register_team():
         mem_name = member_info.get('name')
         mem_exp = member_info.get('expertise')
 
-        if User.query.filter_by(email=mem_email).first():
-            db.session.rollback()
-            return jsonify({'success': False, 'error': f'User with email {mem_email} already exists'}), 400
-
         user = User(
             name=mem_name,
             email=mem_email,
@@ -174,7 +197,8 @@ def register_team():
         db.session.commit()
     except Exception as e:
         db.session.rollback()
-        return jsonify({'success': False, 'error': f'An error occurred during team registration: {str(e)}'}), 500
+        current_app.logger.error(f"Error registering team {team_name!r}: {e}")
+        return jsonify({'success': False, 'error': 'An error occurred during team registration.'}), 500
 
     return jsonify({'success': True, 'message': 'Team registered successfully', 'team_id': team.id}), 201
 
@@ -193,10 +217,21 @@ def login():
     email = data.get('email')
     password = data.get('password')
 
-    user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, password):
+    hasher = get_password_hasher()
+    user = find_user_by_email(email)
+    # Unknown emails are checked against a dummy hash, so both failures take as long
+    if not hasher.verify(user.password_hash if user else None, password):
         return jsonify({'success': False, 'error': 'Invalid credentials'}), 401
 
+    if hasher.needs_rehash(user.password_hash):
+        # Hash parameters changed since this password was set; upgrade it while we have the plaintext
+        try:
+            user.password_hash = hasher.hash(password)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"Could not rehash password for user {user.id}: {e}")
+
     access_token = create_access_token(identity=user.id)
     refresh_token = create_refresh_token(identity=user.id)
 
@@ -204,9 +239,5 @@ def login():
         'success': True,
         'access_token': access_token,
         'refresh_token': refresh_token,
-        'user': {
-            'id': user.id,
-            'name': user.name,
-            'expertise': user.expertise
-        }
+        'user': USER_OUTPUT.dump(user)
     }), 200
@@ -0,0 +1,59 @@
+# backend/routes/health.py
+"""
+Probe endpoints for the platform (Cloud Run, docker-compose, load balancers).
+
+/healthz (liveness) only proves the process can answer; it never touches the
+database, so a database outage doesn't get healthy instances restarted.
+/readyz (readiness) checks the database is reachable and migrated to the
+latest revision before traffic is sent to this instance.
+"""
+import os
+import re
+from functools import lru_cache
+from flask import Blueprint, jsonify
+from sqlalchemy import text
+from models import db
+
+health_bp = Blueprint('health', __name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations', 'versions')
+READINESS_TIMEOUT_MS = 2000
+
+@lru_cache(maxsize=1)
+def migration_heads():
+    """
+    Latest revision(s) in migrations/versions. Read straight from the files:
+    loading Alembic itself would cost more than the whole check.
+    """
+    revisions, parents = set(), set()
+    for name in os.listdir(MIGRATIONS_DIR):
+        if not name.endswith('.py'):
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, name), encoding='utf-8') as f:
+            source = f.read()
+        revision = re.search(r"^revision = ['\"]([^'\"]+)['\"]", source, re.M)
+        down = re.search(r"^down_revision = ['\"]([^'\"]+)['\"]", source, re.M)
+        if revision:
+            revisions.add(revision.group(1))
+        if down:
+            parents.add(down.group(1))
+    return revisions - parents
+
+@health_bp.route('/healthz', methods=['GET'])
+def liveness():
+    return jsonify({'status': 'ok'}), 200
+
+@health_bp.route('/readyz', methods=['GET'])
+def readiness():
+    try:
+        with db.engine.connect() as conn:
+            # LOCAL: ends with the transaction, so neither the pool nor PgBouncer keeps it
+            conn.execute(text(f"SET LOCAL statement_timeout = {READINESS_TIMEOUT_MS}"))
+            current = set(conn.execute(text("SELECT version_num FROM alembic_version")).scalars())
+            conn.rollback()
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'error': f'Database check failed: {e.__class__.__name__}'}), 503
+    if current != migration_heads():
+        return jsonify({'status': 'unavailable', 'error': 'Database schema is not at the latest migration',
+                        'database': sorted(current), 'expected': sorted(migration_heads())}), 503
+    return jsonify({'status': 'ready'}), 200
@@ -0,0 +1,102 @@
+# backend/routes/me.py
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from marshmallow import Schema, fields, ValidationError, validate
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from models import db, Team, TeamMember, Track, User
+from routes.submissions import LISTING_OUTPUT, listing_query
+from routes.tracks import TRACK_OUTPUT
+from utils.pagination import encode_cursor
+from utils.serialization import OutputSchema
+
+me_bp = Blueprint('me', __name__)
+
+DASHBOARD_SECTIONS = ('profile', 'teams', 'submissions', 'tracks')
+DASHBOARD_SUBMISSIONS_LIMIT = 50
+
+# --- Marshmallow Schema ---
+
+class DashboardSchema(Schema):
+    """Query parameters of GET /api/me/dashboard."""
+    # Comma-separated subset of DASHBOARD_SECTIONS; all of them by default
+    sections = fields.Str(data_key='fields', load_default=','.join(DASHBOARD_SECTIONS))
+    submissions_limit = fields.Int(load_default=DASHBOARD_SUBMISSIONS_LIMIT, validate=validate.Range(min=1, max=500))
+
+dashboard_schema = DashboardSchema()
+
+def parse_sections(value):
+    sections = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = sorted(sections - set(DASHBOARD_SECTIONS))
+    if unknown or not sections:
+        raise ValidationError({'fields': [f"Choose from {', '.join(DASHBOARD_SECTIONS)}."
+                                          + (f" Unknown: {', '.join(unknown)}." if unknown else '')]})
+    return sections
+
+# --- Serialization ---
+
+PROFILE_OUTPUT = OutputSchema('id', 'name', 'email', 'expertise', 'created_at')
+
+# Teammates' emails are not shared
+MEMBER_OUTPUT = OutputSchema('user_id', ('name', 'user.name'), ('expertise', 'user.expertise'), 'role')
+
+# One of the caller's memberships, shown as the team
+TEAM_OUTPUT = OutputSchema(
+    ('id', 'team.id'), ('name', 'team.name'), ('description', 'team.description'), 'role',
+    ('members', lambda membership: MEMBER_OUTPUT.dump_many(sorted(membership.team.members, key=lambda m: m.id))),
+)
+
+# --- Routes ---
+
+@me_bp.route('/dashboard', methods=['GET'])
+@jwt_required()
+def get_dashboard():
+    """
+    Everything the dashboard renders, in one request: the caller's profile,
+    their teams with teammates, their newest submissions and the track list.
+    Query parameters: 'fields' (comma-separated sections to include, default
+    all) and 'submissions_limit' (default 50; 'next_submissions_cursor'
+    continues via GET /api/submissions/?user_id=...&cursor=...).
+    At most five queries, whatever the number of teams or teammates.
+    """
+    try:
+        args = dashboard_schema.load(request.args)
+        sections = parse_sections(args['sections'])
+    except ValidationError as err:
+        return jsonify({'success': False, 'errors': err.messages}), 400
+
+    user_id = int(get_jwt_identity())
+    result = {}
+    try:
+        if sections & {'profile', 'teams'}:
+            stmt = select(User).where(User.id == user_id)
+            if 'teams' in sections:
+                # memberships + their teams, then all members of those teams + their users: two more queries
+                stmt = stmt.options(
+                    selectinload(User.teams).joinedload(TeamMember.team)
+                    .selectinload(Team.members).joinedload(TeamMember.user)
+                )
+            user = db.session.scalars(stmt).one_or_none()
+            if user is None:
+                return jsonify({'success': False, 'message': 'User not found'}), 404
+            if 'profile' in sections:
+                result['profile'] = PROFILE_OUTPUT.dump(user)
+            if 'teams' in sections:
+                result['teams'] = TEAM_OUTPUT.dump_many(sorted(user.teams, key=lambda m: m.id))
+
+        if 'submissions' in sections:
+            limit = args['submissions_limit']
+            rows = db.session.execute(listing_query(user_id=user_id).limit(limit + 1)).all()
+            page = rows[:limit]
+            result['submissions'] = LISTING_OUTPUT.dump_many(page)
+            result['next_submissions_cursor'] = (
+                encode_cursor(page[-1].submission_date, page[-1].id) if len(rows) > limit else None
+            )
+
+        if 'tracks' in sections:
+            result['tracks'] = TRACK_OUTPUT.dump_many(db.session.scalars(select(Track).order_by(Track.id)))
+    except Exception as e:
+        current_app.logger.error(f"Error building dashboard for user {user_id}: {e}")
+        return jsonify({'success': False, 'error': 'Could not load the dashboard.'}), 500
+
+    return jsonify(result), 200
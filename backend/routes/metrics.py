@@ -0,0 +1,34 @@
+# backend/routes/metrics.py
+"""
+Prometheus scrape endpoint. With PROMETHEUS_MULTIPROC_DIR set (gunicorn),
+samples from every worker process are merged, so any worker can answer.
+Scrapers authenticate with "Authorization: Bearer <METRICS_TOKEN>" (or the
+organizers' X-Admin-Token); with neither token configured it answers 403.
+"""
+import hmac
+import os
+from flask import Blueprint, Response, current_app, jsonify, request
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from routes.admin import has_admin_token
+
+metrics_bp = Blueprint('metrics', __name__)
+
+def has_metrics_token():
+    """Whether the request carries METRICS_TOKEN as a bearer token; always False while it is unset."""
+    token = current_app.config['METRICS_TOKEN']
+    scheme, _, supplied = request.headers.get('Authorization', '').partition(' ')
+    return bool(token) and scheme.lower() == 'bearer' and hmac.compare_digest(supplied.encode(), token.encode())
+
+@metrics_bp.before_request
+def require_metrics_token():
+    if not (has_metrics_token() or has_admin_token()):
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def metrics():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
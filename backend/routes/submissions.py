@@ -1,9 +1,38 @@
 # backend/routes/submissions.py
-import os
-from flask import Blueprint, request, jsonify, current_app
+import hashlib
+import json
+import queue
+import threading
+import uuid
+from datetime import datetime, timedelta
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import Schema, fields, ValidationError, validate
-from models import db, Submission
+from sqlalchemy import func, select, tuple_, update
+from models import db, Submission, TeamMember, Track, UploadSession
+from routes.admin import has_admin_token
+from utils.storage import get_blob_store
+from utils.uploads import (
+    IncompleteChunk, create_partial, parse_content_range, partial_path,
+    keep_hasher, stage_stream, track_upload_limit, upload_sha256, write_chunk,
+)
+from utils.jobs import enqueue
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from utils.db_routing import read_replica
+from utils.notifications import get_notification_hub
+from utils.ratelimit import limiter
+from utils.serialization import OutputSchema, ndjson_stream
+
+SUBMISSION_STATUSES = ['Pending', 'Validating', 'Accepted', 'Rejected']
+# Rows fetched per round trip when streaming from a server-side cursor
+STREAM_BATCH_SIZE = 1000
+# Part of every submission ETag: bump it when SUBMISSION_OUTPUT changes shape
+SUBMISSION_JSON_VERSION = 2
+# updated_at is stamped when a transaction starts, so a row can commit with a stamp
+# older than rows already seen; the change feed re-sends this window to catch those
+CHANGE_FEED_SETTLE = timedelta(seconds=30)
+# How long an EventSource waits before reconnecting a dropped stream
+SSE_RETRY_MS = 5000
 
 # --- Marshmallow Schema ---
 
@@ -13,8 +42,38 @@ class SubmissionCreateSchema(Schema):
     # Note: File fields ('model_file', 'supporting_docs') are handled separately
     # as they come from request.files, not a JSON body.
 
+class UploadInitSchema(Schema):
+    """Schema for starting a resumable, chunked upload."""
+    track_id = fields.Int(required=True, strict=True, error_messages={"required": "Track ID is required."})
+    filename = fields.Str(required=True, validate=validate.Length(min=1, max=256))
+    size = fields.Int(required=True, strict=True, validate=validate.Range(min=1))
+    kind = fields.Str(load_default='model_file', validate=validate.OneOf(['model_file', 'supporting_docs']))
+    sha256 = fields.Str(load_default=None, validate=validate.Regexp(r'^[0-9a-fA-F]{64}$'))
+
+class UploadFinalizeSchema(Schema):
+    """Schema for turning a completed model upload into a submission."""
+    supporting_docs_upload_id = fields.Str(load_default=None, validate=validate.Length(equal=32))
+
+class SubmissionListSchema(Schema):
+    """Schema for the query string of the submission listing."""
+    limit = fields.Int(load_default=50, validate=validate.Range(min=1, max=500))
+    cursor = fields.Str(load_default=None)
+    track_id = fields.Int(load_default=None)
+    user_id = fields.Int(load_default=None)
+    status = fields.Str(load_default=None, validate=validate.OneOf(SUBMISSION_STATUSES))
+    format = fields.Str(load_default='json', validate=validate.OneOf(['json', 'ndjson']))
+
+class SubmissionChangesSchema(Schema):
+    """Schema for the query string of the per-user change feed."""
+    limit = fields.Int(load_default=100, validate=validate.Range(min=1, max=500))
+    cursor = fields.Str(load_default=None)
+
 # --- Initialize Schema ---
 submission_create_schema = SubmissionCreateSchema()
+upload_init_schema = UploadInitSchema()
+upload_finalize_schema = UploadFinalizeSchema()
+submission_list_schema = SubmissionListSchema()
+submission_changes_schema = SubmissionChangesSchema()
 
 # --- Blueprint Definition ---
 submissions_bp = Blueprint('submissions', __name__)
@@ -22,19 +81,79 @@ submissions_bp = Blueprint('submissions', __name__)
 # --- Helper Function ---
 def save_file(file, folder):
     """
-    Save an uploaded file to the given folder and return its path.
+    Stream an uploaded file into the blob store, staging it in the given folder.
+    Returns (key, sha256), or (None, None) if no file was provided.
     """
     if not file or not file.filename: # Basic check
+        return None, None
+    path, sha256, _size = stage_stream(file.stream, folder)
+    key, _created = get_blob_store().put_file(path, sha256)
+    return key, sha256
+
+SUBMISSION_OUTPUT = OutputSchema(
+    'id', 'track_id', 'submission_date', 'model_file_url', 'supporting_docs_url', 'status', 'updated_at'
+)
+
+def user_submissions_etag(user_id):
+    """
+    Fingerprint of a user's submission list, from an index-only scan: adding,
+    deleting or updating any row changes the count, the max id or the sum of
+    updated_at.
+    """
+    count, max_id, stamps = db.session.execute(
+        select(func.count(), func.max(Submission.id), func.sum(func.extract('epoch', Submission.updated_at)))
+        .where(Submission.user_id == user_id)
+    ).one()
+    return hashlib.sha256(f"{SUBMISSION_JSON_VERSION}:{user_id}:{count}:{max_id}:{stamps}".encode()).hexdigest()
+
+def polling_limit():
+    """
+    Rate limit of the endpoints clients poll (the ETag'd list and details and the
+    change feed), instead of the defaults, which a 30 s poll exhausts in 25 minutes.
+    """
+    return current_app.config['RATELIMIT_POLLING']
+
+def conditional_json(etag, build):
+    """
+    304 Not Modified when the client's If-None-Match matches `etag`, without
+    calling `build`; otherwise `build()`'s result as JSON. Clients must
+    revalidate every time, since these change as submissions are processed.
+    """
+    # Weak comparison: a compressed 200 went out with a weak ETag (utils/compression.py)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def get_owned_upload(upload_id, user_id, lock=False):
+    """
+    Return the upload session if it exists and belongs to the user, else None.
+    lock=True reads it with SELECT ... FOR UPDATE, held until the transaction ends.
+    """
+    upload = db.session.get(UploadSession, upload_id, with_for_update=lock, populate_existing=lock)
+    if not upload or upload.user_id != int(user_id):
         return None
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-    # Consider sanitizing filename here for security
-    # from werkzeug.utils import secure_filename
-    # filename = secure_filename(file.filename)
-    # file_path = os.path.join(folder, filename)
-    file_path = os.path.join(folder, file.filename) # Using original filename for now
-    file.save(file_path)
-    return file_path
+    return upload
+
+def upload_state(upload):
+    return {
+        'upload_id': upload.id,
+        'track_id': upload.track_id,
+        'kind': upload.kind,
+        'filename': upload.filename,
+        'size': upload.total_size,
+        'offset': upload.received_size,
+        'status': upload.status,
+        'submission_id': upload.submission_id
+    }
+
+def upload_expired(upload):
+    ttl = timedelta(hours=current_app.config.get('UPLOAD_SESSION_TTL_HOURS', 48))
+    return upload.created_at is not None and upload.created_at + ttl < datetime.utcnow()
 
 # --- Routes ---
 
@@ -72,13 +191,13 @@ def create_submission():
     # Basic check for file content (example: ensure file is not empty if it exists)
     # You might want more sophisticated checks (file type, size limits)
     
-    model_file_path = save_file(model_file, upload_folder)
+    model_file_path, model_file_sha256 = save_file(model_file, upload_folder)
     if not model_file_path: # save_file might return None if file is problematic
         return jsonify({'success': False, 'message': 'Could not save model file.'}), 400
 
-    supporting_docs_path = None
+    supporting_docs_path, supporting_docs_sha256 = None, None
     if supporting_docs_file and supporting_docs_file.filename: # Check if file was actually provided
-        supporting_docs_path = save_file(supporting_docs_file, upload_folder)
+        supporting_docs_path, supporting_docs_sha256 = save_file(supporting_docs_file, upload_folder)
         # Optionally handle error if supporting_docs_path couldn't be saved
 
     try:
@@ -86,10 +205,16 @@ def create_submission():
             user_id=user_id,
             track_id=track_id,
             model_file_url=model_file_path,
+            model_file_sha256=model_file_sha256,
+            model_file_name=model_file.filename,
             supporting_docs_url=supporting_docs_path,
+            supporting_docs_sha256=supporting_docs_sha256,
+            supporting_docs_name=supporting_docs_file.filename if supporting_docs_path else None,
             status='Pending'
         )
         db.session.add(submission)
+        db.session.flush()
+        enqueue('validate_submission', submission_id=submission.id)
         db.session.commit()
     except Exception as e:
         # Log the exception e for server-side debugging
@@ -99,27 +224,276 @@ def create_submission():
 
     return jsonify({'success': True, 'message': 'Submission created successfully', 'submission_id': submission.id}), 201
 
+@submissions_bp.route('/uploads', methods=['POST'])
+@jwt_required()
+def create_upload():
+    """
+    Start a resumable upload of one file.
+    Expects JSON with 'track_id', 'filename', 'size' (bytes), an optional 'kind'
+    ('model_file' or 'supporting_docs') and an optional 'sha256' to verify against.
+    The declared size is checked against the track's limit before any bytes are accepted.
+    """
+    user_id = get_jwt_identity()
+    json_data = request.get_json(silent=True)
+    if not json_data:
+        return jsonify({'success': False, 'error': 'No input data provided'}), 400
+    try:
+        data = upload_init_schema.load(json_data)
+    except ValidationError as err:
+        return jsonify({'success': False, 'errors': err.messages}), 400
+
+    track = db.session.get(Track, data['track_id'])
+    if not track:
+        return jsonify({'success': False, 'message': 'Track not found'}), 404
+    limit = track_upload_limit(track)
+    if data['size'] > limit:
+        return jsonify({'success': False, 'message': f'File exceeds the {limit} byte limit for this track'}), 413
+
+    upload = UploadSession(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        track_id=track.id,
+        kind=data['kind'],
+        filename=data['filename'],
+        total_size=data['size'],
+        received_size=0,
+        expected_sha256=data['sha256'].lower() if data['sha256'] else None,
+        status='Open'
+    )
+    try:
+        create_partial(current_app.config.get('UPLOAD_FOLDER', 'uploads'), upload.id)
+        db.session.add(upload)
+        db.session.commit()
+    except Exception as e:
+        current_app.logger.error(f"Error creating upload session: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'Could not start the upload.'}), 500
+
+    return jsonify({'success': True, **upload_state(upload),
+                    'chunk_max_size': current_app.config.get('UPLOAD_CHUNK_MAX_SIZE')}), 201
+
+# Once a session exists, its status, chunks and finalize are exempt from the default
+# limits: a 5 GB file is ~80 chunks of 64 MB, or more at the client's chunk size.
+# Starting a session (above) stays limited, which bounds what a caller can upload.
+@submissions_bp.route('/uploads/<string:upload_id>', methods=['GET'])
+@limiter.exempt
+@jwt_required()
+def get_upload(upload_id):
+    """Report how many bytes of an upload were received, so a client can resume."""
+    upload = get_owned_upload(upload_id, get_jwt_identity())
+    if not upload:
+        return jsonify({'success': False, 'message': 'Upload not found'}), 404
+    return jsonify({'success': True, **upload_state(upload)}), 200
+
+@submissions_bp.route('/uploads/<string:upload_id>', methods=['PUT'])
+@limiter.exempt
+@jwt_required()
+def upload_chunk(upload_id):
+    """
+    Receive one byte range of an upload.
+    The raw request body is the chunk and 'Content-Range: bytes <start>-<end>/<total>'
+    says where it goes. Chunks must arrive in order: <start> has to equal the
+    current offset, otherwise 409 is returned along with the offset to resume from.
+    """
+    upload = get_owned_upload(upload_id, get_jwt_identity())
+    if not upload:
+        return jsonify({'success': False, 'message': 'Upload not found'}), 404
+    if upload.status != 'Open':
+        return jsonify({'success': False, 'message': f'Upload is {upload.status.lower()}', **upload_state(upload)}), 409
+    if upload_expired(upload):
+        return jsonify({'success': False, 'message': 'Upload session expired'}), 410
+
+    try:
+        start, end, total = parse_content_range(request.headers.get('Content-Range'))
+    except ValueError as err:
+        return jsonify({'success': False, 'message': str(err)}), 400
+    length = end - start + 1
+    if total != upload.total_size:
+        return jsonify({'success': False, 'message': 'Content-Range total does not match the declared size'}), 400
+    if request.content_length != length:
+        return jsonify({'success': False, 'message': 'Content-Length does not match Content-Range'}), 400
+    if length > current_app.config.get('UPLOAD_CHUNK_MAX_SIZE'):
+        return jsonify({'success': False, 'message': 'Chunk too large'}), 413
+    if start != upload.received_size:
+        response = jsonify({'success': False, 'message': 'Chunk does not start at the current offset', **upload_state(upload)})
+        if upload.received_size:
+            response.headers['Range'] = f'bytes=0-{upload.received_size - 1}'
+        return response, 409
+
+    # Don't hold a pooled connection while the chunk streams in
+    db.session.commit()
+
+    path = partial_path(current_app.config.get('UPLOAD_FOLDER', 'uploads'), upload.id)
+    try:
+        hasher = write_chunk(request.stream, path, upload.id, start, length)
+    except IncompleteChunk as err:
+        return jsonify({'success': False, 'message': str(err)}), 400
+    except OSError as e:
+        current_app.logger.error(f"Error writing chunk for upload {upload_id}: {e}")
+        return jsonify({'success': False, 'message': 'Could not store chunk.'}), 500
+
+    # Advance the offset only if no concurrent request got there first
+    new_offset = end + 1
+    result = db.session.execute(
+        update(UploadSession)
+        .where(UploadSession.id == upload.id, UploadSession.received_size == start)
+        .values(received_size=new_offset, status='Complete' if new_offset == total else 'Open')
+    )
+    db.session.commit()
+    if result.rowcount != 1:
+        db.session.refresh(upload)
+        return jsonify({'success': False, 'message': 'Chunk conflicted with a concurrent upload', **upload_state(upload)}), 409
+    keep_hasher(upload.id, new_offset, hasher)  # only the accepted chunk's hash may reach finalize
+
+    db.session.refresh(upload)
+    response = jsonify({'success': True, **upload_state(upload)})
+    response.headers['Range'] = f'bytes=0-{new_offset - 1}'
+    return response, 200
+
+@submissions_bp.route('/uploads/<string:upload_id>/finalize', methods=['POST'])
+@limiter.exempt
+@jwt_required()
+def finalize_upload(upload_id):
+    """
+    Turn a completed model file upload (plus an optional completed supporting docs
+    upload) into a Submission. Finalizing the same upload twice returns the
+    submission created the first time.
+    """
+    user_id = get_jwt_identity()
+    try:
+        data = upload_finalize_schema.load(request.get_json(silent=True) or {})
+    except ValidationError as err:
+        return jsonify({'success': False, 'errors': err.messages}), 400
+
+    # Locked until the commit, so a retry that overlaps the first call waits and then finds it Finalized
+    model_upload = get_owned_upload(upload_id, user_id, lock=True)
+    if not model_upload or model_upload.kind != 'model_file':
+        return jsonify({'success': False, 'message': 'Model file upload not found'}), 404
+    if model_upload.status == 'Finalized':
+        return jsonify({'success': True, 'message': 'Submission already created', 'submission_id': model_upload.submission_id}), 200
+
+    uploads = [model_upload]
+    if data['supporting_docs_upload_id']:
+        docs_upload = get_owned_upload(data['supporting_docs_upload_id'], user_id, lock=True)
+        if not docs_upload or docs_upload.kind != 'supporting_docs' or docs_upload.track_id != model_upload.track_id:
+            return jsonify({'success': False, 'message': 'Supporting docs upload not found'}), 404
+        uploads.append(docs_upload)
+
+    for upload in uploads:
+        if upload.status != 'Complete':
+            return jsonify({'success': False, 'message': f'Upload {upload.id} is not complete', **upload_state(upload)}), 409
+
+    upload_folder = current_app.config.get('UPLOAD_FOLDER', 'uploads')
+    store = get_blob_store()
+    stored = {}
+    try:
+        for upload in uploads:
+            path = partial_path(upload_folder, upload.id)
+            upload.sha256 = upload_sha256(upload.id, path, upload.total_size)
+            if upload.expected_sha256 and upload.expected_sha256 != upload.sha256:
+                db.session.rollback()
+                return jsonify({'success': False, 'message': f'Checksum mismatch for upload {upload.id}'}), 422
+        for upload in uploads:
+            key, _created = store.put_file(partial_path(upload_folder, upload.id), upload.sha256)
+            stored[upload.kind] = (key, upload.sha256, upload.filename)
+
+        model_key, model_sha256, model_name = stored['model_file']
+        docs_key, docs_sha256, docs_name = stored.get('supporting_docs', (None, None, None))
+        submission = Submission(
+            user_id=user_id,
+            track_id=model_upload.track_id,
+            model_file_url=model_key,
+            model_file_sha256=model_sha256,
+            model_file_name=model_name,
+            supporting_docs_url=docs_key,
+            supporting_docs_sha256=docs_sha256,
+            supporting_docs_name=docs_name,
+            status='Pending'
+        )
+        db.session.add(submission)
+        db.session.flush()
+        enqueue('validate_submission', submission_id=submission.id)
+        for upload in uploads:
+            upload.status = 'Finalized'
+            upload.submission_id = submission.id
+        db.session.commit()
+    except Exception as e:
+        current_app.logger.error(f"Error finalizing upload {upload_id}: {e}")
+        db.session.rollback()
+        return jsonify({'success': False, 'message': 'An error occurred while creating the submission.'}), 500
+
+    return jsonify({'success': True, 'message': 'Submission created successfully', 'submission_id': submission.id,
+                    'model_file_sha256': submission.model_file_sha256}), 201
+
+LISTING_COLUMNS = (Submission.id, Submission.user_id, Submission.track_id, Submission.status, Submission.submission_date)
+LISTING_OUTPUT = OutputSchema(*(column.key for column in LISTING_COLUMNS))
+
+def listing_query(track_id=None, user_id=None, status=None, after=None):
+    """
+    Newest-first submission rows, optionally filtered, starting after the
+    (submission_date, id) key `after`. Plain column rows rather than ORM objects,
+    so nothing is added to the session's identity map.
+    """
+    stmt = select(*LISTING_COLUMNS).order_by(Submission.submission_date.desc(), Submission.id.desc())
+    if track_id is not None:
+        stmt = stmt.where(Submission.track_id == track_id)
+    if user_id is not None:
+        stmt = stmt.where(Submission.user_id == user_id)
+    if status is not None:
+        stmt = stmt.where(Submission.status == status)
+    if after is not None:
+        stmt = stmt.where(tuple_(Submission.submission_date, Submission.id) < after)
+    return stmt
+
 @submissions_bp.route('/', methods=['GET'])
+@read_replica
 def get_all_submissions():
     """
-    Retrieve all submissions.
-    No input data to validate with Marshmallow here.
+    List submissions, newest first, with keyset pagination on (submission_date, id).
+    Query parameters: 'limit', 'cursor' (the 'next_cursor' of the previous page),
+    and the filters 'track_id', 'user_id' and 'status'.
+    With 'format=ndjson' every matching row after the cursor is streamed as one
+    JSON object per line from a server-side cursor, in constant memory; that
+    export needs the organizers' X-Admin-Token (routes/admin.py).
     """
     try:
-        submissions = Submission.query.all()
-        return jsonify([{
-            'id': sub.id,
-            'user_id': sub.user_id,
-            'track_id': sub.track_id,
-            'status': sub.status,
-            'submission_date': sub.submission_date.isoformat() if sub.submission_date else None
-        } for sub in submissions]), 200
+        args = submission_list_schema.load(request.args)
+        after = decode_cursor(args['cursor'], datetime.fromisoformat) if args['cursor'] else None
+    except ValidationError as err:
+        return jsonify({'success': False, 'errors': err.messages}), 400
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    stmt = listing_query(args['track_id'], args['user_id'], args['status'], after)
+
+    if args['format'] == 'ndjson':
+        if not has_admin_token():
+            return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+        stream = db.session.execute(stmt.execution_options(yield_per=STREAM_BATCH_SIZE))
+
+        def generate():
+            try:
+                yield from ndjson_stream(stream, LISTING_OUTPUT, current_app.json, STREAM_BATCH_SIZE)
+            finally:
+                stream.close()
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    try:
+        rows = db.session.execute(stmt.limit(args['limit'] + 1)).all()
     except Exception as e:
         current_app.logger.error(f"Error getting all submissions: {e}")
         return jsonify({'success': False, 'error': 'Could not retrieve submissions.'}), 500
+    page = rows[:args['limit']]
+    next_cursor = None
+    if len(rows) > args['limit']:
+        next_cursor = encode_cursor(page[-1].submission_date, page[-1].id)
+    return jsonify({'submissions': LISTING_OUTPUT.dump_many(page), 'next_cursor': next_cursor}), 200
 
 @submissions_bp.route('/<int:user_id>', methods=['GET'])
+@limiter.limit(polling_limit)
 @jwt_required()
+@read_replica
 def get_user_submissions(user_id):
     """
     Retrieve all submissions for a specific user.
@@ -131,23 +505,133 @@ def get_user_submissions(user_id):
         return jsonify({'success': False, 'message': 'Unauthorized'}), 403
 
     try:
-        submissions = Submission.query.filter_by(user_id=user_id).all()
-        submissions_list = []
-        for submission in submissions:
-            submissions_list.append({
-                'id': submission.id,
-                'track_id': submission.track_id,
-                'submission_date': submission.submission_date.isoformat() if submission.submission_date else None,
-                'model_file_url': submission.model_file_url,
-                'supporting_docs_url': submission.supporting_docs_url,
-                'status': submission.status
-            })
-        return jsonify(submissions_list), 200
+        # Unchanged lists are answered from the fingerprint alone, without loading a row
+        return conditional_json(user_submissions_etag(user_id), lambda: SUBMISSION_OUTPUT.dump_many(
+            Submission.query.filter_by(user_id=user_id).all()
+        ))
     except Exception as e:
         current_app.logger.error(f"Error getting submissions for user {user_id}: {e}")
         return jsonify({'success': False, 'error': 'Could not retrieve user submissions.'}), 500
 
+@submissions_bp.route('/<int:user_id>/changes', methods=['GET'])
+@limiter.limit(polling_limit)
+@jwt_required()
+def get_user_submission_changes(user_id):
+    """
+    The user's submissions created or modified after 'cursor', oldest change
+    first. Start without a cursor, then send back the 'cursor' of each
+    response; 'has_more' means call again right away. Changes from the last
+    CHANGE_FEED_SETTLE may be sent twice, so merge them by 'id'.
+    Reads the primary: a lagging replica could skip changes for good.
+    """
+    if int(get_jwt_identity()) != user_id:
+        return jsonify({'success': False, 'message': 'Unauthorized'}), 403
+    try:
+        args = submission_changes_schema.load(request.args)
+        after = decode_cursor(args['cursor'], datetime.fromisoformat) if args['cursor'] else None
+    except ValidationError as err:
+        return jsonify({'success': False, 'errors': err.messages}), 400
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+    stmt = select(Submission).where(Submission.user_id == user_id).order_by(Submission.updated_at, Submission.id)
+    if after is not None:
+        stmt = stmt.where(tuple_(Submission.updated_at, Submission.id) > after)
+    try:
+        horizon = db.session.scalar(select(func.localtimestamp())) - CHANGE_FEED_SETTLE
+        rows = db.session.scalars(stmt.limit(args['limit'] + 1)).all()
+    except Exception as e:
+        current_app.logger.error(f"Error getting submission changes for user {user_id}: {e}")
+        return jsonify({'success': False, 'error': 'Could not retrieve submission changes.'}), 500
+
+    page = rows[:args['limit']]
+    has_more = len(rows) > args['limit']
+    next_key = after
+    if page:
+        last = (page[-1].updated_at, page[-1].id)
+        # Mid-backlog, move on; at the tail, stay before the settle window (but never go back)
+        next_key = last if has_more else min(last, (horizon, 0))
+        if after is not None:
+            next_key = max(next_key, after)
+    return jsonify({
+        'submissions': SUBMISSION_OUTPUT.dump_many(page),
+        'cursor': encode_cursor(*next_key) if next_key else None,
+        'has_more': has_more
+    }), 200
+
+def get_stream_slots():
+    """Per-process cap on open event streams: each one holds a worker thread."""
+    slots = current_app.extensions.get('submission_stream_slots')
+    if slots is None:
+        slots = current_app.extensions.setdefault(
+            'submission_stream_slots', threading.BoundedSemaphore(current_app.config['SSE_MAX_CONNECTIONS'])
+        )
+    return slots
+
+@submissions_bp.route('/events', methods=['GET'])
+@limiter.exempt  # EventSource reconnects on its own; SSE_MAX_CONNECTIONS bounds open streams instead
+@jwt_required(locations=['headers', 'query_string'])  # EventSource can't set headers: ?jwt=<token>
+def submission_events():
+    """
+    Server-sent events for the caller's and their teammates' submissions.
+    'submission' events carry {id, user_id, track_id, status, score, updated_at};
+    'resync' means events were missed and the list should be refetched (e.g.
+    via /<user_id>/changes). A comment line every SSE_HEARTBEAT_SECONDS keeps
+    proxies from closing the stream and notices clients that went away.
+    Nothing is queried while the stream is open: events are pushed from the
+    process's LISTEN connection (utils/notifications.py).
+    """
+    slots = get_stream_slots()
+    if not slots.acquire(blocking=False):
+        response = jsonify({'success': False, 'error': 'Too many open event streams, please retry later.'})
+        response.headers['Retry-After'] = '30'
+        return response, 503
+
+    user_id = int(get_jwt_identity())
+    try:
+        own_teams = select(TeamMember.team_id).where(TeamMember.user_id == user_id)
+        teammates = db.session.scalars(select(TeamMember.user_id).where(TeamMember.team_id.in_(own_teams))).all()
+        db.session.close()  # don't hold a pooled connection for the life of the stream
+        hub = get_notification_hub()
+        subscription = hub.subscribe({user_id, *teammates})
+    except Exception as e:
+        slots.release()
+        current_app.logger.error(f"Error opening the event stream for user {user_id}: {e}")
+        return jsonify({'success': False, 'error': 'Could not open the event stream.'}), 500
+
+    heartbeat = current_app.config['SSE_HEARTBEAT_SECONDS']
+    closed = False
+
+    def close_stream():
+        nonlocal closed
+        if not closed:
+            closed = True
+            hub.unsubscribe(subscription)
+            slots.release()
+
+    def generate():
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while True:
+                try:
+                    kind, data = subscription.events.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+        finally:
+            # Also reached when the client disconnects: the server closes the generator
+            close_stream()
+
+    response = Response(generate(), mimetype='text/event-stream')
+    # The generator's finally never runs if it is not started (e.g. a HEAD request), closing the response does
+    response.call_on_close(close_stream)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
+
 @submissions_bp.route('/detail/<int:submission_id>', methods=['GET'])
+@limiter.limit(polling_limit)
 @jwt_required()
 def get_submission(submission_id):
     """
@@ -163,16 +647,9 @@ def get_submission(submission_id):
         
         if submission.user_id != int(current_user_id): # Ensure type consistency
             return jsonify({'success': False, 'message': 'Unauthorized'}), 403
-            
-        submission_data = {
-            'id': submission.id,
-            'track_id': submission.track_id,
-            'submission_date': submission.submission_date.isoformat() if submission.submission_date else None,
-            'model_file_url': submission.model_file_url,
-            'supporting_docs_url': submission.supporting_docs_url,
-            'status': submission.status
-        }
-        return jsonify(submission_data), 200
+
+        etag = f"{SUBMISSION_JSON_VERSION}-{submission.id}-{submission.updated_at.timestamp()}"
+        return conditional_json(etag, lambda: SUBMISSION_OUTPUT.dump(submission))
     except Exception as e:
         current_app.logger.error(f"Error getting submission detail {submission_id}: {e}")
         return jsonify({'success': False, 'error': 'Could not retrieve submission details.'}), 500
@@ -1,41 +1,223 @@
 # backend/routes/tracks.py
-from flask import Blueprint, jsonify, abort
+import hashlib
+import mimetypes
+import os
+from urllib.parse import quote
+from flask import Blueprint, Response, current_app, has_app_context, jsonify, abort, redirect, request, send_file, url_for
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from models import db, Track, Dataset
+from utils.cache import TTLCache, on_commit_of
+from utils.datasets import choose_variant, dataset_manifest, dataset_path, file_digest, is_hosted
+from utils.leaderboard import entrant_count, rank_of, top_k
+from utils.db_routing import read_replica
+from utils.ratelimit import limiter
+from utils.compression import compress_cached
+from utils.serialization import OutputSchema
 
 tracks_bp = Blueprint('tracks', __name__)
 
+LEADERBOARD_DEFAULT_LIMIT = 10
+LEADERBOARD_MAX_LIMIT = 100
+
+# --- Response cache ---
+# Tracks and datasets change a handful of times per event, so their JSON is
+# cached per process, with its compressed variants, and served with an ETag
+# for conditional GETs.
+
+def get_tracks_cache():
+    """The tracks response cache for the current app, created on first use."""
+    cache = current_app.extensions.get('tracks_cache')
+    if cache is None:
+        cache = current_app.extensions['tracks_cache'] = TTLCache(
+            maxsize=current_app.config['TRACKS_CACHE_MAX_ENTRIES'],
+            ttl=current_app.config['TRACKS_CACHE_TTL']
+        )
+    return cache
+
+def invalidate_tracks_cache():
+    if has_app_context() and 'tracks_cache' in current_app.extensions:
+        current_app.extensions['tracks_cache'].clear()
+
+on_commit_of((Track, Dataset), invalidate_tracks_cache)
+
+def cached_json_response(key, build):
+    """
+    Serve `build()`'s JSON-serializable result from the cache, building it on a miss.
+    Answers 304 Not Modified when the client's If-None-Match matches.
+    """
+    cache = get_tracks_cache()
+    entry = cache.get(key)
+    if entry is None:
+        body = current_app.json.dumps_bytes(build())
+        entry = (body, hashlib.sha256(body).hexdigest(), {})
+        cache.set(key, entry)
+    body, etag, encoded = entry
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['TRACKS_CACHE_MAX_AGE']
+    return compress_cached(response, encoded).make_conditional(request)
+
+TRACK_OUTPUT = OutputSchema('id', 'name', 'description', 'rules')
+
 @tracks_bp.route('/', methods=['GET'])
+@read_replica
 def get_tracks():
     try:
-        tracks = Track.query.all()
-        return jsonify([{
-            'id': track.id,
-            'name': track.name,
-            'description': track.description,
-            'rules': track.rules
-        } for track in tracks]), 200
+        return cached_json_response(('tracks',), lambda: TRACK_OUTPUT.dump_many(
+            db.session.scalars(select(Track).order_by(Track.id))
+        ))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def dataset_profile(dataset):
+    """The stored profile of a dataset's file (utils/dataset_profile.py), or None until it is built."""
+    if not dataset.profile:
+        return None
+    profile = {key: value for key, value in dataset.profile.items() if key != 'source'}
+    profile['sha256'] = dataset.profile_sha256
+    profile['profiled_at'] = dataset.profiled_at
+    return profile
+
+DATASET_OUTPUT = OutputSchema(
+    'id', 'dataset_name', 'description', 'file_url',
+    ('download_url', lambda dataset: url_for('tracks.download_dataset', track_id=dataset.track_id,
+                                             dataset_id=dataset.id) if is_hosted(dataset) else None),
+    ('profile', dataset_profile),
+)
+TRACK_DETAIL_OUTPUT = TRACK_OUTPUT.extend(('datasets', lambda track: DATASET_OUTPUT.dump_many(track.datasets)))
+
+def load_track_detail(track_id):
+    # One query for the track and its datasets
+    track = db.session.scalars(
+        select(Track).options(joinedload(Track.datasets)).where(Track.id == track_id)
+    ).unique().one_or_none()
+    if not track:
+        abort(404, description="Track not found")
+    return TRACK_DETAIL_OUTPUT.dump(track)
+
 @tracks_bp.route('/<int:track_id>', methods=['GET'])
+@read_replica
 def get_track(track_id):
-    """Endpoint to get details for a specific track, including its datasets."""
-    track = Track.query.get(track_id)
+    """
+    Endpoint to get details for a specific track, including its datasets and
+    their precomputed profiles (columns, statistics, sample rows).
+    """
+    return cached_json_response(('track', track_id), lambda: load_track_detail(track_id))
+
+@tracks_bp.route('/<int:track_id>/leaderboard', methods=['GET'])
+def get_leaderboard(track_id):
+    """
+    Top-k entrants of a track, read in index order from the precomputed leaderboard.
+    Query parameters: 'limit' (default 10, max 100) and 'offset'.
+    """
+    track = db.session.get(Track, track_id)
+    if not track:
+        abort(404, description="Track not found")
+    limit = min(max(request.args.get('limit', LEADERBOARD_DEFAULT_LIMIT, type=int), 1), LEADERBOARD_MAX_LIMIT)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    return jsonify({
+        'track_id': track.id,
+        'metric': track.metric,
+        'entrants': entrant_count(track.id),
+        'entries': top_k(track.id, limit, offset)
+    }), 200
+
+@tracks_bp.route('/<int:track_id>/leaderboard/me', methods=['GET'])
+@jwt_required()
+def get_my_rank(track_id):
+    """Rank of the caller's team (or of the caller, if not in a team) on a track."""
+    track = db.session.get(Track, track_id)
     if not track:
         abort(404, description="Track not found")
-    datasets = Dataset.query.filter_by(track_id=track_id).all()
-    datasets_list = []
-    for dataset in datasets:
-        datasets_list.append({
-            'id': dataset.id,
-            'dataset_name': dataset.dataset_name,
-            'description': dataset.description,
-            'file_url': dataset.file_url
-        })
     return jsonify({
-        'id': track.id,
-        'name': track.name,
-        'description': track.description,
-        'rules': track.rules,
-        'datasets': datasets_list
+        'track_id': track.id,
+        'metric': track.metric,
+        'entrants': entrant_count(track.id),
+        'entry': rank_of(track.id, int(get_jwt_identity()))
     }), 200
+
+# --- Dataset files ---
+
+def hosted_dataset(track_id, dataset_id):
+    """(dataset, absolute path) of a dataset file served from DATASET_FOLDER; 404 otherwise."""
+    dataset = db.session.get(Dataset, dataset_id)
+    if dataset is None or dataset.track_id != track_id:
+        abort(404, description="Dataset not found")
+    path = dataset_path(dataset, current_app.config)
+    if is_hosted(dataset) and (path is None or not os.path.isfile(path)):
+        current_app.logger.error(f"Dataset {dataset_id} file is missing: {dataset.file_url}")
+        abort(404, description="Dataset file not found")
+    return dataset, path
+
+# Downloads and manifests are exempt from the default rate limits: a client fetches a
+# file as parallel Range requests of DATASET_CHUNK_SIZE, one request per chunk, and the
+# bytes go out through sendfile() or the front proxy
+@tracks_bp.route('/<int:track_id>/datasets/<int:dataset_id>/download', methods=['GET'])
+@limiter.exempt
+def download_dataset(track_id, dataset_id):
+    """
+    The dataset file, as its smallest precompressed variant the client accepts
+    (Content-Encoding). Supports Range/If-Range and If-None-Match against a
+    strong ETag (the SHA-256 of the bytes sent). Clients downloading in
+    parallel ranges should send 'Accept-Encoding: identity' and check each
+    chunk against GET .../manifest. Datasets hosted elsewhere redirect there.
+    """
+    dataset, path = hosted_dataset(track_id, dataset_id)
+    if path is None:
+        return redirect(dataset.file_url)
+    config = current_app.config
+    encoding, variant_path = choose_variant(path, request.accept_encodings)
+    etag = file_digest(variant_path, config)['sha256']
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    name = os.path.basename(path)
+
+    mode = config['DATASET_SEND_MODE']
+    if mode not in ('x-accel-redirect', 'x-sendfile'):
+        # Range, If-Range and conditional requests are handled by send_file; gunicorn
+        # sends whole-file responses with sendfile() via wsgi.file_wrapper
+        response = send_file(variant_path, mimetype=mimetype, as_attachment=True, download_name=name,
+                             conditional=True, etag=etag, max_age=config['DATASET_CACHE_MAX_AGE'])
+    else:
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            # The proxy sends the file and handles Range itself (If-Range against the ETag set here)
+            response = Response(mimetype=mimetype)
+            relative = os.path.relpath(variant_path, os.path.abspath(config['DATASET_FOLDER']))
+            if mode == 'x-accel-redirect':
+                response.headers['X-Accel-Redirect'] = config['DATASET_ACCEL_PREFIX'] + quote(relative.replace(os.sep, '/'))
+            else:
+                response.headers['X-Sendfile'] = variant_path
+            response.headers.set('Content-Disposition', 'attachment', filename=name)
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = config['DATASET_CACHE_MAX_AGE']
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+@tracks_bp.route('/<int:track_id>/datasets/<int:dataset_id>/manifest', methods=['GET'])
+@limiter.exempt
+def get_dataset_manifest(track_id, dataset_id):
+    """
+    Size, SHA-256 and per-chunk SHA-256 of every representation of a hosted
+    dataset file ('identity', 'gzip', 'zstd'), for verified parallel downloads.
+    """
+    dataset, path = hosted_dataset(track_id, dataset_id)
+    if path is None:
+        return jsonify({'success': False, 'message': 'This dataset is hosted elsewhere', 'file_url': dataset.file_url}), 404
+    manifest = dataset_manifest(path, current_app.config)
+    response = jsonify({
+        'track_id': track_id,
+        'dataset_id': dataset_id,
+        'download_url': url_for('tracks.download_dataset', track_id=track_id, dataset_id=dataset_id),
+        **manifest,
+    })
+    response.set_etag(hashlib.sha256(response.get_data()).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['DATASET_CACHE_MAX_AGE']
+    return response.make_conditional(request)
@@ -0,0 +1,107 @@
+"""
+Script to (re)score the accepted submissions of a track in parallel.
+- Use after changing a track's metric or ground truth file.
+- Scores in a ProcessPoolExecutor; the ground truth is converted and
+  memory-mapped once, then shared by every process through the page cache.
+- Results are written back with one bulk UPDATE per batch, then the
+  track's leaderboard is rebuilt.
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from sqlalchemy import select, update
+from app import create_app
+from models import db, Submission, Track
+from utils.leaderboard import rebuild_track
+from utils.scoring import (
+    ScoringError, ground_truth_file, higher_is_better, is_scored_track, load_ground_truth, score_file,
+)
+from utils.storage import create_blob_store, local_copy
+
+STORAGE_SETTINGS = ('STORAGE_BACKEND', 'STORAGE_ROOT', 'S3_BUCKET', 'S3_PREFIX', 'S3_ENDPOINT_URL', 'S3_REGION')
+WRITE_BATCH_SIZE = 500
+
+
+def _score_one(task):
+    """
+    Runs in a pool process; returns (submission_id, score, rejection, failure).
+    A rejection is the predictions' fault and rejects the submission. A failure
+    (e.g. a missing blob) leaves it as it is, and is reported.
+    """
+    submission_id, key, storage_config, ground_truth, metric, cache_folder = task
+    try:
+        store = create_blob_store(storage_config)
+        with local_copy(store, key) as path:
+            return submission_id, score_file(path, ground_truth, metric, cache_folder), None, None
+    except ScoringError as e:
+        return submission_id, None, str(e), None
+    except Exception as e:  # one bad task must not abort the whole rescore
+        return submission_id, None, None, f'{e.__class__.__name__}: {e}'
+
+
+def _write_results(results):
+    now = datetime.utcnow()
+    scored = [{'id': sid, 'score': score, 'scored_at': now, 'status_message': None}
+              for sid, score, rejection, failure in results if rejection is None and failure is None]
+    rejected = [{'id': sid, 'status': 'Rejected', 'status_message': f'Could not score predictions: {rejection}'}
+                for sid, score, rejection, failure in results if rejection is not None]
+    if scored:
+        db.session.execute(update(Submission), scored)
+    if rejected:
+        db.session.execute(update(Submission), rejected)
+    db.session.commit()
+    return len(scored), len(rejected)
+
+
+def rescore_track(track_id, workers=None, only_unscored=False):
+    app = create_app()
+    with app.app_context():
+        track = db.session.get(Track, track_id)
+        if not is_scored_track(track):
+            print(f"Track {track_id} has no metric or ground truth file.")
+            return
+
+        config = app.config
+        ground_truth = ground_truth_file(track, config)
+        cache_folder = config['SCORING_CACHE_FOLDER']
+        load_ground_truth(ground_truth, cache_folder)  # convert once before the pool starts
+
+        query = select(Submission.id, Submission.model_file_url).where(
+            Submission.track_id == track_id, Submission.status == 'Accepted')
+        if only_unscored:
+            query = query.where(Submission.score.is_(None))
+        storage_config = {name: config.get(name) for name in STORAGE_SETTINGS}
+        tasks = [(sid, key, storage_config, ground_truth, track.metric, cache_folder)
+                 for sid, key in db.session.execute(query)]
+        db.session.commit()
+
+        totals = [0, 0]
+        batch = []
+        failed = 0
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for result in pool.map(_score_one, tasks, chunksize=8):
+                submission_id, _score, _rejection, failure = result
+                if failure is not None:
+                    failed += 1
+                    print(f"Submission {submission_id} was not scored: {failure}")
+                batch.append(result)
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    for i, n in enumerate(_write_results(batch)):
+                        totals[i] += n
+                    batch = []
+        for i, n in enumerate(_write_results(batch)):
+            totals[i] += n
+        rebuild_track(track_id, higher_is_better(track.metric))
+        db.session.commit()
+        print(f"Scored {totals[0]} submissions with {track.metric}; {totals[1]} could not be scored"
+              f" and were rejected; {failed} failed and were left unchanged.")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--track', type=int, required=True, help='Track ID to rescore')
+    parser.add_argument('--workers', type=int, default=None, help='Scoring processes (default: CPU count)')
+    parser.add_argument('--only-unscored', action='store_true', help='Skip submissions that already have a score')
+    args = parser.parse_args()
+    rescore_track(args.track, workers=args.workers, only_unscored=args.only_unscored)
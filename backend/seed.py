@@ -1,16 +1,32 @@
 # backend/seed.py
+"""
+Reset the database to the demo fixture (three users, two teams, two tracks).
+With --users/--teams/--submissions/--tracks, synthetic data at the given
+scale is bulk-loaded on top (utils/synthetic_data.py), for benchmarks:
+
+  python seed.py --users 200000 --teams 40000 --submissions 1000000 --tracks 10 [--seed 0] [--blobs 50]
+
+Synthetic users sign in as user<id>@synthetic.test with password 'synthetic-pass'.
+The same --seed gives the same data.
+"""
+import argparse
+import time
 from datetime import datetime, timezone
 from werkzeug.security import generate_password_hash
+from flask_migrate import upgrade
 from app import create_app
 from models import db, User, Team, TeamMember, Track, Submission, Dataset
+from utils import synthetic_data
 
 
-def seed_database():
+def seed_database(synthetic=None):
     app = create_app()
     with app.app_context():
-        # Drop and recreate tables
+        # Drop and recreate tables through the migrations, so the schema matches `flask db upgrade`
         db.drop_all()
-        db.create_all()
+        db.session.execute(db.text('DROP TABLE IF EXISTS alembic_version'))
+        db.session.commit()
+        upgrade()
 
         # --- Create Individual Users with Expertise ---
         users = [
@@ -142,6 +158,34 @@ def seed_database():
 
         print('Database seeded successfully!')
 
+        # --- Synthetic load-test data ---
+        if synthetic:
+            start = time.perf_counter()
+            counts = synthetic_data.generate(**synthetic, log=lambda line: print(f'  {line}'))
+            print(f"Added {counts['users']} users, {counts['teams']} teams, {counts['submissions']} submissions "
+                  f"on {counts['tracks']} tracks in {time.perf_counter() - start:.1f}s.")
+
 
 if __name__ == '__main__':
-    seed_database()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=0, help='Synthetic users')
+    parser.add_argument('--teams', type=int, default=0, help='Synthetic teams (2-4 of the synthetic users each)')
+    parser.add_argument('--submissions', type=int, default=0, help='Synthetic submissions')
+    parser.add_argument('--tracks', type=int, default=0, help='Synthetic tracks')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--blobs', type=int, default=0, help='Fake prediction files to store and attach to submissions')
+    parser.add_argument('--blob-size', type=int, default=64 * 1024, help='Size of each fake file in bytes')
+    parser.add_argument('--deadline', type=datetime.fromisoformat, default=synthetic_data.DEFAULT_DEADLINE,
+                        help='Submission deadline the rush builds up to (ISO format, UTC)')
+    args = parser.parse_args()
+    synthetic = None
+    if args.users or args.teams or args.submissions or args.tracks or args.blobs:
+        synthetic = {'users': args.users, 'teams': args.teams, 'submissions': args.submissions,
+                     'tracks': args.tracks, 'seed': args.seed, 'blobs': args.blobs,
+                     'blob_size': args.blob_size, 'deadline': args.deadline}
+    if synthetic:
+        try:
+            synthetic_data.check_counts(args.users, args.teams, args.submissions, args.tracks, args.blobs)
+        except ValueError as e:
+            parser.error(str(e))  # before anything is dropped
+    seed_database(synthetic)
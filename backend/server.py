@@ -0,0 +1,10 @@
+# backend/server.py
+"""
+WSGI entry point for gunicorn: `gunicorn server:app`.
+
+Builds the app in serving mode (see create_app). Scripts and the `flask` CLI
+import create_app from app.py instead, so importing app.py never builds an app.
+"""
+from app import create_app
+
+app = create_app(serve=True)
@@ -0,0 +1,62 @@
+"""
+Script to garbage-collect the submission blob store.
+- Deletes blobs no longer referenced by any Submission (after a grace period,
+  so blobs of uploads that are being finalized right now are kept).
+- Expires upload sessions that were never finalized and removes their partial files.
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+from app import create_app
+from models import db, Submission, UploadSession
+from utils.storage import collect_garbage, get_blob_store
+from utils.uploads import partial_path
+
+
+def referenced_hashes():
+    """SHA-256 of every blob some submission still points at."""
+    referenced = set()
+    for column in (Submission.model_file_sha256, Submission.supporting_docs_sha256):
+        rows = db.session.execute(db.select(column).where(column.isnot(None)).distinct())
+        referenced.update(sha256 for (sha256,) in rows)
+    return referenced
+
+
+def expire_uploads(upload_folder, ttl_hours, dry_run=False):
+    """Mark stale, unfinalized upload sessions as expired and delete their partial files."""
+    cutoff = datetime.utcnow() - timedelta(hours=ttl_hours)
+    stale = UploadSession.query.filter(
+        UploadSession.status.in_(['Open', 'Complete']),
+        UploadSession.created_at < cutoff
+    ).all()
+    for upload in stale:
+        if dry_run:
+            continue
+        try:
+            os.remove(partial_path(upload_folder, upload.id))
+        except FileNotFoundError:
+            pass
+        upload.status = 'Expired'
+    if not dry_run:
+        db.session.commit()
+    return len(stale)
+
+
+def run_gc(grace_hours=None, dry_run=False):
+    app = create_app()
+    with app.app_context():
+        if grace_hours is None:
+            grace_hours = app.config['STORAGE_GC_GRACE_HOURS']
+        expired = expire_uploads(app.config['UPLOAD_FOLDER'], app.config['UPLOAD_SESSION_TTL_HOURS'], dry_run)
+        deleted, freed = collect_garbage(get_blob_store(), referenced_hashes(), grace_hours * 3600, dry_run)
+        verb = "Would delete" if dry_run else "Deleted"
+        print(f"Expired {expired} upload sessions.")
+        print(f"{verb} {len(deleted)} unreferenced blobs ({freed} bytes).")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--grace-hours', type=int, default=None, help='Keep unreferenced blobs younger than this')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted without deleting')
+    args = parser.parse_args()
+    run_gc(grace_hours=args.grace_hours, dry_run=args.dry_run)
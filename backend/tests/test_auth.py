@@ -0,0 +1,41 @@
+# backend/tests/test_auth.py
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from models import db, Team, User
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+        except Exception as e:
+            pytest.skip(f'needs the database: {e}')
+    return app
+
+
+def team_registration(team_name, *emails):
+    return {
+        'team_name': team_name,
+        'team_password': 'Correct-Horse-42',
+        'members': [{'name': f'Member {i}', 'email': email, 'expertise': 'ML'} for i, email in enumerate(emails)],
+    }
+
+
+def test_register_team_rejects_an_email_repeated_within_the_request(app):
+    tag = uuid.uuid4().hex
+    team_name = f'Team {tag[:8]}'
+    response = app.test_client().post('/api/auth/register/team', json=team_registration(
+        team_name, f'a-{tag}@example.test', f'b-{tag}@example.test', f'A-{tag}@Example.test'))
+    assert response.status_code == 400
+    assert 'more than one member' in response.get_json()['error']
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count()).select_from(User).where(
+            db.func.lower(User.email).like(f'%-{tag}@example.test'))) == 0
+        assert db.session.scalar(db.select(Team).where(Team.name == team_name)) is None
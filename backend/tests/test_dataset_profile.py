@@ -0,0 +1,34 @@
+# backend/tests/test_dataset_profile.py
+import pytest
+
+from utils.dataset_profile import DISTINCT_LIMIT, MIN_CHUNK_ROWS, profile_file
+
+ROWS = 3 * MIN_CHUNK_ROWS + 17
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    # Five columns and chunk_cells=5000 give chunks of exactly MIN_CHUNK_ROWS rows, each within DISTINCT_LIMIT
+    path = tmp_path / 'train.csv'
+    lines = ['id,label,bucket,score,city'] + [
+        f'{i},{i % 2},{i // 3},{i % 7}.5,{"Oslo" if i % 3 else "Lima"}' for i in range(ROWS)]
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+@pytest.mark.parametrize('chunk_cells', [5000, 1_000_000])
+def test_distinct_values_across_chunks(csv_path, chunk_cells):
+    columns = {column['name']: column for column in profile_file(csv_path, chunk_cells)['columns']}
+
+    unique_id = columns['id']
+    assert unique_id['many_distinct'] and unique_id['distinct'] is None
+    assert 'top_values' not in unique_id
+
+    bucket = columns['bucket']  # more than DISTINCT_LIMIT values, but each seen three times
+    assert bucket['many_distinct'] and bucket['distinct'] is None
+    assert len(bucket['top_values']) == 5
+
+    assert columns['label']['distinct'] == 2
+    assert columns['score']['distinct'] == 7
+    assert {entry['value'] for entry in columns['city']['top_values']} == {'Oslo', 'Lima'}
+    assert columns['id']['count'] == ROWS and DISTINCT_LIMIT < ROWS
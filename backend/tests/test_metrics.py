@@ -0,0 +1,36 @@
+# backend/tests/test_metrics.py
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config.update(TESTING=True, ADMIN_TOKEN='organizer-secret', METRICS_TOKEN='scraper-secret')
+    return app
+
+
+@pytest.mark.parametrize('headers', [
+    {},
+    {'Authorization': 'Bearer wrong'},
+    {'Authorization': 'Basic scraper-secret'},
+    {'X-Admin-Token': 'scraper-secret'},
+])
+def test_metrics_needs_a_token(app, headers):
+    assert app.test_client().get('/metrics', headers=headers).status_code == 403
+
+
+@pytest.mark.parametrize('headers', [
+    {'Authorization': 'Bearer scraper-secret'},
+    {'X-Admin-Token': 'organizer-secret'},
+])
+def test_metrics_with_a_token(app, headers):
+    response = app.test_client().get('/metrics', headers=headers)
+    assert response.status_code == 200
+    assert b'# TYPE' in response.data
+
+
+def test_metrics_closed_while_no_token_is_set(app):
+    app.config.update(ADMIN_TOKEN=None, METRICS_TOKEN=None)
+    assert app.test_client().get('/metrics', headers={'Authorization': 'Bearer '}).status_code == 403
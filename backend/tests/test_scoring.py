@@ -0,0 +1,135 @@
+# backend/tests/test_scoring.py
+import math
+
+import numpy as np
+import pytest
+
+from utils.scoring import (
+    METRICS, ScoringError, accuracy, auc, f1, higher_is_better, log_loss, mae, read_values, rmse, score_file,
+)
+
+
+def array(*values):
+    return np.array(values, dtype=np.float64)
+
+
+def test_metric_values():
+    assert accuracy(array(1, 0, 1, 1), array(1, 0, 0, 1)) == 0.75
+    assert f1(array(1, 0, 1, 1), array(1, 0, 0, 1)) == pytest.approx(0.8)  # tp 2, fn 1
+    assert f1(array(0, 1, 2, 2), array(0, 2, 2, 1)) == pytest.approx(0.5)  # per class 1, 0, 0.5
+    assert f1(array(0, 0), array(0, 0)) == 0.0
+    assert rmse(array(0, 0), array(3, 4)) == pytest.approx(math.sqrt(12.5))
+    assert mae(array(0, 0), array(3, 4)) == 3.5
+    assert auc(array(0, 0, 1, 1), array(0.1, 0.4, 0.35, 0.8)) == 0.75
+    assert auc(array(0, 1, 0, 1), array(0.5, 0.5, 0.2, 0.9)) == 0.875  # a tie counts one half
+    assert log_loss(array(1, 0), array(0.9, 0.1)) == pytest.approx(-math.log(0.9))
+
+
+def test_auc_needs_both_classes():
+    with pytest.raises(ScoringError):
+        auc(array(1, 1), array(0.2, 0.8))
+
+
+def test_ranking_direction():
+    assert {name for name in METRICS if higher_is_better(name)} == {'accuracy', 'f1', 'auc'}
+    assert {name for name in METRICS if not higher_is_better(name)} == {'rmse', 'mae', 'log_loss'}
+
+
+@pytest.mark.parametrize('content, expected', [
+    ('0.5\n1.5\n2\n', [0.5, 1.5, 2]),
+    ('prediction\n1\n0\n', [1, 0]),  # header row
+    ('id,prediction\n1,0.25\n2,0.75\n', [0.25, 0.75]),  # last column
+    ('7\n', [7]),
+])
+def test_read_csv(tmp_path, content, expected):
+    path = tmp_path / 'predictions.csv'
+    path.write_text(content)
+    assert read_values(str(path)).tolist() == expected
+
+
+@pytest.mark.parametrize('values, expected', [
+    (np.array([1, 0, 1]), [1, 0, 1]),
+    (np.array([[1, 0.25], [2, 0.75]]), [0.25, 0.75]),  # last column
+    (np.array([True, False]), [True, False]),
+])
+def test_read_npy(tmp_path, values, expected):
+    path = tmp_path / 'predictions.npy'
+    np.save(path, values)
+    assert read_values(str(path)).tolist() == expected
+
+
+@pytest.mark.parametrize('values', [
+    np.array(3.0),  # 0-d
+    np.zeros((2, 2, 2)),
+    np.zeros((3, 0)),
+    np.array(['a', 'b']),
+], ids=['0-d', '3-d', 'no-columns', 'strings'])
+def test_read_npy_rejects_unusable_arrays(tmp_path, values):
+    path = tmp_path / 'predictions.npy'
+    np.save(path, values)
+    with pytest.raises(ScoringError):
+        read_values(str(path))
+
+
+def test_read_npy_rejects_object_and_truncated_files(tmp_path):
+    objects = tmp_path / 'objects.npy'
+    np.save(objects, np.array([{'a': 1}, None], dtype=object), allow_pickle=True)
+    truncated = tmp_path / 'truncated.npy'
+    np.save(truncated, np.arange(1000, dtype=np.float64))
+    truncated.write_bytes(truncated.read_bytes()[:200])
+    for path in (objects, truncated):
+        with pytest.raises(ScoringError):
+            read_values(str(path))
+
+
+def test_read_csv_rejects_unparsable_values(tmp_path):
+    path = tmp_path / 'predictions.csv'
+    path.write_text('prediction\n1\nyes\n')
+    with pytest.raises(ScoringError):
+        read_values(str(path))
+
+
+@pytest.fixture
+def ground_truth(tmp_path):
+    path = tmp_path / 'truth.csv'
+    path.write_text('label\n1\n0\n1\n1\n')
+    return str(path)
+
+
+def score(tmp_path, ground_truth, content, metric='accuracy'):
+    path = tmp_path / 'predictions.csv'
+    path.write_text(content)
+    return score_file(str(path), ground_truth, metric, str(tmp_path / 'cache'))
+
+
+def test_score_file(tmp_path, ground_truth):
+    assert score(tmp_path, ground_truth, '1\n0\n0\n1\n') == 0.75
+    assert score(tmp_path, ground_truth, '1\n0\n0\n1\n', metric='mae') == 0.25
+
+
+@pytest.mark.parametrize('content, metric', [
+    ('1\n0\n1\n', 'accuracy'),  # too few rows
+    ('1\n0\nnan\n1\n', 'accuracy'),
+    ('1\n0\ninf\n1\n', 'rmse'),
+    ('1\n0\n1\n1\n', 'top_k'),
+])
+def test_score_file_rejects(tmp_path, ground_truth, content, metric):
+    with pytest.raises(ScoringError):
+        score(tmp_path, ground_truth, content, metric)
+
+
+def test_score_file_rejects_binary_garbage(tmp_path, ground_truth):
+    path = tmp_path / 'predictions.bin'
+    path.write_bytes(b'\xff\xfe\x00garbage')
+    with pytest.raises(ScoringError):
+        score_file(str(path), ground_truth, 'accuracy', str(tmp_path / 'cache'))
+
+
+def test_rescore_task_reports_a_missing_blob_instead_of_raising(tmp_path, ground_truth):
+    from score_submissions_script import _score_one
+
+    storage = {'STORAGE_BACKEND': 'local', 'STORAGE_ROOT': str(tmp_path / 'blobs')}
+    submission_id, value, rejection, failure = _score_one(
+        (7, 'ab/cd/' + 'abcd' * 16, storage, ground_truth, 'accuracy', str(tmp_path / 'cache')))
+    assert (submission_id, value, rejection) == (7, None, None)
+    assert failure.startswith('FileNotFoundError')
@@ -0,0 +1,45 @@
+# backend/tests/test_storage.py
+import hashlib
+import os
+import time
+
+from utils.storage import LocalBlobStore, collect_garbage
+
+DAY = 24 * 3600
+
+
+def stage(tmp_path, content):
+    path = tmp_path / f'staged-{time.monotonic_ns()}'
+    path.write_bytes(content)
+    return str(path), hashlib.sha256(content).hexdigest()
+
+
+def test_dedup_hit_restarts_the_grace_period(tmp_path):
+    store = LocalBlobStore(str(tmp_path / 'blobs'))
+    key, created = store.put_file(*stage(tmp_path, b'model'))
+    assert created
+    long_ago = time.time() - 2 * DAY
+    os.utime(store.local_path(key), (long_ago, long_ago))  # stored, then no longer referenced
+
+    staged, sha256 = stage(tmp_path, b'model')
+    assert store.put_file(staged, sha256) == (key, False)  # a new upload of the same bytes
+    assert not os.path.exists(staged)
+
+    deleted, _freed = collect_garbage(store, referenced=set(), grace_seconds=DAY)
+    assert deleted == []
+    assert store.exists(key)
+
+
+def test_collect_garbage_deletes_old_unreferenced_blobs(tmp_path):
+    store = LocalBlobStore(str(tmp_path / 'blobs'))
+    old_key, _ = store.put_file(*stage(tmp_path, b'old'))
+    kept_key, _ = store.put_file(*stage(tmp_path, b'referenced'))
+    new_key, _ = store.put_file(*stage(tmp_path, b'new'))
+    long_ago = time.time() - 2 * DAY
+    for key in (old_key, kept_key):
+        os.utime(store.local_path(key), (long_ago, long_ago))
+
+    deleted, freed = collect_garbage(store, referenced={kept_key.rsplit('/', 1)[1]}, grace_seconds=DAY)
+    assert deleted == [old_key]
+    assert freed == len(b'old')
+    assert not store.exists(old_key) and store.exists(kept_key) and store.exists(new_key)
@@ -0,0 +1,230 @@
+# backend/tests/test_submissions.py
+import hashlib
+import os
+import threading
+import time
+import uuid
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import select, text
+
+from app import create_app
+from models import db, Job, Submission, Track, UploadSession, User
+import routes.submissions
+from routes.submissions import get_stream_slots
+from utils.notifications import get_notification_hub
+from utils.uploads import partial_path
+
+DEFAULT_HOURLY_LIMIT = 50  # utils/ratelimit.py
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app()
+    app.config.update(TESTING=True, UPLOAD_FOLDER=str(tmp_path), STORAGE_ROOT=str(tmp_path / 'blobs'))
+    with app.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+        except Exception as e:
+            pytest.skip(f'needs the database: {e}')
+    return app
+
+
+@pytest.fixture
+def user_and_track(app):
+    with app.app_context():
+        user = User(name='Upload Test', email=f'upload-{uuid.uuid4().hex}@example.test', password_hash='x')
+        track = Track(name=f'Upload test {uuid.uuid4().hex[:8]}')
+        db.session.add_all([user, track])
+        db.session.commit()
+        ids = user.id, track.id
+    yield ids
+    with app.app_context():
+        submission_ids = select(Submission.id).where(Submission.user_id == ids[0])
+        db.session.execute(db.delete(UploadSession).where(UploadSession.user_id == ids[0]))
+        db.session.execute(db.delete(Job).where(Job.submission_id.in_(submission_ids)))
+        db.session.execute(db.delete(Submission).where(Submission.user_id == ids[0]))
+        db.session.execute(db.delete(User).where(User.id == ids[0]))
+        db.session.execute(db.delete(Track).where(Track.id == ids[1]))
+        db.session.commit()
+
+
+def auth_headers(app, user_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+
+
+def upload(client, headers, track_id, content, **fields):
+    """Start an upload session and send `content` in one chunk. Returns the upload id."""
+    response = client.post('/api/submissions/uploads', headers=headers,
+                           json={'track_id': track_id, 'filename': 'model.bin', 'size': len(content), **fields})
+    assert response.status_code == 201, response.get_json()
+    upload_id = response.get_json()['upload_id']
+    response = client.put(f'/api/submissions/uploads/{upload_id}', data=content, headers={
+        **headers, 'Content-Range': f'bytes 0-{len(content) - 1}/{len(content)}'})
+    assert response.status_code == 200, response.get_json()
+    return upload_id
+
+
+def test_resumable_upload_is_not_capped_by_the_default_rate_limit(app, user_and_track):
+    user_id, track_id = user_and_track
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+    chunks = [os.urandom(16) for _ in range(DEFAULT_HOURLY_LIMIT + 10)]
+    total = sum(len(chunk) for chunk in chunks)
+    client = app.test_client()
+
+    response = client.post('/api/submissions/uploads', headers=headers,
+                           json={'track_id': track_id, 'filename': 'model.bin', 'size': total})
+    assert response.status_code == 201
+    upload_id = response.get_json()['upload_id']
+
+    offset = 0
+    for chunk in chunks:
+        response = client.put(f'/api/submissions/uploads/{upload_id}', data=chunk, headers={
+            **headers, 'Content-Range': f'bytes {offset}-{offset + len(chunk) - 1}/{total}'})
+        assert response.status_code == 200, (offset, response.status_code)
+        offset += len(chunk)
+        assert client.get(f'/api/submissions/uploads/{upload_id}', headers=headers).status_code == 200
+
+    assert response.get_json()['status'] == 'Complete'
+    with open(partial_path(app.config['UPLOAD_FOLDER'], upload_id), 'rb') as f:
+        assert f.read() == b''.join(chunks)
+
+
+def test_polling_endpoints_outlast_the_default_rate_limit(app, user_and_track):
+    user_id, _track_id = user_and_track
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+    client = app.test_client()
+
+    response = client.get(f'/api/submissions/{user_id}', headers=headers)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    for _ in range(DEFAULT_HOURLY_LIMIT + 10):
+        response = client.get(f'/api/submissions/{user_id}', headers={**headers, 'If-None-Match': etag})
+        assert response.status_code == 304
+        assert client.get(f'/api/submissions/{user_id}/changes', headers=headers).status_code == 200
+
+
+def test_head_of_the_event_stream_gives_its_slot_back(app, user_and_track):
+    user_id, _track_id = user_and_track
+    app.config['SSE_MAX_CONNECTIONS'] = 2
+    with app.app_context():
+        headers = {'Authorization': f'Bearer {create_access_token(identity=user_id)}'}
+    client = app.test_client()
+
+    for _ in range(3):
+        with client.head('/api/submissions/events', headers=headers) as response:  # closed, as the server does
+            assert response.status_code == 200
+    with app.app_context():
+        assert get_stream_slots()._value == 2
+        assert user_id not in get_notification_hub()._by_user
+
+
+def test_overlapping_finalizes_create_one_submission(app, user_and_track, monkeypatch):
+    user_id, track_id = user_and_track
+    headers = auth_headers(app, user_id)
+    upload_id = upload(app.test_client(), headers, track_id, os.urandom(64))
+
+    # Widen the window in which a retry overlaps the first call
+    upload_sha256 = routes.submissions.upload_sha256
+    monkeypatch.setattr(routes.submissions, 'upload_sha256', lambda *args: time.sleep(0.3) or upload_sha256(*args))
+    responses = []
+
+    def finalize():
+        responses.append(app.test_client().post(f'/api/submissions/uploads/{upload_id}/finalize', headers=headers))
+
+    threads = [threading.Thread(target=finalize) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(response.status_code for response in responses) == [200, 201]
+    assert len({response.get_json()['submission_id'] for response in responses}) == 1
+    with app.app_context():
+        assert db.session.scalar(select(db.func.count()).where(Submission.user_id == user_id)) == 1
+
+
+def test_ndjson_export_of_the_listing_needs_the_admin_token(app):
+    app.config['ADMIN_TOKEN'] = 'organizer-secret'
+    client = app.test_client()
+
+    assert client.get('/api/submissions/?format=ndjson').status_code == 403
+    assert client.get('/api/submissions/?format=ndjson', headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    response = client.get('/api/submissions/?format=ndjson', headers={'X-Admin-Token': 'organizer-secret'})
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert client.get('/api/submissions/').status_code == 200  # pages of JSON stay public
+
+
+def test_out_of_order_chunk_is_refused_with_the_offset_to_resume_from(app, user_and_track):
+    user_id, track_id = user_and_track
+    headers = auth_headers(app, user_id)
+    client = app.test_client()
+    response = client.post('/api/submissions/uploads', headers=headers,
+                           json={'track_id': track_id, 'filename': 'model.bin', 'size': 32})
+    url = f"/api/submissions/uploads/{response.get_json()['upload_id']}"
+
+    def put(start, end):
+        return client.put(url, data=os.urandom(end - start + 1),
+                          headers={**headers, 'Content-Range': f'bytes {start}-{end}/32'})
+
+    response = put(16, 31)
+    assert response.status_code == 409
+    assert response.get_json()['offset'] == 0
+    assert put(0, 15).status_code == 200
+    response = put(0, 15)  # a retry of a chunk that already arrived
+    assert response.status_code == 409
+    assert response.get_json()['offset'] == 16
+    assert response.headers['Range'] == 'bytes=0-15'
+    assert put(16, 31).get_json()['status'] == 'Complete'
+
+
+def test_upload_over_the_track_limit_is_refused(app, user_and_track):
+    user_id, track_id = user_and_track
+    with app.app_context():
+        db.session.get(Track, track_id).max_upload_size = 100
+        db.session.commit()
+    headers = auth_headers(app, user_id)
+    client = app.test_client()
+
+    def start(size):
+        return client.post('/api/submissions/uploads', headers=headers,
+                           json={'track_id': track_id, 'filename': 'model.bin', 'size': size})
+
+    assert start(101).status_code == 413
+    assert start(100).status_code == 201
+
+
+def test_finalize_verifies_the_declared_checksum(app, user_and_track):
+    user_id, track_id = user_and_track
+    headers = auth_headers(app, user_id)
+    client = app.test_client()
+    content = os.urandom(48)
+
+    upload_id = upload(client, headers, track_id, content, sha256=hashlib.sha256(b'something else').hexdigest())
+    response = client.post(f'/api/submissions/uploads/{upload_id}/finalize', headers=headers)
+    assert response.status_code == 422
+    assert client.get(f'/api/submissions/uploads/{upload_id}', headers=headers).get_json()['status'] == 'Complete'
+
+    upload_id = upload(client, headers, track_id, content, sha256=hashlib.sha256(content).hexdigest().upper())
+    response = client.post(f'/api/submissions/uploads/{upload_id}/finalize', headers=headers)
+    assert response.status_code == 201
+    assert response.get_json()['model_file_sha256'] == hashlib.sha256(content).hexdigest()
+
+
+def test_finalizing_twice_returns_the_same_submission(app, user_and_track):
+    user_id, track_id = user_and_track
+    headers = auth_headers(app, user_id)
+    client = app.test_client()
+    upload_id = upload(client, headers, track_id, os.urandom(48))
+
+    first = client.post(f'/api/submissions/uploads/{upload_id}/finalize', headers=headers)
+    again = client.post(f'/api/submissions/uploads/{upload_id}/finalize', headers=headers)
+    assert (first.status_code, again.status_code) == (201, 200)
+    assert again.get_json()['submission_id'] == first.get_json()['submission_id']
+    with app.app_context():
+        assert db.session.scalar(select(db.func.count()).where(Submission.user_id == user_id)) == 1
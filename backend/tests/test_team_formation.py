@@ -0,0 +1,59 @@
+# backend/tests/test_team_formation.py
+import random
+
+import pytest
+
+from utils.team_formation import CODER, EXPERTISE_CATEGORIES, MODES, form_teams, summarize
+
+MAX_SIZE = 4
+
+
+def participants(n, seed=1):
+    rng = random.Random(seed)
+    expertise = EXPERTISE_CATEGORIES + ['Astronomy']  # one outside the known categories
+    return [(user_id, rng.choice(expertise)) for user_id in range(1, n + 1)]
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('n', [0, 1, 3, 4, 5, 17, 103])
+def test_everyone_is_placed_once_within_the_size_limit(mode, n):
+    members = participants(n)
+    teams = form_teams(members, MAX_SIZE, 1, random.Random(42), mode)
+
+    placed = [member for team in teams for member in team]
+    assert sorted(placed) == sorted(members)
+    assert all(1 <= len(team) <= MAX_SIZE for team in teams)
+    assert len(teams) == -(-n // MAX_SIZE)  # as few teams as the size limit allows
+
+
+@pytest.mark.parametrize('mode', MODES)
+def test_same_seed_gives_the_same_teams(mode):
+    members = participants(60)
+    first = form_teams(members, MAX_SIZE, 1, random.Random(7), mode)
+    assert form_teams(members, MAX_SIZE, 1, random.Random(7), mode) == first
+    assert form_teams(list(reversed(members)), MAX_SIZE, 1, random.Random(7), mode) == first
+    assert form_teams(members, MAX_SIZE, 1, random.Random(8), mode) != first
+
+
+def test_greedy_fills_every_team_but_the_last():
+    teams = form_teams(participants(103), MAX_SIZE, 1, random.Random(42), 'greedy')
+    assert [len(team) for team in teams[:-1]] == [MAX_SIZE] * (len(teams) - 1)
+    assert len(teams[-1]) == 103 % MAX_SIZE
+
+
+def test_balanced_sizes_differ_by_at_most_one():
+    summary = summarize(form_teams(participants(103), 5, 1, random.Random(42), 'balanced'), 1)
+    assert summary['max_size'] - summary['min_size'] <= 1
+
+
+@pytest.mark.parametrize('coders', [0, 5, 10, 30])
+def test_balanced_gives_as_many_teams_as_possible_their_coders(coders):
+    members = [(i, CODER) for i in range(coders)] + [(100 + i, 'Designer') for i in range(40 - coders)]
+    teams = form_teams(members, MAX_SIZE, 2, random.Random(3), 'balanced')
+    short = summarize(teams, 2)['teams_short_of_coders']
+    assert short == len(teams) - min(len(teams), coders // 2)
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        form_teams(participants(4), MAX_SIZE, 1, random.Random(0), 'alphabetical')
@@ -0,0 +1,126 @@
+# backend/tests/test_track_export.py
+import io
+import struct
+import zipfile
+import zlib
+from datetime import datetime
+
+import pytest
+
+from utils.track_export import ZIP32_LIMIT, ZIP32_MAX_ENTRIES, ZipLayout
+
+MOMENT = datetime(2025, 3, 1, 12, 30, 10)
+
+
+class MemoryStore:
+    """Blobs held in memory; a blob given as an int is that many zero bytes, never materialized."""
+
+    def __init__(self, blobs):
+        self.blobs = blobs
+
+    def open(self, key, offset=0):
+        blob = self.blobs[key]
+        if isinstance(blob, int):
+            return Zeros(blob - offset)
+        return io.BytesIO(blob[offset:])
+
+
+class Zeros(io.RawIOBase):
+    def __init__(self, size):
+        self.remaining = size
+
+    def read(self, n=-1):
+        n = self.remaining if n < 0 else min(n, self.remaining)
+        self.remaining -= n
+        return bytes(n)
+
+
+class LayoutFile(io.RawIOBase):
+    """Random access to a layout's bytes, produced on demand through iter_bytes."""
+
+    def __init__(self, layout, store):
+        self.layout, self.store, self.position = layout, store, 0
+
+    def seekable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        self.position = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.layout.size}[whence] + offset
+        return self.position
+
+    def tell(self):
+        return self.position
+
+    def readinto(self, buffer):
+        end = min(self.position + len(buffer), self.layout.size) - 1
+        if end < self.position:
+            return 0
+        data = b''.join(self.layout.iter_bytes(self.store, self.position, end))
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+
+def entry(name, content, key=None):
+    return name, len(content), zlib.crc32(content), MOMENT, key or content
+
+
+@pytest.fixture
+def layout_and_store():
+    blobs = {'blob-model': b'model weights ' * 1000, 'blob-docs': b'%PDF-1.7 report'}
+    entries = [entry('manifest.json', b'{"submissions": []}')] + [
+        entry(f'submissions/{i}/{key}.bin', content, key) for i, (key, content) in enumerate(blobs.items(), 1)
+    ] + [entry('submissions/3/empty.txt', b'')]
+    return ZipLayout(entries), MemoryStore(blobs)
+
+
+def test_layout_is_a_valid_zip(layout_and_store):
+    layout, store = layout_and_store
+    data = b''.join(layout.iter_bytes(store))
+    assert len(data) == layout.size
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        assert archive.namelist() == ['manifest.json', 'submissions/1/blob-model.bin',
+                                      'submissions/2/blob-docs.bin', 'submissions/3/empty.txt']
+        assert archive.read('submissions/1/blob-model.bin') == store.blobs['blob-model']
+        assert archive.getinfo('manifest.json').date_time == (2025, 3, 1, 12, 30, 10)
+
+
+def test_ranges_match_slices_of_the_whole(layout_and_store):
+    layout, store = layout_and_store
+    data = b''.join(layout.iter_bytes(store))
+    boundaries = sorted({offset for offset, _length, _content in layout.parts} | {layout.size})
+    spans = [(0, layout.size - 1), (0, 0), (layout.size - 1, layout.size - 1), (7, 12345)]
+    spans += [(max(b - 1, 0), min(b, layout.size - 1)) for b in boundaries]  # across every part boundary
+    for start, end in spans:
+        assert b''.join(layout.iter_bytes(store, start, end)) == data[start:end + 1], (start, end)
+
+
+def test_zip64_for_sizes_and_offsets_past_4_gib():
+    after = b'entry stored past the 4 GiB mark'
+    store = MemoryStore({'huge': ZIP32_LIMIT + 10, 'after': after})
+    layout = ZipLayout([('huge.bin', ZIP32_LIMIT + 10, 0, MOMENT, 'huge'), entry('after.txt', after, 'after')])
+
+    with zipfile.ZipFile(LayoutFile(layout, store)) as archive:
+        huge, small = archive.infolist()
+        assert huge.file_size == huge.compress_size == ZIP32_LIMIT + 10
+        assert small.header_offset > ZIP32_LIMIT
+        assert archive.read('after.txt') == after  # seeks through the ZIP64 offset, checks the CRC
+
+
+def test_zip64_for_more_than_65535_entries():
+    count = ZIP32_MAX_ENTRIES + 2
+    layout = ZipLayout([entry(f'{i}.txt', b'x') for i in range(count)])
+    data = b''.join(layout.iter_bytes(MemoryStore({})))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert len(archive.infolist()) == count
+        assert archive.read(f'{count - 1}.txt') == b'x'
+    # zipfile walks the directory by its size, so check the ZIP64 end record's counts directly
+    record = data.rfind(b'PK\x06\x06')
+    assert record > 0
+    assert struct.unpack_from('<QQ', data, record + 24) == (count, count)
@@ -0,0 +1,65 @@
+# backend/tests/test_tracks.py
+import uuid
+
+import pytest
+from sqlalchemy import event, text
+
+from app import create_app
+from config import Config
+from models import db, Track
+from utils.db_routing import REPLICA_BIND
+
+
+@pytest.fixture
+def app(monkeypatch):
+    # The "replica" is a second engine on the test database: what matters is which engine a query goes to
+    monkeypatch.setattr(Config, 'SQLALCHEMY_BINDS', {
+        REPLICA_BIND: {'url': Config.SQLALCHEMY_DATABASE_URI, **Config.SQLALCHEMY_ENGINE_OPTIONS},
+    })
+    app = create_app()
+    app.config.update(TESTING=True)
+    with app.app_context():
+        try:
+            db.session.execute(text('SELECT 1'))
+        except Exception as e:
+            pytest.skip(f'needs the database: {e}')
+    return app
+
+
+@pytest.fixture
+def track_id(app):
+    with app.app_context():
+        track = Track(name=f'Replica test {uuid.uuid4().hex[:8]}')
+        db.session.add(track)
+        db.session.commit()
+        track_id = track.id
+    yield track_id
+    with app.app_context():
+        db.session.execute(db.delete(Track).where(Track.id == track_id))
+        db.session.commit()
+
+
+@pytest.fixture
+def queries(app):
+    """The statements each engine runs, by bind name (None for the primary)."""
+    seen = {None: [], REPLICA_BIND: []}
+    with app.app_context():
+        for bind, engine in ((None, db.engine), (REPLICA_BIND, db.engines[REPLICA_BIND])):
+            event.listen(engine, 'before_cursor_execute',
+                         lambda conn, cursor, statement, *args, seen=seen[bind]: seen.append(statement))
+    return seen
+
+
+def test_read_replica_view_reads_from_the_replica(app, track_id, queries):
+    response = app.test_client().get(f'/api/tracks/{track_id}')
+    assert response.status_code == 200
+    assert response.get_json()['id'] == track_id
+    assert any('FROM track' in statement for statement in queries[REPLICA_BIND])
+    assert not any('FROM track' in statement for statement in queries[None])
+
+
+def test_other_views_read_from_the_primary(app, track_id, queries):
+    response = app.test_client().get(f'/api/tracks/{track_id}/leaderboard')
+    assert response.status_code == 200
+    assert any('FROM track' in statement for statement in queries[None])
+    assert not any('FROM track' in statement for statement in queries[REPLICA_BIND])
@@ -0,0 +1,29 @@
+# backend/tests/test_uploads.py
+import hashlib
+import io
+
+from utils.uploads import create_partial, keep_hasher, upload_sha256, write_chunk
+
+
+def test_only_an_accepted_chunk_feeds_the_running_hash(tmp_path):
+    path = create_partial(str(tmp_path), 'upload-1')
+    keep_hasher('upload-1', 8, write_chunk(io.BytesIO(b'header--'), path, 'upload-1', 0, 8))
+    # Two requests race for offset 8: the loser picks up the running hash, the winner's bytes land last
+    loser = write_chunk(io.BytesIO(b'rejected'), path, 'upload-1', 8, 8)
+    winner = write_chunk(io.BytesIO(b'accepted'), path, 'upload-1', 8, 8)
+    keep_hasher('upload-1', 16, winner)
+    assert loser is not None  # and never kept
+
+    assert upload_sha256('upload-1', path, 16) == hashlib.sha256(b'header--accepted').hexdigest()
+
+
+def test_running_hash_spans_chunks(tmp_path):
+    path = create_partial(str(tmp_path), 'upload-2')
+    offset = 0
+    for chunk in (b'first ', b'second ', b'third'):
+        keep_hasher('upload-2', offset + len(chunk), write_chunk(io.BytesIO(chunk), path, 'upload-2', offset, len(chunk)))
+        offset += len(chunk)
+    with open(path, 'wb') as f:
+        f.write(b'not what was hashed')  # proves the running hash, not the file, is used
+
+    assert upload_sha256('upload-2', path, offset) == hashlib.sha256(b'first second third').hexdigest()
@@ -0,0 +1,86 @@
+# backend/tests/test_validation.py
+import bz2
+import errno
+import gzip
+import hashlib
+import io
+import lzma
+import tarfile
+import zipfile
+
+import pytest
+
+from utils import validation
+from utils.storage import LocalBlobStore
+from utils.validation import ValidationProblem, check_stored_file
+
+CONFIG = {'MAX_ARCHIVE_MEMBERS': 100, 'MAX_ARCHIVE_UNPACKED_SIZE': 10 ** 8, 'MAX_ARCHIVE_COMPRESSION_RATIO': 10 ** 6}
+PAYLOAD = hashlib.sha512(b'seed').digest() * 2000  # compresses, but not to nothing
+
+
+def zipped(method):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', method) as archive:
+        archive.writestr('weights.bin', PAYLOAD)
+    return buffer.getvalue()
+
+
+def tarred(compression):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=f'w:{compression}') as archive:
+        info = tarfile.TarInfo('weights.bin')
+        info.size = len(PAYLOAD)
+        archive.addfile(info, io.BytesIO(PAYLOAD))
+    return buffer.getvalue()
+
+
+ARCHIVES = {
+    'zip-deflate': lambda: zipped(zipfile.ZIP_DEFLATED),
+    'zip-bzip2': lambda: zipped(zipfile.ZIP_BZIP2),
+    'zip-lzma': lambda: zipped(zipfile.ZIP_LZMA),
+    'tar.gz': lambda: tarred('gz'),
+    'tar.bz2': lambda: tarred('bz2'),
+    'tar.xz': lambda: tarred('xz'),
+    'gzip': lambda: gzip.compress(PAYLOAD),
+    'bzip2': lambda: bz2.compress(PAYLOAD),
+    'xz': lambda: lzma.compress(PAYLOAD),
+}
+
+
+def damaged(content):
+    middle = len(content) // 2
+    return content[:middle] + bytes(b ^ 0xFF for b in content[middle:middle + 64]) + content[middle + 64:]
+
+
+def check(tmp_path, content):
+    store = LocalBlobStore(str(tmp_path / 'blobs'))
+    staged = tmp_path / 'staged'
+    staged.write_bytes(content)
+    sha256 = hashlib.sha256(content).hexdigest()
+    key, _ = store.put_file(str(staged), sha256)
+    return check_stored_file(store, key, sha256, len(content), CONFIG)
+
+
+@pytest.mark.parametrize('name', ARCHIVES)
+def test_intact_archives_pass(tmp_path, name):
+    content = ARCHIVES[name]()
+    fmt, size, _crc = check(tmp_path, content)
+    assert size == len(content)
+    assert fmt in validation.ARCHIVE_FORMATS
+
+
+@pytest.mark.parametrize('name', ARCHIVES)
+def test_damaged_archives_are_rejected(tmp_path, name):
+    with pytest.raises(ValidationProblem, match='corrupt'):
+        check(tmp_path, damaged(ARCHIVES[name]()))
+
+
+@pytest.mark.parametrize('name', ['zip-deflate', 'tar.bz2', 'bzip2'])
+def test_read_errors_propagate_for_a_retry(tmp_path, monkeypatch, name):
+    def failing_drain(fileobj, budget):
+        raise OSError(errno.EIO, 'Input/output error')
+
+    monkeypatch.setattr(validation, '_drain', failing_drain)
+    with pytest.raises(OSError) as raised:
+        check(tmp_path, ARCHIVES[name]())
+    assert raised.type is OSError and raised.value.errno == errno.EIO
@@ -0,0 +1,75 @@
+# backend/utils/cache.py
+"""
+Small in-process caches.
+
+TTLCache is a per-process LRU map whose entries also expire after a fixed
+time. Each gunicorn worker holds its own copy; explicit invalidation only
+reaches the process that made the change, so the TTL bounds how stale the
+other processes can be.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a per-entry time to live."""
+
+    def __init__(self, maxsize=256, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def on_commit_of(models, callback):
+    """
+    Call `callback()` after any session commits a change (insert, update or
+    delete through the ORM) to an instance of one of `models`. Bulk
+    UPDATE/DELETE statements bypass the ORM and are not seen.
+    """
+    models = tuple(models)
+    flag = f'changed:{id(callback)}'
+
+    @event.listens_for(Session, 'after_flush')
+    def _note_changes(session, flush_context):
+        if any(isinstance(obj, models) for obj in (*session.new, *session.dirty, *session.deleted)):
+            session.info[flag] = True
+
+    @event.listens_for(Session, 'after_commit')
+    def _run_callback(session):
+        if session.info.pop(flag, False):
+            callback()
+
+    @event.listens_for(Session, 'after_rollback')
+    def _forget_changes(session):
+        session.info.pop(flag, None)
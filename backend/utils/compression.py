@@ -0,0 +1,132 @@
+# backend/utils/compression.py
+"""
+Negotiated compression of API responses (Content-Encoding: br or gzip).
+
+An after_request hook compresses JSON, NDJSON and text bodies of at least
+COMPRESS_MIN_SIZE bytes with the first encoding in COMPRESS_ENCODINGS that
+the client accepts at the highest q-value; brotli needs the optional Brotli
+package and is skipped without it. Streamed bodies (e.g. the NDJSON
+submission export) are compressed as they are sent, flushing after every
+chunk so the client still gets rows as they are read.
+
+Left alone: responses that already have a Content-Encoding (precompressed
+dataset files, the tracks cache), file responses, partial content, event
+streams (a compressor would hold back the heartbeats) and anything marked
+Cache-Control: no-transform. A compressed response gets Vary:
+Accept-Encoding and a weak ETag, since its bytes differ from the identity
+representation's.
+"""
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli  # optional; without it only gzip is offered
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json', 'application/x-ndjson', 'text/plain', 'text/csv', 'text/html',
+})
+
+
+def available_encodings(config):
+    """COMPRESS_ENCODINGS, in order, without those this process cannot produce."""
+    return [encoding for encoding in config['COMPRESS_ENCODINGS']
+            if encoding == 'gzip' or (encoding == 'br' and brotli is not None)]
+
+
+def negotiate(accept_encodings, config):
+    """The encoding to compress with for an Accept-Encoding header, or None."""
+    best, best_quality = None, 0
+    for encoding in available_encodings(config):
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, config):
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BROTLI_QUALITY'])
+    compressor = zlib.compressobj(config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 31)  # 31: gzip container
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, config):
+    """Compress an iterable of str/bytes chunks, flushing after each one. Closes `chunks` when done."""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config['COMPRESS_BROTLI_QUALITY'])
+        process, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(config['COMPRESS_GZIP_LEVEL'], zlib.DEFLATED, 31)
+        process, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = process(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()  # e.g. releases the server-side cursor of an abandoned stream
+
+
+def mark_encoded(response, encoding):
+    """Headers for a response whose body is now `encoding`-compressed."""
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+
+
+def compress_cached(response, variants):
+    """
+    Compress a cached body the way compress_response would, keeping each
+    encoding's bytes in `variants` (encoding -> bytes, cached next to the body)
+    so it is compressed once per cache entry rather than once per request.
+    """
+    config = current_app.config
+    response.vary.add('Accept-Encoding')
+    body = response.get_data()
+    encoding = negotiate(request.accept_encodings, config) if len(body) >= config['COMPRESS_MIN_SIZE'] else None
+    if encoding is None:
+        return response
+    data = variants.get(encoding)
+    if data is None:
+        data = variants[encoding] = compress(body, encoding, config)  # two racing requests just both compress
+    response.set_data(data)
+    mark_encoded(response, encoding)
+    return response
+
+
+def compress_response(response):
+    config = current_app.config
+    if (response.mimetype not in COMPRESSIBLE_MIMETYPES or response.direct_passthrough
+            or 'Content-Encoding' in response.headers or response.cache_control.no_transform):
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.status_code not in (200, 201) or request.method == 'HEAD':
+        return response
+    encoding = negotiate(request.accept_encodings, config)
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding, config)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESS_MIN_SIZE']:
+            return response
+        response.set_data(compress(data, encoding, config))
+    mark_encoded(response, encoding)
+    return response
+
+
+def init_compression(app):
+    """Register the compression hook; an empty COMPRESS_ENCODINGS turns it off."""
+    if app.config['COMPRESS_ENCODINGS']:
+        app.after_request(compress_response)
@@ -0,0 +1,38 @@
+# backend/utils/concurrency.py
+"""
+Helpers for code that runs under either gunicorn worker class (gunicorn.conf.py):
+OS threads ('gthread') or gevent greenlets ('gevent').
+
+Under gevent all the requests of a worker share one OS thread, and anything
+that blocks without going through gevent's patched I/O holds up all of them:
+hashing a multi-GB file, waiting on a file lock. run_blocking() hands such
+work to gevent's pool of real threads (hashlib releases the GIL, so the
+worker keeps serving meanwhile); with OS threads it just calls the function.
+"""
+import importlib
+import sys
+
+
+def green_threads():
+    """True when gevent has patched threading (gunicorn with GUNICORN_WORKER_CLASS=gevent)."""
+    monkey = sys.modules.get('gevent.monkey')
+    return monkey is not None and monkey.is_module_patched('threading')
+
+
+def run_blocking(fn, *args):
+    """fn(*args), off the event loop when running under gevent."""
+    if not green_threads():
+        return fn(*args)
+    import gevent
+    return gevent.get_hub().threadpool.apply(fn, args)
+
+
+def native(module_name, name):
+    """
+    `module.name` as it was before gevent patched it, e.g. native('time', 'sleep'):
+    for code that must run on, or block, a real OS thread.
+    """
+    if green_threads():
+        from gevent import monkey
+        return monkey.get_original(module_name, name)
+    return getattr(importlib.import_module(module_name), name)
@@ -0,0 +1,348 @@
+# backend/utils/dataset_profile.py
+"""
+Precomputed profiles of hosted dataset files, shown on the track page:
+columns, inferred types, row count, missing values, per-column statistics
+and a few sample rows.
+
+A file is parsed as a stream, about PROFILE_CHUNK_CELLS cells at a time. Each
+chunk's columns become NumPy arrays summarised with vectorized expressions
+(type inference, min/max/mean/std, value counts), and the summaries are
+merged, so memory depends on the chunk size and never on the file size.
+Distinct values are counted exactly up to DISTINCT_LIMIT per column; past
+that only the most frequent are kept, and columns that are mostly unique
+(ids, free text, measurements) stop being counted.
+
+Profiles are built by 'profile_dataset' jobs (worker.py) and stored on the
+Dataset with the SHA-256 of the file they describe, so a file is only parsed
+again when its content changes. The worker supervisor queues a job whenever a
+file's size or mtime no longer matches its profile (every
+DATASET_PROFILE_CHECK_INTERVAL seconds), and profile_datasets_script.py
+profiles many files at once, one process per file.
+"""
+import csv
+import gzip
+import itertools
+import math
+import os
+import time
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import select
+
+from models import db, Dataset, Job
+from utils.datasets import dataset_path, file_digest
+from utils.jobs import PermanentJobError, enqueue, job_handler
+
+PROFILE_VERSION = 2  # bump to rebuild every profile after changing what one holds
+PROFILE_CHUNK_CELLS = 1_000_000
+MIN_CHUNK_ROWS = 1000
+SAMPLE_ROWS = 10
+TOP_VALUES = 5
+DISTINCT_LIMIT = 1000
+MAX_CELL_CHARS = 100  # longer values are truncated before any statistic is taken
+MISSING_VALUES = ('', 'NA', 'N/A', 'NaN', 'nan', 'null', 'NULL', 'None')
+# Profiled file types (optionally gzipped) -> delimiter; None is sniffed from the start of the file
+DELIMITERS = {'.csv': ',', '.tsv': '\t', '.txt': None}
+SNIFF_CHARS = 64 * 1024
+
+
+class ProfileError(Exception):
+    """The file cannot be profiled (unsupported type, empty, malformed CSV)."""
+
+
+# --- Column statistics ---
+
+def infer_type(present, current):
+    """
+    (type, parsed values or None) for a chunk's non-missing values, trying only
+    types the column can still have: integer and float widen to float, any
+    other mix makes the column a string column.
+    """
+    if current in (None, 'integer', 'float'):
+        try:
+            numbers = present.astype(np.float64)
+        except ValueError:
+            pass
+        else:
+            if np.char.isdigit(np.char.lstrip(np.char.strip(present), '+-')).all():
+                return 'integer', numbers
+            return 'float', numbers
+    if current in (None, 'boolean'):
+        lowered = np.char.lower(np.char.strip(present))
+        if np.isin(lowered, ('true', 'false')).all():
+            return 'boolean', None
+    if current in (None, 'datetime'):
+        try:
+            return 'datetime', present.astype('datetime64[s]')
+        except ValueError:
+            pass
+    return 'string', None
+
+
+class ColumnStats:
+    """Running statistics of one column, updated one chunk at a time."""
+
+    def __init__(self, name):
+        self.name = name
+        self.type = None  # narrowest type every value so far fits
+        self.count = 0
+        self.missing = 0
+        self.n, self.mean, self.m2 = 0, 0.0, 0.0  # finite numbers, merged with Chan et al.'s formula
+        self.minimum = self.maximum = None
+        self.min_length = self.max_length = None
+        self.values = Counter()
+        self.distinct_capped = False
+        self.high_cardinality = False
+
+    def update(self, values):
+        present = values[~np.isin(values, MISSING_VALUES)]
+        self.missing += len(values) - len(present)
+        if not len(present):
+            return
+        self.count += len(present)
+        lengths = np.char.str_len(present)
+        self.min_length = int(lengths.min()) if self.min_length is None else min(self.min_length, int(lengths.min()))
+        self.max_length = int(lengths.max()) if self.max_length is None else max(self.max_length, int(lengths.max()))
+        kind, parsed = infer_type(present, self.type)
+        if self.type is not None and kind != self.type:
+            kind = 'float' if {kind, self.type} == {'integer', 'float'} else 'string'
+        if kind in ('integer', 'float'):
+            self._add_numbers(parsed)
+            self._count_values(present, parsed)
+            self.type = kind
+            return
+        if kind == 'datetime':
+            self._add_range(parsed)
+        elif kind != self.type:  # became a string or boolean column: earlier numbers no longer describe it
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            self.minimum = self.maximum = None
+        self.type = kind
+        self._count_values(present)
+
+    def _add_numbers(self, numbers):
+        numbers = numbers[np.isfinite(numbers)]
+        if not len(numbers):
+            return
+        n, mean = len(numbers), float(numbers.mean())
+        m2 = float(np.square(numbers - mean).sum())
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        self._add_range(numbers)
+
+    def _add_range(self, parsed):
+        low, high = parsed.min(), parsed.max()
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    def _count_values(self, present, numbers=None):
+        if self.high_cardinality:
+            return
+        if numbers is None:
+            uniques, counts = np.unique(present, return_counts=True)
+        else:
+            # Sorting floats is much faster than sorting strings; each value is listed as first spelled
+            _, first, counts = np.unique(numbers, return_index=True, return_counts=True)
+            uniques = present[first]
+        if len(uniques) > DISTINCT_LIMIT and len(uniques) > len(present) // 2:
+            self.high_cardinality = True  # no value is frequent enough to be worth listing
+            self.values.clear()
+            return
+        self.values.update(dict(zip(uniques.tolist(), counts.tolist())))
+        if len(self.values) > DISTINCT_LIMIT:
+            if len(self.values) > self.count // 2:  # the same test over every chunk so far
+                self.high_cardinality = True
+                self.values.clear()
+                return
+            self.distinct_capped = True
+            self.values = Counter(dict(self.values.most_common(DISTINCT_LIMIT)))
+
+    def result(self):
+        many = self.distinct_capped or self.high_cardinality
+        column = {
+            'name': self.name,
+            'type': self.type or 'empty',
+            'count': self.count,
+            'missing': self.missing,
+            'distinct': None if many else len(self.values),
+            'many_distinct': many,
+        }
+        if not self.high_cardinality and self.values:
+            column['top_values'] = [{'value': value, 'count': count}
+                                    for value, count in self.values.most_common(TOP_VALUES)]
+        if self.type in ('integer', 'float') and self.n:
+            cast = int if self.type == 'integer' else float
+            column.update(min=cast(self.minimum), max=cast(self.maximum), mean=self.mean,
+                          std=math.sqrt(self.m2 / self.n))
+        elif self.type == 'datetime':
+            column.update(min=str(self.minimum), max=str(self.maximum))
+        elif self.type == 'string':
+            column.update(min_length=self.min_length, max_length=self.max_length)
+        return column
+
+
+# --- Files ---
+
+def open_text(path):
+    """(text file, delimiter or None) for a profiled file type, gunzipping .gz files on the fly."""
+    base, ext = os.path.splitext(path.lower())
+    opener = open
+    if ext == '.gz':
+        opener = gzip.open
+        ext = os.path.splitext(base)[1]
+    if ext not in DELIMITERS:
+        raise ProfileError(f"Only {', '.join(sorted(DELIMITERS))} files can be profiled")
+    return opener(path, 'rt', encoding='utf-8-sig', errors='replace', newline=''), DELIMITERS[ext]
+
+
+def sniff_delimiter(f):
+    sample = f.read(SNIFF_CHARS)
+    f.seek(0)
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=',;\t|').delimiter
+    except csv.Error:
+        return ','
+
+
+def column_array(cells):
+    """A chunk of one column's cells as a NumPy string array, long values truncated."""
+    if max(map(len, cells)) > MAX_CELL_CHARS:
+        cells = [cell[:MAX_CELL_CHARS] for cell in cells]
+    return np.array(cells, dtype=str)
+
+
+def profile_file(path, chunk_cells=PROFILE_CHUNK_CELLS):
+    """
+    The profile of a CSV/TSV file whose first row is its header. Raises
+    ProfileError when the file cannot be profiled; runs without an app context,
+    so profile_datasets_script.py can call it from pool processes.
+    """
+    start = time.perf_counter()
+    f, delimiter = open_text(path)
+    with f:
+        delimiter = delimiter or sniff_delimiter(f)
+        reader = csv.reader(f, delimiter=delimiter)
+        try:
+            header = next(reader, None)
+            if not header:
+                raise ProfileError('The file is empty or has no header row')
+            width = len(header)
+            columns = [ColumnStats(name.strip() or f'column_{i + 1}') for i, name in enumerate(header)]
+            chunk_rows = max(MIN_CHUNK_ROWS, chunk_cells // width)
+            sample, rows, ragged = [], 0, 0
+            while True:
+                chunk = [row for row in itertools.islice(reader, chunk_rows) if row]  # skips blank lines
+                if not chunk:
+                    break
+                for i, row in enumerate(chunk):
+                    if len(row) != width:
+                        ragged += 1
+                        chunk[i] = (row + [''] * width)[:width]
+                if len(sample) < SAMPLE_ROWS:
+                    sample += [[cell[:MAX_CELL_CHARS] for cell in row] for row in chunk[:SAMPLE_ROWS - len(sample)]]
+                for column, cells in zip(columns, zip(*chunk)):
+                    column.update(column_array(cells))
+                rows += len(chunk)
+        except csv.Error as e:
+            raise ProfileError(f'Line {reader.line_num}: {e}')
+    return {
+        'version': PROFILE_VERSION,
+        'format': os.path.splitext(path[:-3] if path.lower().endswith('.gz') else path)[1].lstrip('.').lower(),
+        'delimiter': delimiter,
+        'rows': rows,
+        'ragged_rows': ragged,
+        'columns': [column.result() for column in columns],
+        'sample': {'header': [column.name for column in columns], 'rows': sample},
+        'elapsed_seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def build_profile(path):
+    """profile_file, with a file that cannot be profiled described by the error instead."""
+    try:
+        return profile_file(path)
+    except ProfileError as e:
+        return {'version': PROFILE_VERSION, 'error': str(e)}
+
+
+# --- Stored profiles ---
+
+def file_source(stat):
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def profile_is_current(dataset, stat):
+    """True when the stored profile was built by this PROFILE_VERSION from a file with this size and mtime."""
+    profile = dataset.profile or {}
+    return profile.get('version') == PROFILE_VERSION and profile.get('source') == file_source(stat)
+
+
+def store_profile(dataset, profile, sha256, stat):
+    dataset.profile = {**profile, 'source': file_source(stat)}
+    dataset.profile_sha256 = sha256
+    dataset.profiled_at = datetime.utcnow()
+
+
+def refresh_profile(dataset, path, config, force=False):
+    """
+    Rebuild the dataset's profile if its file's content changed (or `force`).
+    For a file that was only touched, the new mtime is recorded so the
+    supervisor stops queueing it. Returns True if the file was parsed; the
+    caller commits.
+    """
+    stat = os.stat(path)
+    sha256 = file_digest(path, config)['sha256']
+    profile = dataset.profile or {}
+    if not force and dataset.profile_sha256 == sha256 and profile.get('version') == PROFILE_VERSION:
+        if profile.get('source') != file_source(stat):
+            dataset.profile = {**profile, 'source': file_source(stat)}
+        return False
+    store_profile(dataset, build_profile(path), sha256, stat)
+    return True
+
+
+def pending_profile_jobs():
+    """Ids of datasets that already have a profile_dataset job queued or running."""
+    return set(db.session.scalars(
+        select(Job.payload['dataset_id'].as_integer())
+        .where(Job.kind == 'profile_dataset', Job.status.in_(('Queued', 'Running')))
+    ))
+
+
+def queue_stale_profiles(config):
+    """Queue a profile_dataset job for every hosted file that changed since it was profiled. Returns the number queued."""
+    pending = pending_profile_jobs()
+    queued = 0
+    for dataset in db.session.scalars(select(Dataset).order_by(Dataset.id)):
+        path = dataset_path(dataset, config)
+        if path is None or dataset.id in pending:
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue  # a missing file is reported by the download endpoint
+        if not profile_is_current(dataset, stat):
+            enqueue('profile_dataset', payload={'dataset_id': dataset.id})
+            queued += 1
+    db.session.commit()
+    return queued
+
+
+@job_handler('profile_dataset')
+def profile_dataset(job):
+    dataset_id = (job.payload or {}).get('dataset_id')
+    dataset = db.session.get(Dataset, dataset_id) if dataset_id is not None else None
+    if dataset is None:
+        raise PermanentJobError(f'Dataset {dataset_id} no longer exists')
+    path = dataset_path(dataset, current_app.config)
+    if path is None:
+        raise PermanentJobError(f'Dataset {dataset_id} is not hosted in DATASET_FOLDER')
+    if not os.path.isfile(path):
+        raise PermanentJobError(f'Dataset {dataset_id} file is missing: {dataset.file_url}')
+    refresh_profile(dataset, path, current_app.config)
+    db.session.commit()
@@ -0,0 +1,154 @@
+# backend/utils/datasets.py
+"""
+Hosting of competition dataset files from DATASET_FOLDER.
+
+A Dataset whose file_url is a relative path (rather than an http(s) URL) is
+a file under DATASET_FOLDER, downloadable from
+GET /api/tracks/<track_id>/datasets/<dataset_id>/download. Next to each file
+there may be precompressed variants (<file>.zst, <file>.gz, written by
+prepare_datasets_script.py); the download serves the best one the client
+accepts, with Content-Encoding, so nothing is compressed per request.
+
+Every representation has a digest: size, SHA-256 (the strong ETag) and the
+SHA-256 of each DATASET_CHUNK_SIZE chunk, so clients can fetch chunks with
+parallel Range requests and verify each one. Digests are computed once per
+file version and cached as JSON in DATASET_DIGEST_FOLDER (by the script, or
+on the first request) and in memory per process.
+
+The bytes themselves are sent by send_file (gunicorn hands the open file to
+sendfile()), or, with DATASET_SEND_MODE, by the front proxy: 'x-accel-redirect'
+for nginx (see front/nginx.conf), 'x-sendfile' for Apache or lighttpd.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+from werkzeug.utils import safe_join
+
+from utils.concurrency import run_blocking
+
+READ_BLOCK_SIZE = 1024 * 1024
+DIGEST_VERSION = 1
+# Content-Encoding -> file suffix, best compression first: preferred when the client accepts both equally
+ENCODINGS = (('zstd', '.zst'), ('gzip', '.gz'))
+
+
+def is_hosted(dataset):
+    """True when the dataset's file_url names a file under DATASET_FOLDER rather than an external URL."""
+    url = dataset.file_url or ''
+    return bool(url) and '://' not in url and not url.startswith('//')
+
+
+def dataset_path(dataset, config):
+    """Absolute path of a hosted dataset's file, or None if it is external or outside DATASET_FOLDER."""
+    if not is_hosted(dataset):
+        return None
+    return safe_join(os.path.abspath(config['DATASET_FOLDER']), dataset.file_url.lstrip('/'))
+
+
+def variants(path):
+    """[(encoding, path)] for the identity file and every precompressed variant at least as new as it."""
+    found = []
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return found
+    for encoding, suffix in ENCODINGS:
+        try:
+            if os.stat(path + suffix).st_mtime_ns >= mtime:  # an older variant is stale
+                found.append((encoding, path + suffix))
+        except FileNotFoundError:
+            pass
+    return found + [(None, path)]
+
+
+def choose_variant(path, accept_encodings):
+    """
+    The representation to send for an Accept-Encoding header: the encoding with
+    the highest q-value the client gives (ties go to ENCODINGS order), else the
+    identity file. Returns (encoding or None, path).
+    """
+    best, best_quality = (None, path), 0
+    for encoding, variant_path in variants(path):
+        if encoding is None:
+            continue
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = (encoding, variant_path), quality
+    return best
+
+
+# --- Digests ---
+
+def compute_digest(path, chunk_size):
+    """Size, SHA-256 and per-chunk SHA-256 of a file, in one sequential read."""
+    whole = hashlib.sha256()
+    chunks = []
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = hashlib.sha256()
+            length = 0
+            while length < chunk_size:
+                block = f.read(min(READ_BLOCK_SIZE, chunk_size - length))
+                if not block:
+                    break
+                whole.update(block)
+                chunk.update(block)
+                length += len(block)
+            if not length:
+                break
+            chunks.append({'offset': size, 'length': length, 'sha256': chunk.hexdigest()})
+            size += length
+    return {'size': size, 'sha256': whole.hexdigest(), 'chunk_size': chunk_size, 'chunks': chunks}
+
+
+def _digest_cache_path(path, digest_folder):
+    name = os.path.abspath(path).strip(os.sep).replace(os.sep, '__')
+    return os.path.join(digest_folder, f'{name}.json')
+
+
+@lru_cache(maxsize=256)
+def _cached_digest(path, size, mtime_ns, chunk_size, digest_folder):
+    cached = _digest_cache_path(path, digest_folder)
+    try:
+        with open(cached) as f:
+            stored = json.load(f)
+        key = (stored.get('version'), stored.get('size'), stored.get('mtime_ns'), stored.get('chunk_size'))
+        if key == (DIGEST_VERSION, size, mtime_ns, chunk_size):
+            return stored
+    except (OSError, ValueError):
+        pass
+    digest = {'version': DIGEST_VERSION, 'mtime_ns': mtime_ns, **compute_digest(path, chunk_size)}
+    try:
+        os.makedirs(digest_folder, exist_ok=True)
+        tmp = f'{cached}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(digest, f)
+        os.replace(tmp, cached)
+    except OSError:
+        pass  # a read-only deployment still works, it just recomputes per process
+    return digest
+
+
+def file_digest(path, config):
+    """Digest of the file's current version (see module docstring)."""
+    stat = os.stat(path)
+    # Reading a whole file on first use would stall a gevent worker's other requests
+    return run_blocking(_cached_digest, path, stat.st_size, stat.st_mtime_ns, config['DATASET_CHUNK_SIZE'],
+                        config['DATASET_DIGEST_FOLDER'])
+
+
+def dataset_manifest(path, config):
+    """What GET .../manifest returns: the digest of every representation, keyed by encoding."""
+    representations = {}
+    for encoding, variant_path in variants(path):
+        digest = file_digest(variant_path, config)
+        representations[encoding or 'identity'] = {
+            'size': digest['size'],
+            'sha256': digest['sha256'],
+            'chunks': digest['chunks'],
+        }
+    return {'name': os.path.basename(path), 'chunk_size': config['DATASET_CHUNK_SIZE'],
+            'representations': representations}
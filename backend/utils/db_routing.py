@@ -0,0 +1,124 @@
+# backend/utils/db_routing.py
+"""
+Read-replica routing for db.session.
+
+Views decorated with @read_replica send their SELECTs to the 'replica' bind
+(configured from DB_REPLICA_* in config.py). Everything else, including any
+write or flush, goes to the primary. Every DB_REPLICA_CHECK_INTERVAL seconds
+one request re-checks the replica. While it is unreachable, or more than
+DB_REPLICA_MAX_LAG seconds behind the primary, reads go to the primary. If
+the replica refuses a connection mid-request, that request switches to the
+primary on the spot.
+
+Replicas lag, so only decorate views that can serve slightly stale data and
+never read back what the same request wrote.
+"""
+import threading
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+REPLICA_BIND = 'replica'
+
+# Seconds behind the primary; 0 when fully replayed (an idle primary writes no new timestamps)
+LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaHealth:
+    """Last known state of the replica, shared by the threads of one process."""
+
+    def __init__(self, engine, check_interval, max_lag, logger):
+        self.engine = engine
+        self.check_interval = check_interval
+        self.max_lag = max_lag
+        self.logger = logger
+        self.healthy = True
+        self.checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def available(self):
+        # Only one thread re-checks; the others go by the last result meanwhile
+        if time.monotonic() - self.checked_at >= self.check_interval and self._lock.acquire(blocking=False):
+            try:
+                self.check()
+            finally:
+                self._lock.release()
+        return self.healthy
+
+    def check(self):
+        try:
+            with self.engine.connect() as conn:
+                lag = float(conn.execute(LAG_QUERY).scalar())
+        except SQLAlchemyError as e:
+            self.mark(False, f"unreachable ({e.__class__.__name__})")
+            return
+        self.mark(lag <= self.max_lag, f"{lag:.1f}s behind the primary")
+
+    def mark(self, healthy, reason):
+        if healthy != self.healthy:
+            if healthy:
+                self.logger.info(f"Read replica is healthy again ({reason}); routing reads to it")
+            else:
+                self.logger.warning(f"Read replica is {reason}; routing reads to the primary")
+        self.healthy = healthy
+        self.checked_at = time.monotonic()
+
+
+def init_read_replica(app, db):
+    """Set up health tracking when a replica bind is configured."""
+    if REPLICA_BIND not in app.config.get('SQLALCHEMY_BINDS', {}):
+        return
+    with app.app_context():
+        engine = db.engines[REPLICA_BIND]
+    app.extensions['db_replica'] = ReplicaHealth(
+        engine, app.config['DB_REPLICA_CHECK_INTERVAL'], app.config['DB_REPLICA_MAX_LAG'], app.logger
+    )
+
+
+def get_replica_health():
+    """The current app's ReplicaHealth, or None without a replica."""
+    return current_app.extensions.get('db_replica')
+
+
+def read_replica(view):
+    """Route the view's reads to the replica while it is healthy."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        health = get_replica_health()
+        g.db_read_replica = health is not None and health.available()
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def reading_from_replica():
+    return has_request_context() and g.get('db_read_replica', False)
+
+
+class RoutingSession(Session):
+    """Session class for db.session that implements @read_replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and getattr(clause, 'is_select', False) and reading_from_replica():
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _connection_for_bind(self, engine, execution_options=None, **kw):
+        # Private Session hook, called once per bind and transaction to open its connection
+        try:
+            return super()._connection_for_bind(engine, execution_options, **kw)
+        except OperationalError as e:
+            health = get_replica_health() if has_request_context() else None
+            if health is None or engine is not health.engine:
+                raise
+            health.mark(False, f"unreachable ({e.orig.__class__.__name__})")
+            g.db_read_replica = False
+            return super()._connection_for_bind(self._db.engine, execution_options, **kw)
@@ -0,0 +1,210 @@
+# backend/utils/jobs.py
+"""
+A Postgres-backed job queue.
+
+Jobs are rows in the `job` table. Producers add them in the same transaction
+as the rows they refer to, so a job exists if and only if its submission
+does. Workers (worker.py) claim one job at a time with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker processes can poll
+the table without blocking each other or claiming the same job twice.
+"""
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, select, text, update
+
+from models import db, Job
+
+# kind -> (handler, on_give_up)
+HANDLERS = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot help."""
+
+
+def job_handler(kind, on_give_up=None):
+    """
+    Register a function as the handler for jobs of the given kind.
+    The handler is called with the Job inside an app context and should commit its own work.
+    `on_give_up(job, error)` is called once a job has failed for the last time.
+    """
+    def decorator(func_):
+        HANDLERS[kind] = (func_, on_give_up)
+        return func_
+    return decorator
+
+
+def enqueue(kind, submission_id=None, payload=None, max_attempts=None, delay=0):
+    """Add a job to the current session; it becomes visible to workers when the caller commits."""
+    job = Job(
+        kind=kind,
+        submission_id=submission_id,
+        payload=payload,
+        status='Queued',
+        attempts=0,
+        max_attempts=max_attempts or current_app.config.get('JOB_MAX_ATTEMPTS', 3),
+        run_after=datetime.utcnow() + timedelta(seconds=delay)
+    )
+    db.session.add(job)
+    return job
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_job(kinds, limits=None):
+    """
+    Claim the oldest runnable job of one of the given kinds and mark it Running.
+    Kinds listed in `limits` are skipped while that many of them are already running;
+    the check and the claim happen under a transaction-scoped advisory lock so the
+    cap holds across processes and hosts. Returns the Job or None.
+    """
+    limits = limits or {}
+    available = []
+    for kind in kinds:
+        if kind in limits:
+            db.session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:k))"), {'k': f"job:{kind}"})
+            running = db.session.scalar(
+                select(func.count()).select_from(Job).where(Job.kind == kind, Job.status == 'Running')
+            )
+            if running >= limits[kind]:
+                continue
+        available.append(kind)
+    if not available:
+        db.session.rollback()
+        return None
+
+    job = db.session.execute(
+        select(Job)
+        .where(Job.status == 'Queued', Job.run_after <= datetime.utcnow(), Job.kind.in_(available))
+        .order_by(Job.run_after, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).scalar_one_or_none()
+    if job is None:
+        db.session.rollback()
+        return None
+
+    job.status = 'Running'
+    job.attempts += 1
+    job.locked_by = worker_id()
+    job.heartbeat_at = datetime.utcnow()
+    db.session.commit()
+    return job
+
+
+def complete_job(job):
+    job.status = 'Done'
+    job.finished_at = datetime.utcnow()
+    job.last_error = None
+    db.session.commit()
+
+
+def fail_job(job, error):
+    """
+    Record a failed attempt. The job is requeued with exponential backoff until
+    it runs out of attempts (or the error is permanent), then marked Failed.
+    Returns True if the job will be retried.
+    """
+    job.last_error = error if isinstance(error, str) else ''.join(traceback.format_exception(error))
+    job.locked_by = None
+    retry = not isinstance(error, PermanentJobError) and job.attempts < job.max_attempts
+    if retry:
+        base_delay = current_app.config.get('JOB_RETRY_BASE_DELAY', 30)
+        job.status = 'Queued'
+        job.run_after = datetime.utcnow() + timedelta(seconds=base_delay * 2 ** (job.attempts - 1))
+    else:
+        job.status = 'Failed'
+        job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return retry
+
+
+def run_job(job):
+    """Run a claimed job through its handler and record the outcome."""
+    handler, on_give_up = HANDLERS.get(job.kind, (None, None))
+    try:
+        if handler is None:
+            raise PermanentJobError(f"No handler registered for job kind '{job.kind}'")
+        handler(job)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Job {job.id} ({job.kind}) failed on attempt {job.attempts}: {e}")
+        if not fail_job(job, e) and on_give_up is not None:
+            try:
+                on_give_up(job, e)
+            except Exception as cleanup_error:
+                db.session.rollback()
+                current_app.logger.error(f"Giving up on job {job.id} failed: {cleanup_error}")
+        return False
+    complete_job(job)
+    return True
+
+
+def recover_stale_jobs(stale_after):
+    """
+    Requeue Running jobs whose worker stopped sending heartbeats (it crashed or was
+    killed). Jobs that already used up their attempts are failed instead, so a job
+    that keeps crashing its worker cannot loop forever. Returns the number recovered.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=stale_after)
+    stale = db.session.execute(
+        select(Job)
+        .where(Job.status == 'Running', Job.heartbeat_at < cutoff)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    given_up = []
+    for job in stale:
+        job.locked_by = None
+        job.last_error = 'Worker stopped responding while running this job'
+        if job.attempts < job.max_attempts:
+            job.status = 'Queued'
+            job.run_after = datetime.utcnow()
+        else:
+            job.status = 'Failed'
+            job.finished_at = datetime.utcnow()
+            given_up.append(job)
+    db.session.commit()
+
+    for job in given_up:
+        on_give_up = HANDLERS.get(job.kind, (None, None))[1]
+        if on_give_up is not None:
+            try:
+                on_give_up(job, job.last_error)
+            except Exception as e:
+                db.session.rollback()
+                current_app.logger.error(f"Giving up on job {job.id} failed: {e}")
+    return len(stale)
+
+
+class Heartbeat:
+    """Keeps a claimed job's heartbeat_at fresh from a background thread while it runs."""
+
+    def __init__(self, engine, job_id, interval):
+        self.engine = engine
+        self.job_id = job_id
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                with self.engine.begin() as conn:
+                    conn.execute(update(Job).where(Job.id == self.job_id).values(heartbeat_at=datetime.utcnow()))
+            except Exception:
+                pass  # a missed beat is harmless; recovery only kicks in after JOB_STALE_AFTER
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
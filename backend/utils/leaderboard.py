@@ -0,0 +1,158 @@
+# backend/utils/leaderboard.py
+"""
+Materialized per-track leaderboard.
+
+`leaderboard_entry` holds one row per team (or per user without a team) and
+track: their best scored submission. record_score() upserts a new score in
+the same transaction that stores it, and the row is only replaced when the
+new score is better, so nothing ever re-sorts the submission table.
+Scores are stored with a `sort_key` where lower always ranks first, which
+lets one ascending index serve top-k reads and rank lookups alike.
+"""
+from sqlalchemy import and_, func, or_, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from models import db, LeaderboardEntry, Team, TeamMember, User
+
+
+def sort_key_for(score, higher_is_better):
+    return -score if higher_is_better else score
+
+
+def entrant_for(user_id):
+    """Leaderboard identity of a user: their team if they have one, else themselves."""
+    team_id = db.session.scalar(
+        select(TeamMember.team_id).where(TeamMember.user_id == user_id).order_by(TeamMember.id).limit(1)
+    )
+    if team_id is not None:
+        return f"team:{team_id}", team_id
+    return f"user:{user_id}", None
+
+
+def record_score(submission, higher_is_better):
+    """
+    Offer a freshly scored submission to its track's leaderboard. The entrant's
+    row is replaced only if this score beats it (or it is the same submission
+    being rescored). The caller commits.
+    """
+    entrant_key, team_id = entrant_for(submission.user_id)
+    sort_key = sort_key_for(submission.score, higher_is_better)
+    stmt = insert(LeaderboardEntry).values(
+        track_id=submission.track_id,
+        entrant_key=entrant_key,
+        team_id=team_id,
+        user_id=submission.user_id,
+        submission_id=submission.id,
+        score=submission.score,
+        sort_key=sort_key,
+        achieved_at=submission.submission_date or func.now(),
+        updated_at=func.now()
+    )
+    new = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        constraint='uq_leaderboard_entrant',
+        set_={
+            'team_id': new.team_id,
+            'user_id': new.user_id,
+            'submission_id': new.submission_id,
+            'score': new.score,
+            'sort_key': new.sort_key,
+            'achieved_at': new.achieved_at,
+            'updated_at': func.now(),
+        },
+        where=or_(
+            LeaderboardEntry.submission_id == new.submission_id,
+            new.sort_key < LeaderboardEntry.sort_key,
+            and_(new.sort_key == LeaderboardEntry.sort_key, new.achieved_at < LeaderboardEntry.achieved_at),
+        )
+    )
+    db.session.execute(stmt)
+
+
+_REBUILD_SQL = text("""
+    INSERT INTO leaderboard_entry
+        (track_id, entrant_key, team_id, user_id, submission_id, score, sort_key, achieved_at, updated_at)
+    SELECT DISTINCT ON (entrant_key)
+        track_id, entrant_key, team_id, user_id, id, score, sort_key, achieved_at, now()
+    FROM (
+        SELECT s.id, s.track_id, s.user_id, s.score, tm.team_id,
+               COALESCE('team:' || tm.team_id, 'user:' || s.user_id) AS entrant_key,
+               CASE WHEN :higher_is_better THEN -s.score ELSE s.score END AS sort_key,
+               COALESCE(s.submission_date, s.scored_at) AS achieved_at
+        FROM submission s
+        LEFT JOIN LATERAL (
+            SELECT team_id FROM team_member WHERE user_id = s.user_id ORDER BY id LIMIT 1
+        ) tm ON true
+        WHERE s.track_id = :track_id AND s.status = 'Accepted' AND s.score IS NOT NULL
+    ) candidates
+    ORDER BY entrant_key, sort_key, achieved_at, id
+""")
+
+
+def rebuild_track(track_id, higher_is_better):
+    """
+    Recompute a track's leaderboard from scratch with one set-based query.
+    Needed after rescoring, when an entrant's best submission may have got worse.
+    The caller commits.
+    """
+    db.session.execute(db.delete(LeaderboardEntry).where(LeaderboardEntry.track_id == track_id))
+    db.session.execute(_REBUILD_SQL, {'track_id': track_id, 'higher_is_better': higher_is_better})
+
+
+def _ranked_query(track_id):
+    return (
+        select(LeaderboardEntry, Team.name, User.name)
+        .outerjoin(Team, Team.id == LeaderboardEntry.team_id)
+        .join(User, User.id == LeaderboardEntry.user_id)
+        .where(LeaderboardEntry.track_id == track_id)
+    )
+
+
+def _entry_dict(entry, team_name, user_name, rank):
+    return {
+        'rank': rank,
+        'entrant': entry.entrant_key,
+        'team_id': entry.team_id,
+        'user_id': entry.user_id,
+        'name': team_name or user_name,
+        'score': entry.score,
+        'submission_id': entry.submission_id,
+        'achieved_at': entry.achieved_at
+    }
+
+
+def top_k(track_id, k, offset=0):
+    """The k best entrants of a track, read in index order."""
+    rows = db.session.execute(
+        _ranked_query(track_id)
+        .order_by(LeaderboardEntry.sort_key, LeaderboardEntry.achieved_at, LeaderboardEntry.id)
+        .offset(offset)
+        .limit(k)
+    ).all()
+    return [_entry_dict(entry, team_name, user_name, offset + i + 1)
+            for i, (entry, team_name, user_name) in enumerate(rows)]
+
+
+def rank_of(track_id, user_id):
+    """The rank and entry of a user's entrant on a track, or None if they have no score."""
+    entrant_key, _team_id = entrant_for(user_id)
+    row = db.session.execute(
+        _ranked_query(track_id).where(LeaderboardEntry.entrant_key == entrant_key)
+    ).first()
+    if row is None:
+        return None
+    entry = row[0]
+    key = (LeaderboardEntry.sort_key, LeaderboardEntry.achieved_at, LeaderboardEntry.id)
+    ahead = db.session.scalar(
+        select(func.count()).select_from(LeaderboardEntry).where(
+            LeaderboardEntry.track_id == track_id,
+            tuple_(*key) < tuple_(entry.sort_key, entry.achieved_at, entry.id)
+        )
+    )
+    return _entry_dict(entry, row[1], row[2], ahead + 1)
+
+
+def entrant_count(track_id):
+    return db.session.scalar(
+        select(func.count()).select_from(LeaderboardEntry).where(LeaderboardEntry.track_id == track_id)
+    )
@@ -0,0 +1,121 @@
+# backend/utils/metrics.py
+"""
+Request, SQL and connection-pool instrumentation, exported by routes/metrics.py.
+
+Everything is labelled by route template (e.g. '/api/tracks/<int:track_id>'),
+never by raw path, so label cardinality stays bounded. SQL statements are
+counted through SQLAlchemy engine events and attributed to the request that
+ran them ('<none>' outside requests).
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR (the Dockerfile does): each
+worker then writes its samples to files in that directory and /metrics sums
+them over all workers, whichever worker answers the scrape.
+"""
+import time
+
+from flask import g, has_request_context, request
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool, QueuePool
+
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+NO_ROUTE = '<none>'
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time to build the response', ['method', 'route'], buckets=LATENCY_BUCKETS)
+REQUESTS = Counter('http_requests_total', 'Responses by status code', ['method', 'route', 'status'])
+REQUEST_BODY_BYTES = Counter(
+    'http_request_body_bytes_total', 'Request body bytes received, mostly uploads', ['method', 'route'])
+SQL_STATEMENTS = Counter('db_statements_total', 'SQL statements executed', ['route'])
+SQL_SECONDS = Counter('db_statement_duration_seconds_total', 'Time spent executing SQL statements', ['route'])
+SQL_PER_REQUEST = Histogram(
+    'db_statements_per_request', 'SQL statements per request; a high count hints at N+1 queries', ['route'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100))
+POOL_CHECKOUT_WAIT = Histogram(
+    'db_pool_checkout_wait_seconds', 'Time to get a pooled connection, including opening a new one',
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 5, 30))
+POOL_IN_USE = Gauge(
+    'db_pool_connections_in_use', 'Connections currently checked out of the pool', multiprocess_mode='livesum')
+
+
+def current_route():
+    if has_request_context():
+        return request.url_rule.rule if request.url_rule else 'unmatched'
+    return NO_ROUTE
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+# --- SQLAlchemy events (every engine, including the rate-limit storage's) ---
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    route = current_route()
+    SQL_STATEMENTS.labels(route).inc()
+    SQL_SECONDS.labels(route).inc(elapsed)
+    if has_request_context() and 'metrics_start' in g:
+        g.metrics_sql_count += 1
+
+
+@event.listens_for(Pool, 'checkout')
+def _pool_checkout(dbapi_connection, connection_record, connection_proxy):
+    POOL_IN_USE.inc()
+
+
+@event.listens_for(Pool, 'checkin')
+def _pool_checkin(dbapi_connection, connection_record):
+    POOL_IN_USE.dec()
+
+
+# --- Flask hooks ---
+
+def _start_timer():
+    g.metrics_start = time.perf_counter()
+    g.metrics_sql_count = 0
+
+
+def _record_request(response):
+    if 'metrics_start' not in g:
+        return response
+    route = current_route()
+    if route == '/metrics':
+        return response  # scrapes would otherwise dominate every figure
+    REQUEST_LATENCY.labels(request.method, route).observe(time.perf_counter() - g.metrics_start)
+    REQUESTS.labels(request.method, route, str(response.status_code)).inc()
+    SQL_PER_REQUEST.labels(route).observe(g.metrics_sql_count)
+    if request.content_length:
+        REQUEST_BODY_BYTES.labels(request.method, route).inc(request.content_length)
+    return response
+
+
+def init_metrics(app):
+    """Instrument an app. Call before db.init_app so the engines get the timed pool."""
+    engine_options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    engine_options.setdefault('poolclass', TimedQueuePool)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options
+    app.config['SQLALCHEMY_BINDS'] = {
+        key: {'poolclass': TimedQueuePool, **(bind if isinstance(bind, dict) else {'url': bind})}
+        for key, bind in app.config.get('SQLALCHEMY_BINDS', {}).items()
+    }
+    # First in line, so requests the rate limiter rejects are timed and counted too
+    app.before_request_funcs.setdefault(None, []).insert(0, _start_timer)
+    app.after_request(_record_request)
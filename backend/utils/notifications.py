@@ -0,0 +1,154 @@
+# backend/utils/notifications.py
+"""
+Submission change notifications, fanned out from Postgres LISTEN/NOTIFY.
+
+A trigger on the submission table (migration 0007) sends a NOTIFY on
+SUBMISSION_CHANNEL when a submission is created or its status or score
+changes; the notification is delivered when the writing transaction commits,
+whichever process wrote it (web, worker, scripts).
+
+Each process runs at most one NotificationHub: one thread holding one
+dedicated connection that LISTENs and hands every notification to the
+subscriptions (open event streams) interested in its user. An idle stream
+therefore costs no queries at all. The thread and its connection start with
+the first subscription.
+"""
+import json
+import queue
+import select
+import threading
+
+import psycopg2
+import psycopg2.extensions
+from flask import current_app
+from sqlalchemy.engine import make_url
+
+SUBMISSION_CHANNEL = 'submission_changes'
+SUBSCRIPTION_QUEUE_SIZE = 100
+RECONNECT_DELAY = 2  # seconds, doubled per failed attempt up to RECONNECT_MAX_DELAY
+RECONNECT_MAX_DELAY = 30
+
+# Events are (event type, data) pairs. RESYNC is sent when notifications may have been
+# lost (listener reconnected, or the client fell too far behind): the client should refetch
+RESYNC = ('resync', {})
+
+
+class Subscription:
+    """One event stream: the user ids it follows and the events waiting for it."""
+
+    def __init__(self, user_ids):
+        self.user_ids = frozenset(user_ids)
+        self.events = queue.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+
+    def push(self, event):
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            # A stalled client: drop what it missed and tell it to refetch
+            with self.events.mutex:
+                self.events.queue.clear()
+            self.events.put_nowait(RESYNC)
+
+
+class NotificationHub:
+    def __init__(self, dsn, logger):
+        self.dsn = dsn
+        self.logger = logger
+        self._by_user = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self, user_ids):
+        subscription = Subscription(user_ids)
+        with self._lock:
+            for user_id in subscription.user_ids:
+                self._by_user.setdefault(user_id, set()).add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='notification-listener', daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for user_id in subscription.user_ids:
+                followers = self._by_user.get(user_id)
+                if followers is not None:
+                    followers.discard(subscription)
+                    if not followers:
+                        del self._by_user[user_id]
+
+    def dispatch(self, payload):
+        try:
+            event = json.loads(payload)
+            user_id = event['user_id']
+        except (ValueError, KeyError, TypeError):
+            self.logger.warning(f"Ignoring malformed notification on {SUBMISSION_CHANNEL}: {payload[:200]}")
+            return
+        with self._lock:
+            followers = list(self._by_user.get(user_id, ()))
+        for subscription in followers:
+            subscription.push(('submission', event))
+
+    def broadcast(self, event):
+        with self._lock:
+            subscriptions = {s for followers in self._by_user.values() for s in followers}
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        delay = RECONNECT_DELAY
+        connected_before = False
+        while not self._stop.is_set():
+            try:
+                conn = psycopg2.connect(self.dsn)
+            except psycopg2.Error as e:
+                self.logger.warning(f"Notification listener could not connect ({e.__class__.__name__}); retrying in {delay}s")
+                self._stop.wait(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+            delay = RECONNECT_DELAY
+            try:
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {SUBMISSION_CHANNEL}")
+                if connected_before:
+                    self.broadcast(RESYNC)  # whatever was sent while we were away is lost
+                connected_before = True
+                self._listen(conn)
+            except (psycopg2.Error, OSError) as e:
+                self.logger.warning(f"Notification listener lost its connection ({e.__class__.__name__}); reconnecting")
+            finally:
+                conn.close()
+
+    def _listen(self, conn):
+        while not self._stop.is_set():
+            # Wake up now and then to notice stop(); the wait itself costs nothing on the server
+            if select.select([conn], [], [], 5)[0]:
+                conn.poll()
+                while conn.notifies:
+                    self.dispatch(conn.notifies.pop(0).payload)
+
+
+def listen_dsn(app):
+    """libpq connection string for LISTEN: DB_LISTEN_URI if set, else the primary database."""
+    url = make_url(app.config.get('DB_LISTEN_URI') or app.config['SQLALCHEMY_DATABASE_URI'])
+    return url.set(drivername='postgresql').render_as_string(hide_password=False)
+
+
+_hub_lock = threading.Lock()
+
+def get_notification_hub():
+    """The current app's NotificationHub, created on first use."""
+    hub = current_app.extensions.get('notification_hub')
+    if hub is None:
+        with _hub_lock:
+            hub = current_app.extensions.get('notification_hub')
+            if hub is None:
+                hub = current_app.extensions['notification_hub'] = NotificationHub(
+                    listen_dsn(current_app), current_app.logger
+                )
+    return hub
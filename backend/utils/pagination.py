@@ -0,0 +1,37 @@
+# backend/utils/pagination.py
+"""
+Keyset (cursor) pagination helpers.
+
+A page is fetched with `WHERE (sort_column, id) < (:last_value, :last_id)`
+instead of OFFSET, so every page costs one index range scan no matter how
+deep the client has paged, and rows inserted meanwhile never shift a page.
+The cursor handed to clients is an opaque URL-safe token of that last key.
+"""
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    """The cursor token was not produced by encode_cursor."""
+
+
+def encode_cursor(value, row_id):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, parse_value=None):
+    """Inverse of encode_cursor. `parse_value` converts the sort value back, e.g. datetime.fromisoformat."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        value, row_id = json.loads(raw)
+        if not isinstance(row_id, int):
+            raise ValueError('cursor id must be an integer')
+        if parse_value is not None:
+            value = parse_value(value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {e}')
+    return value, row_id
@@ -0,0 +1,251 @@
+# backend/utils/participant_import.py
+"""
+Bulk import of participants (individuals and teams) from a sign-up sheet.
+
+Input is CSV, one participant per row, with the columns
+    name, email, expertise, password, team_name, team_password, description
+(only name and email are always required), or JSON: either a list of such
+rows, or {"individuals": [...], "teams": [...]} shaped like the bodies of
+POST /api/auth/register/individual and /register/team.
+
+Rows without team_name are individuals and need a password. Rows sharing a
+team_name form one team, which signs in with its team_password, as with
+/register/team. The same rules as registration apply, and a team with an
+invalid member is rejected as a whole.
+
+The import runs in three set-based steps:
+1. Validate all rows, then look up every email in one query against the
+   lower(email) index.
+2. Hash the passwords in a process pool: one hash per individual and one
+   per team.
+3. Insert users, teams and memberships with multi-row INSERT ... RETURNING,
+   all in one transaction.
+
+Invalid rows come back in a per-row error report and the rest are imported,
+unless strict=True, in which case nothing is imported.
+"""
+import csv
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from marshmallow import Schema, ValidationError, fields, validate
+from sqlalchemy import insert, select
+from werkzeug.security import generate_password_hash
+
+from models import db, Team, TeamMember, User
+from routes.auth import get_password_strength_violations
+
+TEAM_MAX_MEMBERS = 4  # as for POST /api/auth/register/team
+COLUMNS = ('name', 'email', 'expertise', 'password', 'team_name', 'team_password', 'description')
+
+
+class ImportFormatError(ValueError):
+    """The input could not be read as participant rows at all."""
+
+
+class ImportRowSchema(Schema):
+    name = fields.Str(required=True, validate=validate.Length(min=1, max=128))
+    email = fields.Email(required=True, validate=validate.Length(max=128))
+    expertise = fields.Str(load_default=None, validate=validate.Length(max=128))
+    password = fields.Str(load_default=None)
+    team_name = fields.Str(load_default=None, validate=validate.Length(max=128))
+    team_password = fields.Str(load_default=None)
+    description = fields.Str(load_default=None, validate=validate.Length(max=500))
+
+import_row_schema = ImportRowSchema()
+
+
+# --- Parsing ---
+
+def parse_csv(text):
+    reader = csv.DictReader(io.StringIO(text))
+    if not reader.fieldnames or not {'name', 'email'} <= {f.strip().lower() for f in reader.fieldnames}:
+        raise ImportFormatError("CSV needs a header row with at least 'name' and 'email' columns")
+    rows = []
+    for record in reader:
+        row = {}
+        for key, value in record.items():
+            key = (key or '').strip().lower()
+            if key in COLUMNS and value is not None and value.strip():
+                row[key] = value.strip()
+        rows.append(row)
+    return rows
+
+
+def parse_json(data):
+    if isinstance(data, list):
+        return data
+    if not isinstance(data, dict):
+        raise ImportFormatError('JSON must be a list of rows or an object with "individuals" and "teams"')
+    rows = list(data.get('individuals') or [])
+    for team in data.get('teams') or []:
+        if not isinstance(team, dict) or not isinstance(team.get('members'), list):
+            raise ImportFormatError('Each team needs a "members" list')
+        for member in team['members']:
+            rows.append({**member, 'team_name': team.get('team_name'), 'team_password': team.get('team_password'),
+                         'description': team.get('description')})
+    return rows
+
+
+def parse_input(content, fmt):
+    """Rows from CSV text, JSON text or already-decoded JSON; fmt is 'csv' or 'json'."""
+    if fmt == 'csv':
+        return parse_csv(content)
+    if isinstance(content, (str, bytes)):
+        try:
+            content = json.loads(content)
+        except ValueError as e:
+            raise ImportFormatError(f'Invalid JSON: {e}')
+    return parse_json(content)
+
+
+# --- Validation ---
+
+def validate_rows(rows):
+    """
+    Returns (individuals, teams, errors). individuals are (row_number, row)
+    pairs; teams map a team name to {'password', 'description', 'members'}.
+    Row numbers count data rows from 1.
+    """
+    errors = {}
+    valid = []
+    team_rows = {}  # team name -> every row naming it, valid or not
+    for number, raw in enumerate(rows, start=1):
+        if not isinstance(raw, dict):
+            errors[number] = {'row': ['Expected an object']}
+            continue
+        raw = {k: v.strip() if isinstance(v, str) else v for k, v in raw.items()}
+        if isinstance(raw.get('team_name'), str) and raw['team_name']:
+            team_rows.setdefault(raw['team_name'], []).append(number)
+        try:
+            row = import_row_schema.load({k: v for k, v in raw.items() if k in COLUMNS and v not in (None, '')})
+        except ValidationError as err:
+            errors[number] = err.messages
+            continue
+        if not row['team_name']:
+            violations = get_password_strength_violations(row['password'])
+            if violations:
+                errors[number] = {'password': violations}
+                continue
+        valid.append((number, row))
+
+    # Duplicates within the file, then one query for emails already registered
+    first_seen = {}
+    for number, row in valid:
+        email = row['email'].lower()
+        if email in first_seen:
+            errors[number] = {'email': [f"Duplicate of row {first_seen[email]}"]}
+        else:
+            first_seen[email] = number
+    registered = set(db.session.scalars(
+        select(db.func.lower(User.email)).where(db.func.lower(User.email).in_(list(first_seen)))
+    )) if first_seen else set()
+    for number, row in valid:
+        if number not in errors and row['email'].lower() in registered:
+            errors[number] = {'email': ['A user with this email already exists']}
+
+    individuals, teams = [], {}
+    for number, row in valid:
+        if row['team_name']:
+            team = teams.setdefault(row['team_name'], {'password': None, 'description': None, 'members': [],
+                                                       'rows': team_rows[row['team_name']]})
+            team['password'] = team['password'] or row['team_password']
+            team['description'] = team['description'] or row['description']
+            team['members'].append((number, row))
+        elif number not in errors:
+            individuals.append((number, row))
+
+    for name, team in list(teams.items()):
+        problem = None
+        bad_rows = [n for n in team['rows'] if n in errors]
+        passwords = {row['team_password'] for _, row in team['members'] if row['team_password']}
+        if bad_rows:
+            problem = f"Team '{name}' is rejected because of row(s) {', '.join(map(str, bad_rows))}"
+        elif len(team['members']) > TEAM_MAX_MEMBERS:
+            problem = f"Team '{name}' has {len(team['members'])} members; at most {TEAM_MAX_MEMBERS} are allowed"
+        elif len(passwords) > 1:
+            problem = f"Team '{name}' has different team_password values"
+        elif not passwords:
+            problem = f"Team '{name}' has no team_password"
+        elif get_password_strength_violations(team['password']):
+            problem = f"Team '{name}': " + ' '.join(get_password_strength_violations(team['password']))
+        if problem:
+            for number in team['rows']:
+                errors.setdefault(number, {'team_name': [problem]})
+            del teams[name]
+
+    report = [{'row': number, 'email': rows[number - 1].get('email') if isinstance(rows[number - 1], dict) else None,
+               'errors': messages} for number, messages in sorted(errors.items())]
+    return individuals, teams, report
+
+
+# --- Hashing and inserting ---
+
+def hash_passwords(passwords, method, workers):
+    """Hash in `workers` processes (spawned, so no DB connections are inherited)."""
+    if workers <= 1 or len(passwords) < 2:
+        return [generate_password_hash(password, method) for password in passwords]
+    workers = min(workers, len(passwords))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return list(pool.map(generate_password_hash, passwords, repeat(method),
+                             chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def insert_participants(individuals, teams, method, workers):
+    """Insert validated participants into the current transaction. Returns (user count, team count)."""
+    team_items = list(teams.items())
+    hashes = hash_passwords([row['password'] for _, row in individuals] + [t['password'] for _, t in team_items],
+                            method, workers)
+    individual_hashes, team_hashes = hashes[:len(individuals)], hashes[len(individuals):]
+
+    user_rows = [{'name': row['name'], 'email': row['email'], 'expertise': row['expertise'], 'password_hash': h}
+                 for (_, row), h in zip(individuals, individual_hashes)]
+    for (_, team), h in zip(team_items, team_hashes):
+        user_rows += [{'name': row['name'], 'email': row['email'], 'expertise': row['expertise'], 'password_hash': h}
+                      for _, row in team['members']]
+    if not user_rows:
+        return 0, 0
+
+    user_ids = db.session.scalars(insert(User).returning(User.id, sort_by_parameter_order=True), user_rows).all()
+    team_ids = db.session.scalars(
+        insert(Team).returning(Team.id, sort_by_parameter_order=True),
+        [{'name': name, 'description': team['description']} for name, team in team_items]
+    ).all() if team_items else []
+
+    memberships = []
+    position = len(individuals)  # team members follow the individuals in user_rows
+    for team_id, (_, team) in zip(team_ids, team_items):
+        for _ in team['members']:
+            memberships.append({'team_id': team_id, 'user_id': user_ids[position]})
+            position += 1
+    if memberships:
+        db.session.execute(insert(TeamMember), memberships)
+    return len(user_ids), len(team_ids)
+
+
+def import_participants(rows, method, workers, dry_run=False, strict=False):
+    """Validate and import rows in one transaction; returns the report."""
+    individuals, teams, errors = validate_rows(rows)
+    members = sum(len(team['members']) for team in teams.values())
+    report = {
+        'rows': len(rows),
+        'valid_users': len(individuals) + members,
+        'valid_teams': len(teams),
+        'created_users': 0,
+        'created_teams': 0,
+        'errors': errors,
+        'dry_run': dry_run,
+    }
+    if dry_run or (strict and errors):
+        db.session.rollback()
+        return report
+    try:
+        report['created_users'], report['created_teams'] = insert_participants(individuals, teams, method, workers)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return report
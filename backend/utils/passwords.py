@@ -0,0 +1,98 @@
+# backend/utils/passwords.py
+"""
+Password hashing off the request path.
+
+Hashes are deliberately expensive, so they run in a small per-process pool
+(PASSWORD_HASH_WORKERS) instead of on the request worker's own CPU time.
+At most PASSWORD_HASH_MAX_PENDING hashes may be running or queued per
+process; beyond that callers get PasswordHasherBusy at once, which the auth
+routes turn into a 503 with Retry-After instead of letting a registration
+rush pile up behind the CPU.
+
+The method is any werkzeug method string (PASSWORD_HASH_METHOD, e.g.
+'pbkdf2:sha256:600000'). Hashes made with other parameters still verify,
+and are replaced on the next successful login (see needs_rehash).
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasherBusy(Exception):
+    """Too many hashes pending in this process; the client should retry shortly."""
+
+
+def _method_prefix(password_hash):
+    """'pbkdf2:sha256:260000' for 'pbkdf2:sha256:260000$salt$hash'."""
+    return password_hash.split('$', 1)[0]
+
+
+class PasswordHasher:
+    def __init__(self, method, workers, max_pending, timeout):
+        self.method = method
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # spawn: a forked copy of a request worker would inherit its DB connections and threads
+        self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        # Verifying against this costs the same as a real check, for unknown emails
+        self._dummy_hash = generate_password_hash('dummy password', method)
+        # werkzeug fills in defaults (e.g. the iteration count), so compare against what it actually writes
+        self.method_prefix = _method_prefix(self._dummy_hash)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy()
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # The slot is held until the hash really finishes, even if this caller stops waiting
+        future.add_done_callback(lambda _future: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        """
+        Check a password against a stored hash. Pass None for an unknown user:
+        the same work is done against a dummy hash and False is returned.
+        """
+        if password_hash is None:
+            self._run(check_password_hash, self._dummy_hash, password)
+            return False
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        return _method_prefix(password_hash) != self.method_prefix
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_create_lock = threading.Lock()
+
+
+def get_password_hasher():
+    """The password hasher for the current app, created on first use (after gunicorn forks)."""
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is not None:
+        return hasher
+    with _create_lock:
+        hasher = current_app.extensions.get('password_hasher')
+        if hasher is None:
+            config = current_app.config
+            hasher = current_app.extensions['password_hasher'] = PasswordHasher(
+                method=config['PASSWORD_HASH_METHOD'],
+                workers=config['PASSWORD_HASH_WORKERS'],
+                max_pending=config['PASSWORD_HASH_MAX_PENDING'],
+                timeout=config['PASSWORD_HASH_TIMEOUT']
+            )
+    return hasher
@@ -0,0 +1,210 @@
+# backend/utils/profiling.py
+"""
+On-demand request profiling for production.
+
+A request is profiled when it carries `X-Profile: <PROFILE_TOKEN>` or, with
+PROFILE_SAMPLE_RATE > 0, when it is picked at random. While it runs, a
+sampler thread records the handling thread's Python stack every
+PROFILE_INTERVAL_MS and every SQL statement is captured with its duration.
+Under gevent workers the sampler is still a real OS thread, and follows the
+request's greenlet rather than the worker's one OS thread.
+Each profile is written to PROFILE_DIR as:
+
+- <id>.folded  collapsed stacks ("frame;frame;frame count"), the input of
+               flamegraph.pl, speedscope and inferno
+- <id>.sql.json  the statements in execution order, without parameters
+
+Only the newest PROFILE_MAX_FILES profiles are kept. The profile id is
+returned in the X-Profile-Id response header.
+
+When no token is configured and the sample rate is 0, a request costs one
+header lookup and each SQL statement one check of flask.g.
+"""
+import hmac
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from utils.concurrency import green_threads, native
+
+PROFILE_HEADER = 'X-Profile'
+MAX_SQL_STATEMENTS = 5000  # per profile; a runaway loop shouldn't eat the worker's memory
+
+
+class StackSampler:
+    """
+    Samples the calling thread's stack from a background OS thread into
+    collapsed-stack counts. Under gevent it samples the calling greenlet: its
+    saved frame while it is switched out, the OS thread's frame while it runs.
+    A greenlet sampler would not do, it could only run when the request yields.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = False
+        self._lock = native('_thread', 'allocate_lock')()
+        self._sleep = native('time', 'sleep')
+        self._thread_id = native('_thread', 'get_ident')()  # monkey-patched get_ident is the greenlet's id
+        self._greenlet = None
+        if green_threads():
+            from greenlet import getcurrent
+            self._greenlet = getcurrent()
+
+    def start(self):
+        native('_thread', 'start_new_thread')(self._run, ())
+        return self
+
+    def stop(self):
+        with self._lock:  # waits out a sample in progress, then no more are taken
+            self._stopped = True
+        return self.stacks
+
+    def _current_frame(self):
+        if self._greenlet is not None and self._greenlet.gr_frame is not None:
+            return self._greenlet.gr_frame  # switched out; another greenlet owns the thread's frame
+        return sys._current_frames().get(self._thread_id)
+
+    def _run(self):
+        while True:
+            self._sleep(self.interval)
+            with self._lock:
+                if self._stopped:
+                    return
+                frame = self._current_frame()
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+
+
+def short_path(filename):
+    """Last two path components: enough to tell frames apart, short enough to read in a flame graph."""
+    parts = filename.replace('\\', '/').rsplit('/', 2)
+    return '/'.join(parts[-2:])
+
+
+class RequestProfile:
+    def __init__(self, interval):
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.statements = []
+        self.sampler = StackSampler(interval).start()
+
+    def finish(self, directory, max_files, status):
+        stacks = self.sampler.stop()
+        elapsed_ms = round((time.perf_counter() - self.start) * 1000, 1)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, g.profile_id)
+        with open(path + '.folded', 'w', encoding='utf-8') as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        with open(path + '.sql.json', 'w', encoding='utf-8') as f:
+            json.dump({
+                'endpoint': request.endpoint,
+                'method': request.method,
+                'path': request.path,
+                'status': status,
+                'started_at': self.started,
+                'elapsed_ms': elapsed_ms,
+                'sql_ms': round(sum(s['ms'] for s in self.statements), 1),
+                'statements': self.statements,
+            }, f, indent=1)
+        prune_profiles(directory, max_files)
+
+
+def prune_profiles(directory, max_files):
+    """Keep the newest `max_files` profiles (ids sort by time)."""
+    ids = sorted({name.split('.', 1)[0] for name in os.listdir(directory) if name.endswith(('.folded', '.sql.json'))})
+    for stale in ids[:max(len(ids) - max_files, 0)]:
+        for suffix in ('.folded', '.sql.json'):
+            try:
+                os.remove(os.path.join(directory, stale + suffix))
+            except FileNotFoundError:
+                pass  # another worker pruned it first
+
+
+def should_profile(config):
+    token = config['PROFILE_TOKEN']
+    supplied = request.headers.get(PROFILE_HEADER)
+    if token and supplied and hmac.compare_digest(supplied.encode(), token.encode()):
+        return True
+    rate = config['PROFILE_SAMPLE_RATE']
+    return rate > 0 and random.random() < rate
+
+
+# --- SQL capture (profiled requests only) ---
+
+def _active_profile():
+    return g.get('profile') if has_request_context() else None
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_profile() is not None:
+        conn.info.setdefault('profile_query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _active_profile()
+    starts = conn.info.get('profile_query_start')
+    if profile is None or not starts:
+        return
+    start = starts.pop()
+    if len(profile.statements) < MAX_SQL_STATEMENTS:
+        profile.statements.append({
+            'at_ms': round((start - profile.start) * 1000, 2),
+            'ms': round((time.perf_counter() - start) * 1000, 2),
+            'rows': cursor.rowcount,
+            'executemany': executemany,
+            'sql': statement,
+        })
+
+
+# --- Flask hooks ---
+
+def _start_profile():
+    config = current_app.config
+    if not should_profile(config):
+        return
+    now = time.time()
+    endpoint = (request.endpoint or 'unmatched').replace('.', '-')  # ids must not contain '.', see prune_profiles
+    g.profile_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}-{int(now * 1000) % 1000:03d}-{os.getpid()}-{endpoint}"
+    g.profile = RequestProfile(config['PROFILE_INTERVAL_MS'] / 1000)
+
+
+def _tag_response(response):
+    if g.get('profile') is not None:
+        response.headers['X-Profile-Id'] = g.profile_id
+        g.profile_status = response.status_code
+    return response
+
+
+def _finish_profile(exc):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return
+    config = current_app.config
+    try:
+        profile.finish(config['PROFILE_DIR'], config['PROFILE_MAX_FILES'], g.get('profile_status', 500))
+    except OSError as e:
+        current_app.logger.error(f"Could not write profile {g.profile_id}: {e}")
+
+
+def init_profiling(app):
+    """Register the profiling hooks. They run on every request but do nothing unless a profile is wanted."""
+    # First in line, so time spent in the rate limiter's storage shows up too
+    app.before_request_funcs.setdefault(None, []).insert(0, _start_profile)
+    app.after_request(_tag_response)
+    app.teardown_request(_finish_profile)  # after streamed bodies are sent, so they are profiled in full
@@ -0,0 +1,211 @@
+# backend/utils/scoring.py
+"""
+Scoring of submitted prediction files against each track's hidden ground truth.
+
+Metrics are plain NumPy array expressions with no Python-level loops over
+rows. Ground truth is converted once to a .npy file and then memory-mapped, so
+every worker process shares the same pages from the OS cache instead of
+parsing its own copy. Predictions are a CSV (one value per row, last column
+used, optional header) or a .npy array, in ground-truth row order.
+
+Scoring runs as 'score_submission' jobs in the worker.py process pool, and
+score_submissions_script.py rescores a whole track in a ProcessPoolExecutor.
+"""
+import os
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+from flask import current_app
+
+from models import db, Submission, Track
+from utils.jobs import PermanentJobError, job_handler
+from utils.leaderboard import record_score
+from utils.storage import get_blob_store, local_copy
+
+
+class ScoringError(Exception):
+    """The prediction file cannot be scored (wrong shape, unparsable values)."""
+
+
+# --- Metrics ---
+
+def accuracy(y_true, y_pred):
+    return float(np.mean(y_true == y_pred))
+
+
+def f1(y_true, y_pred):
+    """Binary F1 on the positive class for 0/1 labels, macro-averaged F1 otherwise."""
+    labels, inverse = np.unique(np.concatenate([y_true, y_pred]), return_inverse=True)
+    if np.isin(labels, (0, 1)).all():
+        tp = np.count_nonzero((y_true == 1) & (y_pred == 1))
+        denominator = 2 * tp + np.count_nonzero(y_true != y_pred)
+        return float(2 * tp / denominator) if denominator else 0.0
+    k = len(labels)
+    t, p = inverse[:len(y_true)], inverse[len(y_true):]
+    confusion = np.bincount(t * k + p, minlength=k * k).reshape(k, k)
+    tp = np.diag(confusion).astype(np.float64)
+    denominator = confusion.sum(axis=0) + confusion.sum(axis=1)  # 2tp + fp + fn
+    per_class = np.divide(2 * tp, denominator, out=np.zeros_like(tp), where=denominator > 0)
+    return float(per_class.mean())
+
+
+def rmse(y_true, y_pred):
+    return float(np.sqrt(np.mean(np.square(y_true - y_pred))))
+
+
+def mae(y_true, y_pred):
+    return float(np.mean(np.abs(y_true - y_pred)))
+
+
+def auc(y_true, y_pred):
+    """ROC AUC via the Mann-Whitney U statistic, with average ranks for ties."""
+    positives = y_true == 1
+    n_pos = int(positives.sum())
+    n_neg = len(y_true) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        raise ScoringError('AUC needs both positive and negative ground truth labels')
+    _, inverse, counts = np.unique(y_pred, return_inverse=True, return_counts=True)
+    ends = np.cumsum(counts)
+    average_ranks = (ends - counts + 1 + ends) / 2.0
+    rank_sum = average_ranks[inverse][positives].sum()
+    return float((rank_sum - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg))
+
+
+def log_loss(y_true, y_pred, eps=1e-15):
+    p = np.clip(y_pred, eps, 1 - eps)
+    return float(-np.mean(y_true * np.log(p) + (1 - y_true) * np.log1p(-p)))
+
+
+# name -> (function, higher_is_better)
+METRICS = {
+    'accuracy': (accuracy, True),
+    'f1': (f1, True),
+    'auc': (auc, True),
+    'rmse': (rmse, False),
+    'mae': (mae, False),
+    'log_loss': (log_loss, False),
+}
+
+
+def higher_is_better(metric):
+    return METRICS[metric][1]
+
+
+# --- Loading ---
+
+def _is_numeric_row(line):
+    try:
+        for cell in line.strip().split(','):
+            float(cell)
+    except ValueError:
+        return False
+    return True
+
+
+def read_values(path):
+    """Read a column of numbers from a .npy file or a CSV (last column, optional header)."""
+    with open(path, 'rb') as f:
+        head = f.read(6)
+    if head == b'\x93NUMPY':
+        try:
+            values = np.load(path, mmap_mode='r', allow_pickle=False)
+        except (ValueError, OSError) as e:  # truncated, corrupt, or an object array
+            raise ScoringError(f'Could not read .npy predictions: {e}')
+        if values.ndim not in (1, 2) or (values.ndim == 2 and values.shape[1] == 0):
+            raise ScoringError(f'Expected a 1-d array or a 2-d array with columns, got shape {values.shape}')
+        if not (np.issubdtype(values.dtype, np.number) or values.dtype == np.bool_):
+            raise ScoringError(f'Predictions must be numeric, got dtype {values.dtype}')
+        return values if values.ndim == 1 else values[:, -1]
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        first_line = f.readline()
+    skip = 0 if _is_numeric_row(first_line) else 1  # header row
+    try:
+        values = np.loadtxt(path, delimiter=',', skiprows=skip, dtype=np.float64, ndmin=2)
+    except ValueError as e:
+        raise ScoringError(f'Could not parse predictions: {e}')
+    return values[:, -1]
+
+
+def _cached_npy_path(ground_truth_path, cache_folder):
+    name = os.path.abspath(ground_truth_path).strip(os.sep).replace(os.sep, '__')
+    return os.path.join(cache_folder, f'{name}.npy')
+
+
+@lru_cache(maxsize=32)
+def _memmap_ground_truth(ground_truth_path, mtime, cache_folder):
+    if ground_truth_path.endswith('.npy'):
+        return np.load(ground_truth_path, mmap_mode='r', allow_pickle=False)
+    cached = _cached_npy_path(ground_truth_path, cache_folder)
+    if not os.path.exists(cached) or os.path.getmtime(cached) < mtime:
+        os.makedirs(cache_folder, exist_ok=True)
+        tmp = f'{cached}.{os.getpid()}.tmp.npy'
+        np.save(tmp, np.ascontiguousarray(read_values(ground_truth_path)))
+        os.replace(tmp, cached)
+    return np.load(cached, mmap_mode='r', allow_pickle=False)
+
+
+def load_ground_truth(ground_truth_path, cache_folder):
+    """Memory-mapped ground truth array; re-converted when the source file changes."""
+    return _memmap_ground_truth(ground_truth_path, os.path.getmtime(ground_truth_path), cache_folder)
+
+
+def score_file(predictions_path, ground_truth_path, metric, cache_folder):
+    """Score one prediction file. Pure function of its arguments, so it can run in any process."""
+    if metric not in METRICS:
+        raise ScoringError(f"Unknown metric '{metric}'")
+    y_true = load_ground_truth(ground_truth_path, cache_folder)
+    try:
+        y_pred = read_values(predictions_path)
+    except UnicodeDecodeError:
+        raise ScoringError('Predictions must be a CSV or .npy file')
+    if y_pred.shape != y_true.shape:
+        raise ScoringError(f'Expected {y_true.shape[0]} predictions, got {y_pred.shape[0]}')
+    if not np.isfinite(y_pred).all():
+        raise ScoringError('Predictions contain NaN or infinite values')
+    return METRICS[metric][0](y_true, y_pred)
+
+
+def ground_truth_file(track, config):
+    return os.path.join(config['GROUND_TRUTH_FOLDER'], track.ground_truth_path)
+
+
+def is_scored_track(track):
+    return bool(track and track.metric and track.ground_truth_path)
+
+
+# --- Job handler ---
+
+def _scoring_gave_up(job, error):
+    # The file passed validation, so it stays Accepted; score_submissions_script.py can rescore it
+    submission = db.session.get(Submission, job.submission_id)
+    if submission is not None and submission.status == 'Accepted' and submission.score is None:
+        submission.status_message = 'Scoring could not be completed. Please contact the organizers.'
+        db.session.commit()
+
+
+@job_handler('score_submission', on_give_up=_scoring_gave_up)
+def score_submission(job):
+    submission = db.session.get(Submission, job.submission_id)
+    if submission is None:
+        raise PermanentJobError(f'Submission {job.submission_id} no longer exists')
+    if submission.status != 'Accepted':
+        return
+    track = db.session.get(Track, submission.track_id)
+    if not is_scored_track(track):
+        raise PermanentJobError(f'Track {submission.track_id} has no metric or ground truth')
+
+    config = current_app.config
+    with local_copy(get_blob_store(), submission.model_file_url) as path:
+        try:
+            score = score_file(path, ground_truth_file(track, config), track.metric, config['SCORING_CACHE_FOLDER'])
+        except ScoringError as e:
+            submission.status = 'Rejected'
+            submission.status_message = f'Could not score predictions: {e}'
+            db.session.commit()
+            return
+    submission.score = score
+    submission.scored_at = datetime.utcnow()
+    submission.status_message = None  # e.g. left by an earlier attempt that gave up
+    record_score(submission, higher_is_better(track.metric))
+    db.session.commit()
@@ -0,0 +1,113 @@
+# backend/utils/serialization.py
+"""
+JSON output for API responses.
+
+- OutputSchema declares the JSON shape of a model or result row once, at
+  import time, resolving each field to an operator.attrgetter (or the
+  given callable) so a row is dumped by one dict comprehension. Datetimes
+  are left as they are and encoded by the JSON provider, not by an
+  .isoformat() per field per row.
+- JSONProvider is the app's `app.json` (so jsonify uses it too): orjson
+  when it is installed, the stdlib encoder otherwise. Both write datetimes
+  and dates as ISO 8601 and sort keys, so a body (and its ETag) does not
+  depend on which one produced it.
+- ndjson_stream encodes a large list a batch of rows at a time, for
+  Responses streamed from a server-side cursor.
+"""
+import json
+import keyword
+from datetime import date
+from itertools import islice
+from operator import attrgetter
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson  # optional; the stdlib encoder is used without it
+except ImportError:
+    orjson = None
+
+STREAM_BATCH_ROWS = 1000
+
+
+class OutputSchema:
+    """
+    The JSON shape of a model or row. Each field is an attribute name, a
+    (key, dotted attribute path) pair, or a (key, callable) pair whose callable
+    gets the object. For example:
+
+        OutputSchema('id', 'name', ('team', 'team.name'), ('url', lambda t: t.url()))
+    """
+
+    def __init__(self, *fields):
+        self.fields = tuple((field, field) if isinstance(field, str) else tuple(field) for field in fields)
+        getters = []
+        for key, source in self.fields:
+            if callable(source):
+                getters.append((key, source))
+            elif isinstance(source, str) and all(
+                    part.isidentifier() and not keyword.iskeyword(part) for part in source.split('.')):
+                getters.append((key, attrgetter(source)))
+            else:
+                raise TypeError(f'OutputSchema field {key!r}: expected an attribute path or a callable, got {source!r}')
+        getters = tuple(getters)
+        # A closure rather than a method: no bound-method or attribute lookup per row
+        self.dump = lambda obj: {key: get(obj) for key, get in getters}
+
+    def extend(self, *fields):
+        """A schema with this one's fields followed by `fields`."""
+        return OutputSchema(*self.fields, *fields)
+
+    def dump_many(self, objs):
+        return list(map(self.dump, objs))
+
+
+class JSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, encoding with orjson when it can (see module docstring)."""
+
+    @staticmethod
+    def default(o):
+        # Flask's default writes dates as HTTP dates; orjson writes ISO 8601, so match it
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def _orjson_options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return options | orjson.OPT_SORT_KEYS if self.sort_keys else options
+
+    def dumps_bytes(self, obj):
+        """`obj` as compact UTF-8 JSON."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._orjson_options())
+            except orjson.JSONEncodeError:
+                pass  # e.g. an integer wider than 64 bits; the stdlib encoder takes anything
+        return json.dumps(obj, default=self.default, sort_keys=self.sort_keys, ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:  # indent and the like: only the stdlib encoder has them
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(obj)  # pretty-printed while debugging
+        return self._app.response_class(self.dumps_bytes(obj) + b'\n', mimetype=self.mimetype)
+
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def ndjson_stream(rows, schema, provider, batch_size=STREAM_BATCH_ROWS):
+    """`schema.dump(row)` of every row as one JSON line, yielded as one bytes chunk per batch of rows."""
+    dumps = provider.dumps_bytes
+    for batch in _batches(rows, batch_size):
+        yield b''.join([dumps(item) + b'\n' for item in schema.dump_many(batch)])
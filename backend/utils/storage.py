@@ -0,0 +1,266 @@
+# backend/utils/storage.py
+"""
+Content-addressed blob storage for submission files.
+
+Blobs are keyed by their SHA-256 and laid out in hash-prefix shards
+('ab/cd/abcd...') so no directory grows without bound. Storing a file whose
+hash already exists only refreshes the blob's modification time, which
+deduplicates re-uploads of the same model and restarts the garbage
+collector's grace period for it. Submission.model_file_url /
+supporting_docs_url hold the blob key.
+"""
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+from flask import current_app
+
+READ_BLOCK_SIZE = 1024 * 1024
+
+
+def blob_key(sha256):
+    """Sharded storage key for a SHA-256 hex digest."""
+    sha256 = sha256.lower()
+    return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+def key_sha256(key):
+    """Inverse of blob_key; returns None for anything that isn't a blob key."""
+    parts = (key or "").split("/")
+    if len(parts) != 3 or len(parts[2]) != 64 or parts[2][:2] != parts[0] or parts[2][2:4] != parts[1]:
+        return None
+    return parts[2]
+
+
+class BlobStore:
+    """Interface implemented by the storage drivers."""
+
+    def put_file(self, path, sha256):
+        """
+        Move the local file at `path` (whose SHA-256 is `sha256`) into the store.
+        Returns (key, created); created is False when an identical blob already existed,
+        in which case its modification time is refreshed (see collect_garbage).
+        """
+        raise NotImplementedError
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def size(self, key):
+        raise NotImplementedError
+
+    def open(self, key, offset=0):
+        """Return a binary file-like object for reading the blob, starting `offset` bytes in."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def iter_blobs(self):
+        """Yield (key, last_modified_epoch_seconds) for every blob in the store."""
+        raise NotImplementedError
+
+    def local_path(self, key):
+        """Filesystem path of the blob if the driver keeps it on local disk, else None."""
+        return None
+
+
+class LocalBlobStore(BlobStore):
+    """Stores blobs under a root directory on the local filesystem."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def put_file(self, path, sha256):
+        key = blob_key(sha256)
+        dest = self._path(key)
+        try:
+            os.utime(dest)
+        except FileNotFoundError:
+            pass  # not stored yet, or just collected: store it below
+        else:
+            os.remove(path)
+            return key, False
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        try:
+            os.replace(path, dest)  # atomic when staging and store share a filesystem
+        except OSError:
+            tmp = f"{dest}.{os.getpid()}.tmp"
+            shutil.move(path, tmp)
+            os.replace(tmp, dest)
+        return key, True
+
+    def exists(self, key):
+        return os.path.exists(self._path(key))
+
+    def size(self, key):
+        return os.path.getsize(self._path(key))
+
+    def open(self, key, offset=0):
+        f = open(self._path(key), "rb")
+        if offset:
+            f.seek(offset)
+        return f
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def iter_blobs(self):
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                if key_sha256(key):
+                    yield key, os.path.getmtime(path)
+
+    def local_path(self, key):
+        return self._path(key)
+
+
+class S3BlobStore(BlobStore):
+    """
+    Stores blobs in an S3-compatible bucket. Set S3_ENDPOINT_URL to point it at
+    a local stand-in such as MinIO.
+    """
+
+    def __init__(self, bucket, prefix="", endpoint_url=None, region_name=None):
+        import boto3  # only needed when this driver is configured
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region_name)
+
+    def _object_key(self, key):
+        return self.prefix + key
+
+    def put_file(self, path, sha256):
+        key = blob_key(sha256)
+        if self._touch(key):
+            os.remove(path)
+            return key, False
+        # upload_file switches to a multipart upload for large files
+        self.client.upload_file(path, self.bucket, self._object_key(key))
+        os.remove(path)
+        return key, True
+
+    def _touch(self, key):
+        """Copy the object onto itself to refresh its LastModified; False if it does not exist."""
+        from botocore.exceptions import ClientError
+
+        object_key = self._object_key(key)
+        try:
+            # Managed copy: multipart for objects over the 5 GB CopyObject limit
+            self.client.copy({"Bucket": self.bucket, "Key": object_key}, self.bucket, object_key,
+                             ExtraArgs={"MetadataDirective": "REPLACE"})
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def _head(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def exists(self, key):
+        return self._head(key) is not None
+
+    def size(self, key):
+        head = self._head(key)
+        if head is None:
+            raise FileNotFoundError(key)
+        return head["ContentLength"]
+
+    def open(self, key, offset=0):
+        if offset:
+            return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key),
+                                          Range=f"bytes={offset}-")["Body"]
+        return self.client.get_object(Bucket=self.bucket, Key=self._object_key(key))["Body"]
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def iter_blobs(self):
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                key = obj["Key"][len(self.prefix):]
+                if key_sha256(key):
+                    yield key, obj["LastModified"].timestamp()
+
+
+def create_blob_store(config):
+    """Build the driver selected by STORAGE_BACKEND ('local' or 's3')."""
+    backend = config.get("STORAGE_BACKEND", "local")
+    if backend == "local":
+        return LocalBlobStore(config["STORAGE_ROOT"])
+    if backend == "s3":
+        return S3BlobStore(
+            bucket=config["S3_BUCKET"],
+            prefix=config.get("S3_PREFIX", ""),
+            endpoint_url=config.get("S3_ENDPOINT_URL"),
+            region_name=config.get("S3_REGION"),
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+def get_blob_store():
+    """The blob store for the current app, created on first use."""
+    store = current_app.extensions.get("blob_store")
+    if store is None:
+        store = current_app.extensions["blob_store"] = create_blob_store(current_app.config)
+    return store
+
+
+@contextmanager
+def local_copy(store, key):
+    """
+    Yield a local filesystem path with the blob's content, for code that needs
+    random access (zipfile, numpy.memmap). Remote blobs are downloaded to a temp file.
+    """
+    path = store.local_path(key)
+    if path is not None:
+        yield path
+        return
+    fd, tmp_path = tempfile.mkstemp(prefix="blob-")
+    try:
+        with os.fdopen(fd, "wb") as out, store.open(key) as src:
+            shutil.copyfileobj(src, out, READ_BLOCK_SIZE)
+        yield tmp_path
+    finally:
+        os.remove(tmp_path)
+
+
+def collect_garbage(store, referenced, grace_seconds, dry_run=False):
+    """
+    Delete blobs whose hash is not in `referenced` and that are older than
+    `grace_seconds`; the grace period covers blobs stored (or deduplicated
+    onto, which refreshes their modification time) by an upload whose
+    Submission row is not committed yet. Returns (deleted_keys, freed_bytes).
+    """
+    cutoff = time.time() - grace_seconds
+    deleted, freed = [], 0
+    for key, modified in store.iter_blobs():
+        if key_sha256(key) in referenced or modified > cutoff:
+            continue
+        freed += store.size(key)
+        if not dry_run:
+            store.delete(key)
+        deleted.append(key)
+    return deleted, freed
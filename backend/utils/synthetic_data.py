@@ -0,0 +1,303 @@
+# backend/utils/synthetic_data.py
+"""
+Synthetic participants, teams and submissions at production scale, for
+benchmarks and capacity planning (python seed.py --users 200000 ...).
+
+Rows are streamed into Postgres with COPY in COPY_CHUNK_ROWS chunks, with ids
+assigned here (after the current maximum) so foreign keys need no round trip;
+the id sequences are moved past them afterwards. Everything runs in one
+transaction, and the same seed on the same starting database produces the
+same rows.
+
+The data is skewed the way a real event is:
+- track popularity follows a Zipf distribution, and each entrant mostly
+  submits to one preferred track;
+- entrant activity is Pareto distributed: a few teams submit hundreds of
+  times, most a handful;
+- about RUSH_SHARE of all submissions arrive in the hours before the
+  deadline, the rest spread over SUBMISSION_WINDOW;
+- scores follow a per-entrant skill, so leaderboards have a stable top.
+
+All synthetic users share one password hash (hashing a million passwords
+would take hours and measures nothing). Optional fake blobs are stored
+through the configured blob store and shared round-robin by submissions.
+"""
+import csv
+import hashlib
+import io
+import itertools
+import math
+import os
+import random
+import tempfile
+import zlib
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import insert, text
+from werkzeug.security import generate_password_hash
+
+from models import db, Track
+from utils.leaderboard import rebuild_track
+from utils.scoring import METRICS, higher_is_better
+from utils.storage import get_blob_store
+from utils.validation import sniff_format
+
+EMAIL_DOMAIN = 'synthetic.test'
+SYNTHETIC_PASSWORD = 'synthetic-pass'
+COPY_CHUNK_ROWS = 50000
+DEFAULT_DEADLINE = datetime(2025, 6, 1, 23, 59)  # fixed, so a seed always gives the same timestamps
+SUBMISSION_WINDOW = timedelta(days=14)
+RUSH_SHARE = 0.6
+RUSH_MEAN_HOURS = 3
+PENDING_MINUTES = 10  # submissions this close to the deadline are still waiting to be scored
+PREFERRED_TRACK_SHARE = 0.8
+TRACK_ZIPF_EXPONENT = 1.1
+ACTIVITY_PARETO_ALPHA = 1.2
+ACTIVITY_MAX = 100  # the busiest entrant submits at most this many times as often as the quietest
+TEAM_SIZE_WEIGHTS = {2: 30, 3: 40, 4: 30}
+EXPERTISE_WEIGHTS = {'Coder': 40, 'Designer': 15, 'Social Scientist': 15, 'Business': 15, None: 15}
+REJECTED_SHARE = 0.15
+REJECTION_MESSAGES = (
+    'Expected 10000 predictions, got 9999',
+    'Predictions contain NaN or infinite values',
+    'Could not read the prediction file',
+)
+FIRST_NAMES = ('Ada', 'Alan', 'Grace', 'Linus', 'Barbara', 'Edsger', 'Margaret', 'Donald', 'Frances', 'Ken',
+               'Radia', 'Dennis', 'Hedy', 'Niklaus', 'Katherine', 'John', 'Sophie', 'Tim', 'Shafi', 'Guido')
+LAST_NAMES = ('Lovelace', 'Turing', 'Hopper', 'Torvalds', 'Liskov', 'Dijkstra', 'Hamilton', 'Knuth', 'Allen',
+              'Thompson', 'Perlman', 'Ritchie', 'Lamarr', 'Wirth', 'Johnson', 'McCarthy', 'Wilson', 'Lee',
+              'Goldwasser', 'Rossum')
+
+
+# --- Bulk loading ---
+
+def next_ids(*tables):
+    """First free id of each table."""
+    return [db.session.execute(text(f'SELECT COALESCE(MAX(id), 0) + 1 FROM "{table}"')).scalar()
+            for table in tables]
+
+
+def sync_sequence(table):
+    """Move the table's id sequence past ids inserted explicitly."""
+    db.session.execute(text(
+        f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), (SELECT COALESCE(MAX(id), 1) FROM \"{table}\"))"
+    ))
+
+
+def copy_rows(table, columns, rows):
+    """COPY an iterable of tuples into `table`, COPY_CHUNK_ROWS at a time. None becomes NULL."""
+    cursor = db.session.connection().connection.driver_connection.cursor()
+    sql = f'COPY "{table}" ({", ".join(columns)}) FROM STDIN WITH (FORMAT csv)'
+    count = 0
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+        if count % COPY_CHUNK_ROWS == 0:
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+    cursor.close()
+    return count
+
+
+# --- Generation ---
+
+def zipf_weights(n, exponent=TRACK_ZIPF_EXPONENT):
+    return [1 / (rank + 1) ** exponent for rank in range(n)]
+
+
+def make_tracks(count):
+    """Insert `count` tracks (a handful, so plain INSERT) with metrics in rotation. Returns [(id, metric)]."""
+    metrics = list(METRICS)
+    rows = [{
+        'name': f'Synthetic Track {i + 1}',
+        'description': f'Generated track {i + 1}',
+        'rules': 'Generated by utils/synthetic_data.py',
+        'metric': metrics[i % len(metrics)],
+    } for i in range(count)]
+    ids = db.session.scalars(insert(Track).returning(Track.id, sort_by_parameter_order=True), rows).all()
+    return [(track_id, row['metric']) for track_id, row in zip(ids, rows)]
+
+
+def make_blobs(count, size, rng):
+    """Store `count` fake prediction files of about `size` bytes. Returns [(key, sha256, format, size, crc32)]."""
+    store = get_blob_store()
+    staging = current_app.config['UPLOAD_FOLDER']
+    os.makedirs(staging, exist_ok=True)
+    blobs = []
+    for _ in range(count):
+        lines = ['prediction']
+        length = len(lines[0]) + 1
+        while length < size:
+            lines.append(f'{rng.random():.6f}')
+            length += 9
+        content = ('\n'.join(lines) + '\n').encode()
+        sha256 = hashlib.sha256(content).hexdigest()
+        fd, path = tempfile.mkstemp(prefix='synthetic-', dir=staging)
+        with os.fdopen(fd, 'wb') as out:
+            out.write(content)
+        key, _ = store.put_file(path, sha256)
+        blobs.append((key, sha256, sniff_format(content[:512]), len(content), zlib.crc32(content)))
+    return blobs
+
+
+def score_for(metric, skill, rng):
+    """A plausible score for the metric; higher skill is better either way."""
+    quality = 1 / (1 + math.exp(-(skill + rng.gauss(0, 0.5))))  # 0..1
+    if higher_is_better(metric):
+        return round(0.5 + 0.49 * quality, 6)
+    return round(0.05 + 2 * (1 - quality), 6)
+
+
+def check_counts(users, teams, submissions, tracks, blobs=0):
+    """Raise ValueError unless generate() can produce these counts."""
+    if min(users, teams, submissions, tracks, blobs) < 0:
+        raise ValueError('Counts must not be negative')
+    if teams * min(TEAM_SIZE_WEIGHTS) > users:
+        raise ValueError(f'{teams} teams need at least {teams * min(TEAM_SIZE_WEIGHTS)} users')
+    if submissions and not (users and tracks):
+        raise ValueError('Submissions need at least one user and one track')
+
+
+def generate(users, teams, submissions, tracks, seed=0, blobs=0, blob_size=64 * 1024,
+             deadline=DEFAULT_DEADLINE, log=print):
+    """
+    Add the synthetic data to the database in one transaction. teams * 2 must
+    not exceed users; users not placed in a team take part as individuals.
+    Returns a dict of row counts.
+    """
+    check_counts(users, teams, submissions, tracks, blobs)
+    rng = random.Random(seed)
+
+    # The notify trigger (migration 0007) would send one NOTIFY per row; nobody is listening for these
+    db.session.execute(text('ALTER TABLE submission DISABLE TRIGGER submission_notify'))
+    user_base, team_base, member_base, submission_base = next_ids('user', 'team', 'team_member', 'submission')
+
+    track_rows = make_tracks(tracks)
+    log(f'{len(track_rows)} tracks')
+
+    # Users
+    password_hash = generate_password_hash(SYNTHETIC_PASSWORD, current_app.config['PASSWORD_HASH_METHOD'])
+    registration_start = deadline - SUBMISSION_WINDOW - timedelta(days=30)
+    expertise = rng.choices(list(EXPERTISE_WEIGHTS), weights=list(EXPERTISE_WEIGHTS.values()), k=users)
+    user_rows = ((
+        user_base + i,
+        f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+        f'user{user_base + i}@{EMAIL_DOMAIN}',
+        password_hash,
+        registration_start + timedelta(seconds=rng.uniform(0, 30 * 86400)),
+        expertise[i],
+    ) for i in range(users))
+    log(f"{copy_rows('user', ('id', 'name', 'email', 'password_hash', 'created_at', 'expertise'), user_rows)} users")
+
+    # Teams: members drawn without replacement from the shuffled users
+    pool = list(range(user_base, user_base + users))
+    rng.shuffle(pool)
+    sizes = rng.choices(list(TEAM_SIZE_WEIGHTS), weights=list(TEAM_SIZE_WEIGHTS.values()), k=teams)
+    spare = users - teams * min(TEAM_SIZE_WEIGHTS)
+    for i, size in enumerate(sizes):  # shrink teams while there are not enough users to go round
+        extra = min(size - min(TEAM_SIZE_WEIGHTS), spare)
+        sizes[i] = min(TEAM_SIZE_WEIGHTS) + extra
+        spare -= extra
+    entrant_of = {}  # user id -> entrant index; teams first, then individuals
+    memberships = []
+    position = 0
+    for team_index, size in enumerate(sizes):
+        for user_id in pool[position:position + size]:
+            entrant_of[user_id] = team_index
+            memberships.append((member_base + len(memberships), team_base + team_index, user_id, 'member'))
+        position += size
+    individuals = pool[position:]
+    for offset, user_id in enumerate(individuals):
+        entrant_of[user_id] = teams + offset
+    team_rows = ((team_base + i, f'Synthetic Team {team_base + i}', f'Generated team of {size}',
+                  registration_start + timedelta(seconds=rng.uniform(0, 30 * 86400)))
+                 for i, size in enumerate(sizes))
+    log(f"{copy_rows('team', ('id', 'name', 'description', 'created_at'), team_rows)} teams")
+    log(f"{copy_rows('team_member', ('id', 'team_id', 'user_id', 'role'), memberships)} team memberships")
+
+    # Entrants (teams and individuals): how active, how good, and which track they care about
+    entrants = teams + len(individuals)
+    track_weights = zipf_weights(len(track_rows))
+    activity = [min(rng.paretovariate(ACTIVITY_PARETO_ALPHA), ACTIVITY_MAX) for _ in range(entrants)]
+    skill = [rng.gauss(0, 1) for _ in range(entrants)]
+    preferred = rng.choices(range(len(track_rows)), weights=track_weights, k=entrants) if track_rows else []
+    members_of = [[] for _ in range(entrants)]
+    for user_id, entrant in entrant_of.items():
+        members_of[entrant].append(user_id)
+
+    blob_rows = make_blobs(blobs, blob_size, rng)
+    if blob_rows:
+        log(f'{len(blob_rows)} blobs of {blob_size} bytes')
+
+    # Submissions, numbered in time order like real ones
+    rush_seconds = RUSH_MEAN_HOURS * 3600
+    window_seconds = SUBMISSION_WINDOW.total_seconds()
+    before_deadline = sorted(
+        (min(rng.expovariate(1 / rush_seconds), window_seconds) if rng.random() < RUSH_SHARE
+         else rng.uniform(0, window_seconds)) for _ in range(submissions)
+    )[::-1]
+    submitters = rng.choices(range(entrants), weights=activity, k=submissions) if submissions else []
+
+    track_indexes = range(len(track_rows))
+    track_cum_weights = list(itertools.accumulate(track_weights))
+
+    def submission_rows():
+        for i in range(submissions):
+            entrant = submitters[i]
+            if rng.random() < PREFERRED_TRACK_SHARE:
+                track_index = preferred[entrant]
+            else:
+                track_index = rng.choices(track_indexes, cum_weights=track_cum_weights)[0]
+            track_id, metric = track_rows[track_index]
+            submitted = deadline - timedelta(seconds=before_deadline[i])
+            score = scored_at = message = None
+            updated = submitted
+            if before_deadline[i] < PENDING_MINUTES * 60:
+                status = 'Pending'
+            elif rng.random() < REJECTED_SHARE:
+                status, message = 'Rejected', rng.choice(REJECTION_MESSAGES)
+                updated = submitted + timedelta(seconds=rng.uniform(5, 120))
+            else:
+                status = 'Accepted'
+                score = score_for(metric, skill[entrant], rng)
+                scored_at = updated = submitted + timedelta(seconds=rng.uniform(5, 300))
+            key, sha256, fmt, size, crc = blob_rows[i % len(blob_rows)] if blob_rows else (None,) * 5
+            yield (
+                submission_base + i, rng.choice(members_of[entrant]), track_id, submitted,
+                key, 'predictions.csv' if key else None, sha256, fmt, size, crc,
+                status, message, score, scored_at, updated,
+            )
+
+    columns = ('id', 'user_id', 'track_id', 'submission_date', 'model_file_url', 'model_file_name',
+               'model_file_sha256', 'model_file_format', 'model_file_size', 'model_file_crc32',
+               'status', 'status_message', 'score', 'scored_at', 'updated_at')
+    log(f"{copy_rows('submission', columns, submission_rows())} submissions")
+
+    for table in ('user', 'team', 'team_member', 'submission'):
+        sync_sequence(table)
+    db.session.execute(text('ALTER TABLE submission ENABLE TRIGGER submission_notify'))
+    for track_id, metric in track_rows:
+        rebuild_track(track_id, higher_is_better(metric))
+    db.session.commit()
+    log('leaderboards rebuilt')
+
+    # Fresh planner statistics, so benchmarks see the plans production would
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+    return {
+        'users': users,
+        'teams': teams,
+        'team_members': len(memberships),
+        'tracks': len(track_rows),
+        'submissions': submissions,
+        'blobs': len(blob_rows),
+    }
@@ -0,0 +1,124 @@
+# backend/utils/team_formation.py
+"""
+Team formation engine used by form_teams_script.py.
+
+Works on plain (user_id, expertise) pairs, never on ORM objects, and every
+step is O(1) per user: each expertise bucket is shuffled once and then only
+popped from the end. Two modes:
+
+- 'greedy' fills one team at a time: `min_coders` coders, one of each other
+  expertise, then more coders, then anyone. The last team takes whoever is left.
+- 'balanced' fixes the number of teams up front (ceil(n / max_size)), so
+  sizes differ by at most one, gives as many teams as possible their
+  `min_coders`, then deals everyone else out round-robin by expertise so every
+  expertise is spread as evenly as the numbers allow.
+
+Both take a random.Random, so a fixed seed always gives the same teams.
+"""
+import math
+from collections import Counter
+
+CODER = 'Coder'
+EXPERTISE_CATEGORIES = ['Coder', 'Designer', 'Social Scientist', 'Business']
+OTHER = 'Other'
+MODES = ('greedy', 'balanced')
+
+
+def bucket_members(members, rng):
+    """Group (user_id, expertise) pairs by expertise, each bucket shuffled once."""
+    buckets = {category: [] for category in EXPERTISE_CATEGORIES + [OTHER]}
+    for member in sorted(members):  # independent of the order the database returned
+        category = member[1] if member[1] in buckets else OTHER
+        buckets[category].append(member)
+    for bucket in buckets.values():
+        rng.shuffle(bucket)
+    return buckets
+
+
+def form_greedy(members, max_size, min_coders, rng):
+    buckets = bucket_members(members, rng)
+    others = [category for category in EXPERTISE_CATEGORIES if category != CODER]
+    remaining = len(members)
+    teams = []
+    while remaining:
+        team = []
+
+        def take(category):
+            team.append(buckets[category].pop())
+
+        # 1. Ensure minimum coders
+        for _ in range(min(min_coders, max_size, len(buckets[CODER]))):
+            take(CODER)
+        # 2. One of each other expertise
+        for category in others:
+            if len(team) >= max_size:
+                break
+            if buckets[category]:
+                take(category)
+        # 3. More coders
+        while len(team) < max_size and buckets[CODER]:
+            take(CODER)
+        # 4. Anyone left, chosen uniformly at random
+        while len(team) < max_size and remaining - len(team) > 0:
+            categories = [category for category, bucket in buckets.items() if bucket]
+            take(rng.choices(categories, weights=[len(buckets[c]) for c in categories])[0])
+
+        remaining -= len(team)
+        teams.append(team)
+    return teams
+
+
+def form_balanced(members, max_size, min_coders, rng):
+    if not members:
+        return []
+    buckets = bucket_members(members, rng)
+    team_count = math.ceil(len(members) / max_size)
+    teams = [[] for _ in range(team_count)]
+    # Balanced sizes: the first (n mod team_count) teams get one extra member
+    base, extra = divmod(len(members), team_count)
+    capacity = [base + (i < extra) for i in range(team_count)]
+
+    # When coders are scarce, meet `min_coders` in as many teams as possible
+    # rather than leaving every team one short.
+    coders = buckets[CODER]
+    satisfiable = min(team_count, len(coders) // min_coders) if min_coders else 0
+    for i in range(satisfiable):
+        for _ in range(min(min_coders, capacity[i])):
+            teams[i].append(coders.pop())
+
+    # Deal the rest out round-robin, coders first, carrying the position over
+    # between buckets so no team is always first in line.
+    position = satisfiable % team_count
+    for category in [CODER] + [c for c in EXPERTISE_CATEGORIES if c != CODER] + [OTHER]:
+        for member in buckets[category]:
+            while len(teams[position]) >= capacity[position]:
+                position = (position + 1) % team_count
+            teams[position].append(member)
+            position = (position + 1) % team_count
+    return teams
+
+
+def form_teams(members, max_size, min_coders, rng, mode='greedy'):
+    if mode == 'greedy':
+        return form_greedy(members, max_size, min_coders, rng)
+    if mode == 'balanced':
+        return form_balanced(members, max_size, min_coders, rng)
+    raise ValueError(f"Unknown team formation mode: {mode}")
+
+
+def team_mix(team):
+    return Counter(member[1] if member[1] in EXPERTISE_CATEGORIES else OTHER for member in team)
+
+
+def summarize(teams, min_coders):
+    """Figures for judging a formation: size spread, coder shortfall and expertise coverage."""
+    sizes = [len(team) for team in teams]
+    mixes = [team_mix(team) for team in teams]
+    return {
+        'teams': len(teams),
+        'users': sum(sizes),
+        'min_size': min(sizes, default=0),
+        'max_size': max(sizes, default=0),
+        'teams_short_of_coders': sum(1 for mix in mixes if mix[CODER] < min_coders),
+        'mean_distinct_expertise': round(sum(len(mix) for mix in mixes) / len(mixes), 2) if mixes else 0,
+    }
@@ -0,0 +1,258 @@
+# backend/utils/track_export.py
+"""
+Streaming ZIP export of a track's submissions, for judges.
+
+The archive holds manifest.json (submission metadata, entrants, checksums)
+followed by every submission's files under submissions/<id>/. It is never
+built on disk or in memory: the layout (every header and its offset) is
+computed up front from the database, and the file contents are copied
+straight from the blob store while the response streams, READ_BLOCK_SIZE at
+a time.
+
+To compute the layout before reading any file, the archive needs each file's
+size and CRC-32. Validation records them (Submission.*_size/*_crc32); files
+validated before that are read once on their first export and their values
+saved. Entries are STORED rather than deflated: uploads are mostly archives
+and binary models already, and a compressed size is only known after
+compressing, which would make offsets unknowable ahead of time.
+
+The same submissions always give the same bytes, so a client can resume an
+interrupted download with a Range request; the ETag is the manifest's hash
+and changes whenever the content would. ZIP64 records are added only where
+a size, offset or entry count needs them.
+"""
+import hashlib
+import json
+import re
+import struct
+import zlib
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from models import db, Submission, Team, TeamMember, User
+from utils.storage import READ_BLOCK_SIZE, key_sha256
+
+EXPORT_FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+FILE_KINDS = ('model_file', 'supporting_docs')
+
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_MAX_ENTRIES = 0xFFFF
+UTF8_FLAG = 0x0800
+ZIP64_VERSION = 45
+ZIP32_VERSION = 20
+UNIX_FILE_ATTRIBUTES = 0o100644 << 16
+
+
+# --- ZIP records ---
+
+def dos_datetime(moment):
+    """(time, date) fields of a ZIP header; ZIP cannot represent anything before 1980."""
+    if moment is None or moment.year < 1980:
+        moment = datetime(1980, 1, 1)
+    return ((moment.hour << 11) | (moment.minute << 5) | (moment.second // 2),
+            ((moment.year - 1980) << 9) | (moment.month << 5) | moment.day)
+
+
+def local_header(name, size, crc, moment):
+    encoded = name.encode('utf-8')
+    zip64 = size >= ZIP32_LIMIT
+    extra = struct.pack('<HHQQ', 0x0001, 16, size, size) if zip64 else b''
+    time, date = dos_datetime(moment)
+    return struct.pack(
+        '<IHHHHHIIIHH', 0x04034b50, ZIP64_VERSION if zip64 else ZIP32_VERSION, UTF8_FLAG, 0, time, date,
+        crc, ZIP32_LIMIT if zip64 else size, ZIP32_LIMIT if zip64 else size, len(encoded), len(extra)
+    ) + encoded + extra
+
+
+def central_header(name, size, crc, moment, offset):
+    encoded = name.encode('utf-8')
+    # The ZIP64 extra field holds, in this order, only the values too large for their 32-bit field
+    large = [value for value in (size, size, offset) if value >= ZIP32_LIMIT]
+    extra = struct.pack(f'<HH{len(large)}Q', 0x0001, 8 * len(large), *large) if large else b''
+    version = ZIP64_VERSION if large else ZIP32_VERSION
+    time, date = dos_datetime(moment)
+    return struct.pack(
+        '<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | version, version, UTF8_FLAG, 0, time, date, crc,
+        min(size, ZIP32_LIMIT), min(size, ZIP32_LIMIT), len(encoded), len(extra), 0, 0, 0,
+        UNIX_FILE_ATTRIBUTES, min(offset, ZIP32_LIMIT)
+    ) + encoded + extra
+
+
+def end_records(entries, directory_offset, directory_size):
+    """End of central directory, preceded by the ZIP64 record and locator when needed."""
+    records = b''
+    if entries >= ZIP32_MAX_ENTRIES or directory_offset >= ZIP32_LIMIT or directory_size >= ZIP32_LIMIT:
+        zip64_offset = directory_offset + directory_size
+        records += struct.pack('<IQHHIIQQQQ', 0x06064b50, 44, ZIP64_VERSION, ZIP64_VERSION, 0, 0,
+                               entries, entries, directory_size, directory_offset)
+        records += struct.pack('<IIQI', 0x07064b50, 0, zip64_offset, 1)
+    return records + struct.pack(
+        '<IHHHHIIH', 0x06054b50, 0, 0, min(entries, ZIP32_MAX_ENTRIES), min(entries, ZIP32_MAX_ENTRIES),
+        min(directory_size, ZIP32_LIMIT), min(directory_offset, ZIP32_LIMIT), 0
+    )
+
+
+class ZipLayout:
+    """
+    A STORED archive as a list of parts at fixed offsets. Each part is either
+    bytes (headers, the manifest) or a blob key whose content is copied in.
+    """
+
+    def __init__(self, entries):
+        """entries: (name, size, crc32, datetime, bytes or blob key), in archive order."""
+        self.parts = []  # (offset, length, bytes or blob key)
+        self.size = 0
+        directory = []
+        for name, size, crc, moment, content in entries:
+            offset = self.size
+            self._add(local_header(name, size, crc, moment))
+            self._add(content, size)
+            directory.append(central_header(name, size, crc, moment, offset))
+        directory_offset = self.size
+        directory = b''.join(directory)
+        self._add(directory)
+        self._add(end_records(len(entries), directory_offset, len(directory)))
+
+    def _add(self, content, length=None):
+        length = len(content) if length is None else length
+        if length:
+            self.parts.append((self.size, length, content))
+            self.size += length
+
+    def iter_bytes(self, store, start=0, end=None):
+        """Yield the archive's bytes from `start` to `end` (inclusive, default the last byte)."""
+        end = self.size - 1 if end is None else end
+        for offset, length, content in self.parts:
+            if offset + length <= start:
+                continue
+            if offset > end:
+                break
+            skip = max(start - offset, 0)
+            take = min(offset + length, end + 1) - offset - skip
+            if isinstance(content, bytes):
+                yield content[skip:skip + take]
+                continue
+            with store.open(content, skip) as f:
+                while take > 0:
+                    block = f.read(min(READ_BLOCK_SIZE, take))
+                    if not block:
+                        raise IOError(f'Blob {content} ended early')
+                    take -= len(block)
+                    yield block
+
+
+# --- Planning ---
+
+def safe_name(name, default):
+    """A single path component from an uploaded filename."""
+    name = re.sub(r'[^\w.\- ]', '_', (name or '').replace('\\', '/').rsplit('/', 1)[-1]).strip(' .')
+    return name or default
+
+
+def blob_checksum(store, key):
+    """(size, CRC-32) of a stored blob, read in full."""
+    size, crc = 0, 0
+    with store.open(key) as f:
+        for block in iter(lambda: f.read(READ_BLOCK_SIZE), b''):
+            size += len(block)
+            crc = zlib.crc32(block, crc)
+    return size, crc
+
+
+def fill_checksums(submissions, store, log=None):
+    """
+    Record size and CRC-32 for stored files that validation never measured.
+    Files missing from storage are left alone (the export lists them as missing).
+    Saved without bumping updated_at, which would invalidate every submitter's ETags.
+    Returns the number of submissions updated.
+    """
+    updated = 0
+    measured = {}  # blob key -> (size, crc); the same blob may back several submissions
+    for submission in submissions:
+        values = {}
+        for kind in FILE_KINDS:
+            key = getattr(submission, f'{kind}_url')
+            if getattr(submission, f'{kind}_crc32') is not None or not key_sha256(key):
+                continue
+            if key not in measured:
+                if not store.exists(key):
+                    continue
+                if log:
+                    log(f'measuring {key} (submission {submission.id})')
+                measured[key] = blob_checksum(store, key)
+            values[f'{kind}_size'], values[f'{kind}_crc32'] = measured[key]
+        if values:
+            db.session.execute(update(Submission).where(Submission.id == submission.id)
+                               .values(updated_at=Submission.updated_at, **values))
+            updated += 1
+    if updated:
+        db.session.commit()
+    return updated
+
+
+def export_submissions(track_id, statuses=None):
+    """The track's submissions in archive order, with their submitter and first team."""
+    team = (select(TeamMember.team_id).where(TeamMember.user_id == Submission.user_id)
+            .order_by(TeamMember.id).limit(1).correlate(Submission).scalar_subquery())
+    stmt = (select(Submission, User.name, Team.id, Team.name)
+            .join(User, User.id == Submission.user_id)
+            .outerjoin(Team, Team.id == team)
+            .where(Submission.track_id == track_id)
+            .order_by(Submission.id))
+    if statuses:
+        stmt = stmt.where(Submission.status.in_(statuses))
+    return db.session.execute(stmt).all()
+
+
+def plan_export(track, store, statuses=None, log=None):
+    """Returns (layout, etag) for the track's export. Reads files only to fill in missing checksums."""
+    rows = export_submissions(track.id, statuses)
+    if fill_checksums([row[0] for row in rows], store, log):
+        rows = export_submissions(track.id, statuses)  # the commit expired the loaded rows
+
+    entries, listed = [], []
+    for submission, user_name, team_id, team_name in rows:
+        files = []
+        for kind in FILE_KINDS:
+            key = getattr(submission, f'{kind}_url')
+            if not key:
+                continue
+            crc = getattr(submission, f'{kind}_crc32')
+            path = f'submissions/{submission.id}/{kind}/' + safe_name(getattr(submission, f'{kind}_name'), kind)
+            size = getattr(submission, f'{kind}_size')
+            files.append({
+                'kind': kind,
+                'path': path if crc is not None else None,
+                'original_name': getattr(submission, f'{kind}_name'),
+                'sha256': getattr(submission, f'{kind}_sha256') or key_sha256(key),
+                'size': size,
+                'crc32': f'{crc:08x}' if crc is not None else None,
+                'missing': crc is None,
+            })
+            if crc is not None:
+                entries.append((path, size, crc, submission.submission_date, key))
+        listed.append({
+            'id': submission.id,
+            'user_id': submission.user_id,
+            'user_name': user_name,
+            'team_id': team_id,
+            'team_name': team_name,
+            'submitted_at': submission.submission_date.isoformat() if submission.submission_date else None,
+            'status': submission.status,
+            'score': submission.score,
+            'model_file_format': submission.model_file_format,
+            'files': files,
+        })
+
+    manifest = json.dumps({
+        'format_version': EXPORT_FORMAT_VERSION,
+        'track': {'id': track.id, 'name': track.name, 'metric': track.metric},
+        'statuses': sorted(statuses) if statuses else None,
+        'submission_count': len(listed),
+        'submissions': listed,
+    }, indent=1, sort_keys=True).encode('utf-8')
+    newest = max((entry[3] for entry in entries if entry[3] is not None), default=None)
+    layout = ZipLayout([(MANIFEST_NAME, len(manifest), zlib.crc32(manifest), newest, manifest)] + entries)
+    return layout, hashlib.sha256(manifest).hexdigest()
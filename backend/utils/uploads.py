@@ -0,0 +1,151 @@
+# backend/utils/uploads.py
+"""
+Helpers for the resumable, chunked upload flow in routes/submissions.py.
+
+Chunks are streamed from the WSGI input straight into a partial file on disk,
+so a multi-GB model never sits in memory or in a Werkzeug temp file. The
+SHA-256 is computed while the bytes arrive; since a chunk may land on a
+different worker than the one before it, each process only keeps a running
+hash for uploads it has seen contiguously, and finalize falls back to
+re-reading the file when that chain is broken.
+"""
+import hashlib
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+
+from flask import current_app
+
+from utils.concurrency import run_blocking
+
+STREAM_BLOCK_SIZE = 1024 * 1024
+MAX_TRACKED_HASHERS = 1024
+
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+_hashers = OrderedDict()  # upload_id -> (offset, hashlib object)
+_hashers_lock = threading.Lock()
+
+
+class IncompleteChunk(Exception):
+    """Raised when the client disconnects before sending the whole chunk."""
+
+
+def parse_content_range(header):
+    """
+    Parse a 'Content-Range: bytes <start>-<end>/<total>' header.
+    Returns (start, end, total) with an inclusive end, or raises ValueError.
+    """
+    match = _CONTENT_RANGE_RE.match((header or "").strip())
+    if not match:
+        raise ValueError("Content-Range must look like 'bytes <start>-<end>/<total>'")
+    start, end, total = (int(group) for group in match.groups())
+    if start > end or end >= total:
+        raise ValueError("Content-Range is out of bounds")
+    return start, end, total
+
+
+def track_upload_limit(track):
+    """Maximum size in bytes of a single file uploaded to the given track."""
+    if track.max_upload_size:
+        return track.max_upload_size
+    return current_app.config.get('MAX_UPLOAD_SIZE')
+
+
+def partial_path(upload_folder, upload_id):
+    """Location of the partially received file for an upload session."""
+    return os.path.join(upload_folder, ".partial", upload_id)
+
+
+def create_partial(upload_folder, upload_id):
+    """Create the (empty) partial file for a new upload session."""
+    path = partial_path(upload_folder, upload_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path, "wb").close()
+    return path
+
+
+def _take_hasher(upload_id, offset):
+    with _hashers_lock:
+        entry = _hashers.pop(upload_id, None)
+    if offset == 0:
+        return hashlib.sha256()
+    if entry and entry[0] == offset:
+        return entry[1]
+    return None
+
+
+def keep_hasher(upload_id, offset, hasher):
+    """
+    Keep the running hash returned by write_chunk, once the chunk was accepted
+    (the upload's offset moved to `offset`). A no-op for a None hasher.
+    """
+    if hasher is None:
+        return
+    with _hashers_lock:
+        _hashers[upload_id] = (offset, hasher)
+        while len(_hashers) > MAX_TRACKED_HASHERS:
+            _hashers.popitem(last=False)
+
+
+def write_chunk(stream, path, upload_id, offset, length):
+    """
+    Copy exactly `length` bytes from `stream` into `path` at `offset`,
+    updating this process's running SHA-256 for the upload when possible.
+    Returns that hasher (None without one) for keep_hasher, which the caller
+    only calls once the chunk is accepted. Raises IncompleteChunk if the
+    stream ends early.
+    """
+    hasher = _take_hasher(upload_id, offset)
+    remaining = length
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    with os.fdopen(fd, "wb") as out:
+        out.seek(offset)
+        while remaining:
+            block = stream.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                raise IncompleteChunk(f"Expected {length} bytes, received {length - remaining}")
+            out.write(block)
+            if hasher is not None:
+                hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def file_sha256(path):
+    """Hash a file on disk in fixed-size blocks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(STREAM_BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def upload_sha256(upload_id, path, total_size):
+    """
+    SHA-256 of a fully received upload: taken from the running hash if this
+    process saw every chunk, otherwise recomputed from the partial file.
+    """
+    hasher = _take_hasher(upload_id, total_size) if total_size else hashlib.sha256()
+    if hasher is not None:
+        return hasher.hexdigest()
+    return run_blocking(file_sha256, path)
+
+
+def stage_stream(stream, upload_folder):
+    """
+    Copy a file-like stream into a new partial file while hashing it.
+    Returns (path, sha256, size); used for uploads that arrive in one request.
+    """
+    path = partial_path(upload_folder, uuid.uuid4().hex)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    hasher = hashlib.sha256()
+    size = 0
+    with open(path, "wb") as out:
+        for block in iter(lambda: stream.read(STREAM_BLOCK_SIZE), b""):
+            out.write(block)
+            hasher.update(block)
+            size += len(block)
+    return path, hasher.hexdigest(), size
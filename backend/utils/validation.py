@@ -0,0 +1,225 @@
+# backend/utils/validation.py
+"""
+Off-request validation of submissions, run by worker.py as 'validate_submission' jobs.
+
+A submission moves Pending -> Validating -> Accepted / Rejected. Each stored
+file is checked for existence, size against the track limit, checksum
+against the hash recorded at upload time and a sniffed format; archives are
+streamed through member by member (never extracted to disk) to catch path
+traversal, zip bombs and corrupt data.
+"""
+import bz2
+import gzip
+import hashlib
+import lzma
+import tarfile
+import zipfile
+import zlib
+
+from flask import current_app
+
+from models import db, Submission, Track
+from utils.jobs import PermanentJobError, enqueue, job_handler
+from utils.storage import READ_BLOCK_SIZE, get_blob_store, key_sha256, local_copy
+from utils.uploads import track_upload_limit
+
+REJECTED_FORMATS = {'executable', 'empty'}
+ARCHIVE_FORMATS = {'zip', 'tar', 'gzip', 'bzip2', 'xz'}
+# What the archive and decompression modules raise on damaged input; see also _is_bz2_data_error
+CORRUPT_ARCHIVE_ERRORS = (zipfile.BadZipFile, tarfile.TarError, gzip.BadGzipFile, EOFError, zlib.error, lzma.LZMAError)
+
+
+class ValidationProblem(Exception):
+    """A problem with the submitted file itself; the submission is rejected."""
+
+
+def sniff_format(head):
+    """Guess a file format from its first bytes."""
+    if not head:
+        return 'empty'
+    if head.startswith((b'PK\x03\x04', b'PK\x05\x06')):
+        return 'zip'
+    if len(head) > 262 and head[257:262] == b'ustar':
+        return 'tar'
+    if head.startswith(b'\x1f\x8b'):
+        return 'gzip'
+    if head.startswith(b'BZh'):
+        return 'bzip2'
+    if head.startswith(b'\xfd7zXZ\x00'):
+        return 'xz'
+    if head.startswith(b'(\xb5/\xfd'):
+        return 'zstd'
+    if head.startswith(b'\x89HDF\r\n\x1a\n'):
+        return 'hdf5'
+    if head.startswith(b'\x93NUMPY'):
+        return 'npy'
+    if head.startswith(b'PAR1'):
+        return 'parquet'
+    if head.startswith(b'%PDF'):
+        return 'pdf'
+    if head[0] == 0x80 and len(head) > 1 and 2 <= head[1] <= 5:
+        return 'pickle'
+    if head.startswith((b'\x7fELF', b'MZ', b'\xcf\xfa\xed\xfe')):
+        return 'executable'
+    try:
+        text = head.decode('utf-8')
+    except UnicodeDecodeError:
+        return 'binary'
+    return 'text' if '\x00' not in text else 'binary'
+
+
+def _is_bz2_data_error(error):
+    """bz2 has no error class of its own: bad data is a plain OSError with no errno, unlike a failed read."""
+    return type(error) is OSError and error.errno is None
+
+
+def _check_member_name(name):
+    parts = name.replace('\\', '/').split('/')
+    if name.startswith(('/', '\\')) or '..' in parts or (parts and ':' in parts[0]):
+        raise ValidationProblem(f"Archive member '{name}' points outside the archive")
+
+
+def _drain(fileobj, budget):
+    """Read a stream to the end without keeping it, returning the byte count."""
+    total = 0
+    for block in iter(lambda: fileobj.read(READ_BLOCK_SIZE), b''):
+        total += len(block)
+        if total > budget:
+            raise ValidationProblem('Archive unpacks to more than the allowed size')
+    return total
+
+
+def check_zip(path, config):
+    max_members = config['MAX_ARCHIVE_MEMBERS']
+    budget = config['MAX_ARCHIVE_UNPACKED_SIZE']
+    max_ratio = config['MAX_ARCHIVE_COMPRESSION_RATIO']
+    with zipfile.ZipFile(path) as archive:
+        members = archive.infolist()
+        if len(members) > max_members:
+            raise ValidationProblem(f'Archive has more than {max_members} members')
+        declared = 0
+        for info in members:
+            _check_member_name(info.filename)
+            declared += info.file_size
+            if info.compress_size and info.file_size / info.compress_size > max_ratio:
+                raise ValidationProblem(f"Archive member '{info.filename}' is suspiciously compressible")
+        if declared > budget:
+            raise ValidationProblem('Archive unpacks to more than the allowed size')
+        # Reading each member to the end verifies its CRC
+        for info in members:
+            if not info.is_dir():
+                with archive.open(info) as member:
+                    budget -= _drain(member, budget)
+
+
+def check_tar(path, config):
+    max_members = config['MAX_ARCHIVE_MEMBERS']
+    budget = config['MAX_ARCHIVE_UNPACKED_SIZE']
+    count = 0
+    with tarfile.open(path, mode='r:*') as archive:
+        for member in archive:  # streams; never holds the member list for the whole archive
+            count += 1
+            if count > max_members:
+                raise ValidationProblem(f'Archive has more than {max_members} members')
+            _check_member_name(member.name)
+            if member.issym() or member.islnk():
+                raise ValidationProblem(f"Archive member '{member.name}' is a link")
+            if member.isdev():
+                raise ValidationProblem(f"Archive member '{member.name}' is a device file")
+            if member.isfile():
+                budget -= _drain(archive.extractfile(member), budget)
+
+
+def check_compressed(path, fmt, config):
+    """A single compressed stream may wrap a tar archive; otherwise just verify it decompresses."""
+    try:
+        check_tar(path, config)
+        return
+    except tarfile.ReadError:
+        pass
+    opener = {'gzip': gzip.open, 'bzip2': bz2.open, 'xz': lzma.open}[fmt]
+    with opener(path, 'rb') as stream:
+        _drain(stream, config['MAX_ARCHIVE_UNPACKED_SIZE'])
+
+
+def check_stored_file(store, key, expected_sha256, max_size, config):
+    """
+    Validate one stored file. Returns (sniffed format, size, CRC-32) or raises
+    ValidationProblem. Storage and I/O errors propagate so the job is retried.
+    """
+    if not key_sha256(key) or not store.exists(key):
+        raise ValidationProblem('File is missing from storage')
+    size = store.size(key)
+    if size > max_size:
+        raise ValidationProblem(f'File is {size} bytes, over the {max_size} byte limit for this track')
+
+    with local_copy(store, key) as path:
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            head = f.read(READ_BLOCK_SIZE)
+            hasher.update(head)
+            crc = zlib.crc32(head)
+            for block in iter(lambda: f.read(READ_BLOCK_SIZE), b''):
+                hasher.update(block)
+                crc = zlib.crc32(block, crc)
+        if hasher.hexdigest() != (expected_sha256 or key_sha256(key)):
+            raise ValidationProblem('Checksum does not match the uploaded file')
+
+        fmt = sniff_format(head)
+        if fmt in REJECTED_FORMATS:
+            raise ValidationProblem(f'File type not accepted ({fmt})')
+        try:
+            if fmt == 'zip':
+                check_zip(path, config)
+            elif fmt == 'tar':
+                check_tar(path, config)
+            elif fmt in ARCHIVE_FORMATS:
+                check_compressed(path, fmt, config)
+        except CORRUPT_ARCHIVE_ERRORS as e:
+            raise ValidationProblem(f'Archive is corrupt: {e}')
+        except OSError as e:
+            if not _is_bz2_data_error(e):
+                raise
+            raise ValidationProblem(f'Archive is corrupt: {e}')
+    return fmt, size, crc
+
+
+def _validation_gave_up(job, error):
+    submission = db.session.get(Submission, job.submission_id)
+    if submission is not None and submission.status in ('Pending', 'Validating'):
+        submission.status = 'Rejected'
+        submission.status_message = 'Validation could not be completed. Please contact the organizers.'
+        db.session.commit()
+
+
+@job_handler('validate_submission', on_give_up=_validation_gave_up)
+def validate_submission(job):
+    submission = db.session.get(Submission, job.submission_id)
+    if submission is None:
+        raise PermanentJobError(f'Submission {job.submission_id} no longer exists')
+    if submission.status not in ('Pending', 'Validating'):
+        return  # already decided, e.g. by an earlier attempt that crashed after committing
+
+    submission.status = 'Validating'
+    db.session.commit()
+
+    config = current_app.config
+    store = get_blob_store()
+    track = db.session.get(Track, submission.track_id)
+    max_size = track_upload_limit(track)
+    try:
+        (submission.model_file_format, submission.model_file_size,
+         submission.model_file_crc32) = check_stored_file(
+            store, submission.model_file_url, submission.model_file_sha256, max_size, config)
+        if submission.supporting_docs_url:
+            _, submission.supporting_docs_size, submission.supporting_docs_crc32 = check_stored_file(
+                store, submission.supporting_docs_url, submission.supporting_docs_sha256, max_size, config)
+    except ValidationProblem as problem:
+        submission.status = 'Rejected'
+        submission.status_message = str(problem)
+    else:
+        submission.status = 'Accepted'
+        submission.status_message = None
+        if track.metric and track.ground_truth_path:
+            enqueue('score_submission', submission_id=submission.id)
+    db.session.commit()
@@ -0,0 +1,132 @@
+"""
+Background worker pool for submission processing.
+- Runs `--concurrency` worker processes (default WORKER_CONCURRENCY) that claim
+  jobs from the `job` table with SELECT ... FOR UPDATE SKIP LOCKED.
+- Restarts worker processes that die, and periodically requeues jobs whose
+  worker stopped sending heartbeats, so a crash never loses a job.
+- Queues profile_dataset jobs for dataset files that changed since they were
+  profiled, every DATASET_PROFILE_CHECK_INTERVAL seconds.
+- SIGTERM / Ctrl-C lets running jobs finish before exiting.
+
+Usage: python worker.py [--concurrency N] [--kinds validate_submission,score_submission]
+"""
+import argparse
+import multiprocessing
+import signal
+import time
+from app import create_app
+from models import db
+from utils.jobs import HANDLERS, Heartbeat, claim_job, recover_stale_jobs, run_job
+# Importing these registers their job handlers
+import utils.validation  # noqa: F401
+import utils.scoring  # noqa: F401
+from utils.dataset_profile import queue_stale_profiles
+
+SHUTDOWN_GRACE_SECONDS = 60
+
+
+class ShutdownFlag:
+    """
+    Set from a signal handler. Setting a multiprocessing.Event there could deadlock
+    with a wait() in progress on the same Event, so handlers only flip this flag.
+    """
+
+    def __init__(self):
+        self.requested = False
+
+    def install(self, *signums):
+        for signum in signums:
+            signal.signal(signum, self._handle)
+
+    def _handle(self, signum, frame):
+        self.requested = True
+
+
+def work(kinds, stop_event):
+    """Main loop of one worker process: claim a job, run it, repeat."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the supervisor decides when to stop
+    shutdown = ShutdownFlag()
+    shutdown.install(signal.SIGTERM)
+    app = create_app()
+    with app.app_context():
+        poll_interval = app.config['WORKER_POLL_INTERVAL']
+        heartbeat_interval = app.config['JOB_HEARTBEAT_INTERVAL']
+        limits = app.config['JOB_CONCURRENCY_LIMITS']
+        while not (shutdown.requested or stop_event.is_set()):
+            try:
+                job = claim_job(kinds, limits)
+            except Exception as e:
+                db.session.rollback()
+                app.logger.error(f"Could not claim a job: {e}")
+                job = None
+            if job is None:
+                stop_event.wait(poll_interval)
+                continue
+            with Heartbeat(db.engine, job.id, heartbeat_interval):
+                run_job(job)
+            db.session.remove()  # don't let the identity map grow across jobs
+
+
+def supervise(concurrency, kinds):
+    ctx = multiprocessing.get_context('spawn')  # children build their own app and connection pool
+    stop_event = ctx.Event()
+    shutdown = ShutdownFlag()
+    shutdown.install(signal.SIGINT, signal.SIGTERM)
+
+    app = create_app()
+    with app.app_context():
+        stale_after = app.config['JOB_STALE_AFTER']
+        profile_interval = app.config['DATASET_PROFILE_CHECK_INTERVAL'] if 'profile_dataset' in kinds else 0
+        processes = {}
+        last_recovery = last_profile_check = 0.0
+        print(f"Starting {concurrency} workers for: {', '.join(kinds)}")
+        while not shutdown.requested:
+            for slot in range(concurrency):
+                process = processes.get(slot)
+                if process is not None and process.is_alive():
+                    continue
+                if process is not None:
+                    print(f"Worker {process.pid} exited with code {process.exitcode}; restarting")
+                process = ctx.Process(target=work, args=(kinds, stop_event), daemon=False)
+                process.start()
+                processes[slot] = process
+            if time.monotonic() - last_recovery > stale_after / 2:
+                try:
+                    recovered = recover_stale_jobs(stale_after)
+                    if recovered:
+                        print(f"Requeued {recovered} jobs from unresponsive workers")
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"Stale job recovery failed: {e}")
+                last_recovery = time.monotonic()
+            if profile_interval and time.monotonic() - last_profile_check > profile_interval:
+                try:
+                    queued = queue_stale_profiles(app.config)
+                    if queued:
+                        print(f"Queued {queued} changed dataset files for profiling")
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.error(f"Dataset profile check failed: {e}")
+                last_profile_check = time.monotonic()
+            time.sleep(1)
+
+        print("Stopping workers...")
+        stop_event.set()
+        deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+        for process in processes.values():
+            process.join(max(0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.terminate()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=None, help='Number of worker processes')
+    parser.add_argument('--kinds', default=None, help='Comma-separated job kinds to run (default: all)')
+    args = parser.parse_args()
+    kinds = args.kinds.split(',') if args.kinds else sorted(HANDLERS)
+    concurrency = args.concurrency
+    if concurrency is None:
+        from config import Config
+        concurrency = Config.WORKER_CONCURRENCY
+    supervise(concurrency, kinds)